@@ -1,8 +1,14 @@
 import os
 import json
+import logging
+import threading
+
+# 项目根目录与默认配置文件路径（与运行时的工作目录无关）
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_CONFIG_PATH = os.path.join(PROJECT_ROOT, "config", "settings.json")
 
 class ConfigManager:
-    def __init__(self, config_path="config/setting.json"):  # 更新文件名为 settings.json
+    def __init__(self, config_path=DEFAULT_CONFIG_PATH):
         self.config_path = config_path
         self.config = self.load_config()
 
@@ -12,7 +18,7 @@ class ConfigManager:
         """
         if not os.path.exists(self.config_path):
             raise FileNotFoundError(f"配置文件未找到: {self.config_path}")
-        with open(self.config_path, "r") as f:
+        with open(self.config_path, "r", encoding="utf-8") as f:
             return json.load(f)
 
     def get(self, key, default=None):
@@ -40,8 +46,8 @@ class ConfigManager:
         """
         保存配置到文件
         """
-        with open(self.config_path, "w") as f:
-            json.dump(self.config, f, indent=4)
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            json.dump(self.config, f, indent=4, ensure_ascii=False)
         print(f"配置文件已更新: {self.config_path}")
 
     def update_shortcut(self, key_name, new_shortcut):
@@ -58,5 +64,111 @@ class ConfigManager:
         print(f"快捷键 '{key_name}' 更新为: {new_shortcut}")
 
 
+class SettingsService(ConfigManager):
+    """
+    进程级缓存的配置服务。
+
+    配置文件只在首次访问时解析，之后每次访问仅比较文件的 mtime 与大小，
+    发生变化时才重新加载，因此可以在轮询循环中频繁调用而不产生额外的文件读取和 JSON 解析。
+    """
+    def __init__(self, config_path=DEFAULT_CONFIG_PATH):
+        # 延迟到首次访问时加载，避免导入模块时因配置文件缺失而失败
+        self.config_path = config_path
+        self.config = None
+        self.version = 0
+        self._signature = None
+        # 解析失败的文件签名，同一个损坏版本只解析并记录一次
+        self._bad_signature = None
+        self._lock = threading.RLock()
+
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.config_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"配置文件未找到: {self.config_path}")
+        return stat.st_mtime_ns, stat.st_size
+
+    def load_config(self):
+        """
+        返回缓存的配置，文件有变化时重新加载。
+        Returns:
+            dict: 配置内容（共享对象，调用方不应直接修改）。
+        """
+        with self._lock:
+            signature = self._file_signature()
+            if self.config is not None and signature in (self._signature, self._bad_signature):
+                return self.config
+            try:
+                config = ConfigManager.load_config(self)
+            except json.JSONDecodeError as e:
+                # 文件正在被编辑时可能暂时不完整，沿用上一次成功加载的配置
+                if self.config is None:
+                    raise
+                self._bad_signature = signature
+                logging.warning(f"配置文件 {self.config_path} 解析失败，继续使用旧配置: {e}")
+                return self.config
+            self.config = config
+            self._signature = signature
+            self.version += 1
+            return self.config
+
+    def get_settings(self):
+        """
+        获取完整配置字典。
+        """
+        return self.load_config()
+
+    def get(self, key, default=None):
+        return self.load_config().get(key, default)
+
+    def update(self, key, value):
+        # 修改共享配置与写入文件都在锁内完成，其他线程不会读到修改了一半的配置
+        with self._lock:
+            self.load_config()
+            super().update(key, value)
+
+    def update_shortcut(self, key_name, new_shortcut):
+        with self._lock:
+            self.load_config()
+            super().update_shortcut(key_name, new_shortcut)
+
+    def save_config(self):
+        with self._lock:
+            super().save_config()
+            # 自身写入不触发重新加载
+            self._signature = self._file_signature()
+            self.version += 1
+
+
+_SERVICES = {}
+_SERVICES_LOCK = threading.Lock()
+
+def get_settings_service(config_path=None):
+    """
+    获取指定配置文件对应的进程级配置服务（同一路径共享一个实例）。
+    Args:
+        config_path (str): 配置文件路径，默认 config/settings.json。
+    Returns:
+        SettingsService: 配置服务。
+    """
+    config_path = os.path.abspath(config_path or DEFAULT_CONFIG_PATH)
+    with _SERVICES_LOCK:
+        service = _SERVICES.get(config_path)
+        if service is None:
+            service = SettingsService(config_path)
+            _SERVICES[config_path] = service
+        return service
+
+def get_settings(config_path=None):
+    """
+    获取缓存的配置字典，文件修改后自动重新加载。
+    Args:
+        config_path (str): 配置文件路径，默认 config/settings.json。
+    Returns:
+        dict: 配置内容。
+    """
+    return get_settings_service(config_path).get_settings()
+
+
 # 初始化全局配置
-CONFIG_MANAGER = ConfigManager()
\ No newline at end of file
+CONFIG_MANAGER = get_settings_service()
@@ -0,0 +1,89 @@
+import copy
+import os
+import sys
+import timeit
+
+import numpy as np
+
+# 添加项目根目录到 sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.data_fetcher.bar_validation import clean_records, validate_bars
+
+
+def row_loop(data):
+    """
+    原 clean_and_validate_data 的逐行写法（不含逐行日志）。
+    """
+    cleaned_data = []
+    seen_timestamps = set()
+    for entry in data:
+        try:
+            for key in ("t", "o", "c", "h", "l", "v"):
+                if key not in entry:
+                    raise ValueError(f"缺少必要字段: {key}")
+            entry["o"] = float(entry["o"])
+            entry["c"] = float(entry["c"])
+            entry["h"] = float(entry["h"])
+            entry["l"] = float(entry["l"])
+            entry["v"] = int(entry["v"])
+            if entry["h"] < entry["l"]:
+                raise ValueError("最高价不能低于最低价。")
+            if entry["v"] < 0:
+                raise ValueError("成交量不能为负。")
+            if entry["t"] in seen_timestamps:
+                raise ValueError("检测到重复的时间戳。")
+            seen_timestamps.add(entry["t"])
+            cleaned_data.append(entry)
+        except (ValueError, KeyError):
+            pass
+    return cleaned_data
+
+
+def make_records(length, as_strings, rng):
+    # 与接口返回一致：价格保留两位小数（A 股最小变动单位 0.01）
+    close = np.round(10 + np.abs(np.cumsum(rng.normal(0, 0.1, length))), 2)
+    volume = rng.integers(0, 10 ** 6, length)
+    dates = (np.datetime64("2000-01-01") + np.arange(length)).astype(str)
+    records = []
+    for day, price, size in zip(dates.tolist(), close.tolist(), volume.tolist()):
+        record = {"t": day, "o": price, "c": price, "h": round(price + 0.1, 2), "l": round(price - 0.1, 2), "v": size}
+        if as_strings:
+            record = {key: str(value) for key, value in record.items()}
+        records.append(record)
+    # 少量无效行
+    records[1]["o"] = "bad"
+    records[2]["h"] = 0
+    records[3]["t"] = records[0]["t"]
+    return records
+
+
+def best_of(functions, records, repeat):
+    """
+    交替运行各函数，取每个函数的最短耗时，减小机器负载波动的影响。
+    旧写法与 clean_records 会原地修改记录，每次都在新的副本上计时。
+    """
+    times = [[] for _ in functions]
+    for _ in range(repeat):
+        for index, func in enumerate(functions):
+            batch = copy.deepcopy(records)
+            times[index].append(timeit.timeit(lambda: func(batch), number=1))
+    return [min(values) for values in times]
+
+
+def main(lengths=(10000, 200000), repeat=7):
+    rng = np.random.default_rng(0)
+    print(f"{'bars':>8} {'values':>8} {'row loop (s)':>13} {'clean_records (s)':>18} {'validate_bars (s)':>18}")
+    for length in lengths:
+        for as_strings in (True, False):
+            records = make_records(length, as_strings, rng)
+            assert len(row_loop(copy.deepcopy(records))) == len(clean_records(copy.deepcopy(records))[0])
+            loop_time, records_time, columns_time = best_of((row_loop, clean_records, validate_bars), records, repeat)
+            kind = "strings" if as_strings else "numbers"
+            print(f"{length:>8} {kind:>8} {loop_time:>13.3f} {records_time:>18.3f} {columns_time:>18.3f}")
+
+
+if __name__ == "__main__":
+    main()
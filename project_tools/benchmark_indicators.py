@@ -0,0 +1,88 @@
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+# 添加项目根目录到 sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.analyzer import indicators
+from src.analyzer.analyze import StockAnalyzer
+from src.analyzer.incremental_indicators import IncrementalIndicators
+
+
+def pandas_indicators(close, high, low):
+    """
+    原 StockAnalyzer 的 pandas 写法（补充 KDJ 作为对照）。
+    """
+    df = pd.DataFrame({"close": close, "high": high, "low": low})
+    df["MA5"] = df["close"].rolling(window=5).mean()
+    df["MA10"] = df["close"].rolling(window=10).mean()
+    df["MA20"] = df["close"].rolling(window=20).mean()
+    df["EMA12"] = df["close"].ewm(span=12, adjust=False).mean()
+    df["EMA26"] = df["close"].ewm(span=26, adjust=False).mean()
+    df["MACD"] = df["EMA12"] - df["EMA26"]
+    df["Signal"] = df["MACD"].ewm(span=9, adjust=False).mean()
+    lowest = df["low"].rolling(9, min_periods=1).min()
+    highest = df["high"].rolling(9, min_periods=1).max()
+    rsv = (df["close"] - lowest) / (highest - lowest) * 100
+    df["K"] = rsv.ewm(alpha=1 / 3, adjust=False).mean()
+    df["D"] = df["K"].ewm(alpha=1 / 3, adjust=False).mean()
+    return df.tail(1).to_dict(orient="records")[0]
+
+
+def numpy_indicators(close, high, low):
+    return indicators.compute_indicators({"close": close, "high": high, "low": low}, last=True)
+
+
+def main(lengths=(250, 2500, 25000), repeat=20):
+    rng = np.random.default_rng(0)
+    print(f"{'bars':>8} {'pandas (ms)':>12} {'numpy (ms)':>12} {'numpy/pandas':>13}")
+    for length in lengths:
+        close = 100 + np.cumsum(rng.normal(0, 1, length))
+        high = close + rng.random(length)
+        low = close - rng.random(length)
+        pandas_time = min(timeit.repeat(lambda: pandas_indicators(close, high, low), number=1, repeat=repeat))
+        numpy_time = min(timeit.repeat(lambda: numpy_indicators(close, high, low), number=1, repeat=repeat))
+        print(f"{length:>8} {pandas_time * 1000:>12.2f} {numpy_time * 1000:>12.2f} {numpy_time / pandas_time:>13.2f}")
+
+    # 增量更新：初始化一次后每根新 K 线 / 每个 tick 的耗时与历史长度无关
+    state = IncrementalIndicators()
+    state.seed({"close": close, "high": high, "low": low})
+    bar = {"close": float(close[-1]), "high": float(high[-1]), "low": float(low[-1])}
+    number = 2000
+    update_time = min(timeit.repeat(lambda: state.update(bar), number=number, repeat=5)) / number
+    peek_time = min(timeit.repeat(lambda: state.peek(bar), number=number, repeat=5)) / number
+    print(f"incremental: update {update_time * 1e6:.1f} us/bar, peek {peek_time * 1e6:.1f} us/tick")
+
+
+def benchmark_universe(symbols=5000, length=250, sample=200):
+    """
+    全市场截面：一次 analyze_batch 与逐只调用 calculate_technical_indicators 的耗时对比。
+    """
+    rng = np.random.default_rng(1)
+    shape = (symbols, length)
+    close = 100 + np.cumsum(rng.normal(0, 1, shape), axis=1)
+    high = close + rng.random(shape)
+    low = close - rng.random(shape)
+    close[::7, :length // 2] = np.nan  # 模拟上市较晚的股票
+    analyzer = StockAnalyzer()
+    codes = [f"{index:06d}" for index in range(symbols)]
+    batch_time = min(timeit.repeat(
+        lambda: analyzer.analyze_batch(codes, {"close": close, "high": high, "low": low}), number=1, repeat=3
+    ))
+    start = timeit.default_timer()
+    for row in range(sample):
+        valid = ~np.isnan(close[row])
+        analyzer.calculate_technical_indicators({"close": close[row][valid], "high": high[row][valid], "low": low[row][valid]})
+    loop_time = (timeit.default_timer() - start) / sample * symbols
+    print(f"universe {symbols}x{length}: analyze_batch {batch_time:.2f} s, per-symbol loop ~{loop_time:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
+    benchmark_universe()
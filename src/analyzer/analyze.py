@@ -1,4 +1,4 @@
-import pandas as pd
+import numpy as np
 import os
 import sys
 
@@ -7,32 +7,47 @@ if __name__ == "__main__" and "src" not in sys.path:
     project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
     if project_root not in sys.path:
         sys.path.insert(0, project_root)
-        
+
+from src.analyzer.indicators import align_right, compute_indicators
+
 class StockAnalyzer:
     def __init__(self):
         pass
 
-    def calculate_technical_indicators(self, historical_data):
+    def calculate_technical_indicators(self, historical_data, last=True):
         """
-        Calculate moving averages and MACD from historical data.
+        Calculate technical indicators (MA, EMA, MACD, BOLL, RSI, plus KDJ/ATR/OBV/VWAP
+        when high/low/volume are available) with the NumPy indicator engine.
         Args:
-            historical_data (list): List of historical price data.
+            historical_data (list or dict): List of historical price data, or a dict of
+                column arrays such as BarReader views from ``BarView.to_columns(long_names=True)``.
+            last (bool): Return only the latest values (default) or the full series.
         Returns:
-            dict: Calculated indicators.
+            dict: Calculated indicators, merged with the latest input row when ``last`` is True.
         """
-        df = pd.DataFrame(historical_data)
-        df['MA5'] = df['close'].rolling(window=5).mean()
-        df['MA10'] = df['close'].rolling(window=10).mean()
-        df['MA20'] = df['close'].rolling(window=20).mean()
-        
-        # Calculate MACD
-        df['EMA12'] = df['close'].ewm(span=12, adjust=False).mean()
-        df['EMA26'] = df['close'].ewm(span=26, adjust=False).mean()
-        df['MACD'] = df['EMA12'] - df['EMA26']
-        df['Signal'] = df['MACD'].ewm(span=9, adjust=False).mean()
-        df['Histogram'] = df['MACD'] - df['Signal']
+        columns = self._to_columns(historical_data)
+        numeric = {}
+        for name, values in columns.items():
+            try:
+                numeric[name] = np.asarray(values, dtype="float64")
+            except (TypeError, ValueError):
+                continue
+        indicators = compute_indicators(numeric, last=last)
+        if not last:
+            return indicators
+        latest = {name: values[-1] for name, values in columns.items() if len(values)}
+        latest.update(indicators)
+        return latest
 
-        return df.tail(1).to_dict(orient="records")[0]
+    @staticmethod
+    def _to_columns(historical_data):
+        if isinstance(historical_data, dict):
+            return historical_data
+        keys = {}
+        for row in historical_data:
+            for key in row:
+                keys.setdefault(key, None)
+        return {key: [row.get(key) for row in historical_data] for key in keys}
 
     def analyze_stock(self, stock_data, historical_data):
         """
@@ -56,6 +71,44 @@ class StockAnalyzer:
                 "Signal": indicators.get("Signal"),
                 "Histogram": indicators.get("Histogram")
             },
+            "boll": {
+                "mid": indicators.get("BOLL_MID"),
+                "upper": indicators.get("BOLL_UPPER"),
+                "lower": indicators.get("BOLL_LOWER")
+            },
+            "rsi": indicators.get("RSI14"),
             "short_term_trend": "Bullish" if indicators.get("MACD") > indicators.get("Signal") else "Bearish"
         }
-        return analysis
\ No newline at end of file
+        if "K" in indicators:
+            analysis["kdj"] = {"K": indicators["K"], "D": indicators["D"], "J": indicators["J"]}
+        return analysis
+
+    def analyze_batch(self, symbols, price_data, mask=None):
+        """
+        Analyze a whole universe at once from (symbols x time) column matrices.
+        Args:
+            symbols (list): Symbol for each matrix row.
+            price_data (dict): Column name -> 2-D array (close/high/low/volume/amount or c/h/l/v/e),
+                e.g. from ``BarReader.read_matrix``. Histories may be ragged: missing bars are NaN.
+            mask (array): Optional boolean matrix marking valid bars (default: close is not NaN).
+        Returns:
+            dict: ``symbols``, ``bars`` (valid bars per symbol), ``current_price``, ``indicators``
+                (name -> 1-D array of latest values) and ``short_term_trend`` (object array of
+                "Bullish"/"Bearish", None for symbols without data).
+        """
+        symbols = list(symbols)
+        aligned, bars = align_right(price_data, mask)
+        rows = {values.shape[0] for values in aligned.values()}
+        if rows != {len(symbols)}:
+            raise ValueError(f"symbols ({len(symbols)}) does not match matrix rows {sorted(rows)}")
+        indicators = compute_indicators(aligned, last=True)
+        trend = np.where(indicators["MACD"] > indicators["Signal"], "Bullish", "Bearish").astype(object)
+        trend[bars == 0] = None
+        close = aligned["close"] if "close" in aligned else aligned["c"]
+        return {
+            "symbols": symbols,
+            "bars": bars,
+            "current_price": close[:, -1],
+            "indicators": indicators,
+            "short_term_trend": trend,
+        }
\ No newline at end of file
@@ -0,0 +1,297 @@
+"""
+向量化回测引擎。
+
+对 (股票数, 交易日数) 的收盘价矩阵一次性计算信号、持仓收益和统计指标，不逐只股票循环；
+参数网格搜索时各组参数分配到多个进程并行。
+
+信号在第 t 根 K 线收盘时产生，持有区间为 t 到 t+1，不使用未来数据。
+默认规则 macd_trend 即 StockAnalyzer.analyze_stock 中的 short_term_trend：
+MACD(DIF) 高于信号线为 Bullish（持有），否则为 Bearish（空仓）。
+任意布尔持仓矩阵（例如记录下来的大模型判断）都可以直接交给 backtest_positions 评估。
+"""
+import itertools
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from config.settings import get_settings_service
+from src.analyzer.indicators import macd, sma
+
+# 默认回测配置，可在 settings.json 的 "backtest" 节点中覆盖
+DEFAULT_BACKTEST_CONFIG = {
+    "rule": "macd_trend",
+    "grid": {"fast": [8, 12], "slow": [21, 26], "signal": [9]},
+    "start": None,              # 回测区间，None 表示存储中的全部数据
+    "end": None,
+    "cost": 0.0005,             # 每次开仓或平仓的交易成本（比例）
+    "periods_per_year": 252,
+    "max_workers": None,        # 网格搜索的进程数，None 为 CPU 核数
+}
+
+# 信号规则名 -> fn(close, **params) -> 布尔持仓矩阵 (股票数, 交易日数)
+SIGNAL_RULES = {}
+
+
+def register_signal(name):
+    """
+    注册自定义信号规则的装饰器。
+    """
+    def decorator(func):
+        SIGNAL_RULES[name] = func
+        return func
+    return decorator
+
+
+@register_signal("macd_trend")
+def macd_trend(close, fast=12, slow=26, signal=9):
+    """
+    MACD(DIF) 高于信号线时持有（short_term_trend 为 Bullish）。
+    """
+    result = macd(close, fast, slow, signal)
+    with np.errstate(invalid="ignore"):
+        return result["dif"] > result["dea"]
+
+
+@register_signal("ma_trend")
+def ma_trend(close, window=20):
+    """
+    收盘价高于 window 日均线时持有。
+    """
+    with np.errstate(invalid="ignore"):
+        return close > sma(close, window)
+
+
+def forward_fill(matrix):
+    """
+    沿时间轴向前填充中间缺失（停牌），行首缺失（未上市）保持 NaN。
+    """
+    matrix = np.asarray(matrix, dtype="float64")
+    valid = ~np.isnan(matrix)
+    index = np.where(valid, np.arange(matrix.shape[-1]), 0)
+    np.maximum.accumulate(index, axis=-1, out=index)
+    return np.take_along_axis(matrix, index, axis=-1)
+
+
+def _max_drawdown(equity):
+    peak = np.maximum.accumulate(equity, axis=-1)
+    return (equity / peak - 1.0).min(axis=-1)
+
+
+def backtest_positions(close, positions, cost=0.0, periods_per_year=252):
+    """
+    按持仓矩阵回测。
+
+    :param close: array, (股票数, 交易日数) 收盘价，缺失为 NaN（停牌期间按前收盘价计）
+    :param positions: array(bool), 同形状，第 t 天收盘后的持仓（True 为持有）
+    :param cost: float, 每次开仓或平仓的成本比例
+    :param periods_per_year: int, 年化使用的周期数
+    :return: dict, {"per_symbol": {指标: (股票数,) 数组}, "summary": {组合指标}}
+    """
+    close = np.asarray(close, dtype="float64")
+    return _evaluate(close, forward_fill(close), positions, cost, periods_per_year)
+
+
+def _evaluate(close, filled, positions, cost, periods_per_year):
+    if close.shape[-1] < 2:
+        raise ValueError("回测至少需要两个交易日")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = filled[..., 1:] / filled[..., :-1] - 1.0
+    # 只统计当天有成交的区间；停牌期间不计入，复牌当天的收益覆盖整个停牌期
+    valid = ~np.isnan(returns) & ~np.isnan(close[..., 1:])
+    returns = np.where(valid, returns, 0.0)
+    # 停牌期间无法交易，持仓沿用停牌前最后一个交易日的状态，复牌前后不重复计入开平仓；未上市时空仓
+    tradable = ~np.isnan(close[..., :-1])
+    index = np.where(tradable, np.arange(tradable.shape[-1]), 0)
+    np.maximum.accumulate(index, axis=-1, out=index)
+    position = np.take_along_axis(np.asarray(positions, dtype=bool)[..., :-1], index, axis=-1)
+    position &= np.take_along_axis(tradable, index, axis=-1)
+    held = position & valid
+
+    # 持仓变化（含首次开仓）计入交易成本
+    previous = np.concatenate([np.zeros(position.shape[:-1] + (1,), dtype=bool), position[..., :-1]], axis=-1)
+    changes = position != previous
+    strategy = np.where(held, returns, 0.0) - cost * changes
+    equity = np.cumprod(1.0 + strategy, axis=-1)
+
+    bars = valid.sum(axis=-1)
+    up, down = returns > 0, returns < 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        per_symbol = {
+            "bars": bars,
+            "total_return": np.where(bars > 0, equity[..., -1] - 1.0, np.nan),
+            "benchmark_return": np.where(bars > 0, np.prod(1.0 + returns, axis=-1) - 1.0, np.nan),
+            "max_drawdown": np.where(bars > 0, _max_drawdown(equity), np.nan),
+            # 方向命中率：Bullish 后上涨或 Bearish 后下跌的比例
+            "hit_rate": ((held & up) | (~held & valid & down)).sum(axis=-1) / bars,
+            # 看多命中率：持有期间上涨的比例
+            "long_hit_rate": (held & up).sum(axis=-1) / held.sum(axis=-1),
+            "exposure": held.sum(axis=-1) / bars,
+            "trades": (position & ~previous).sum(axis=-1),
+        }
+
+    # 等权组合：每天对当天有数据的股票取平均收益
+    active = valid.sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        portfolio = np.where(active > 0, np.where(valid, strategy, 0.0).sum(axis=0) / active, 0.0)
+    portfolio_equity = np.cumprod(1.0 + portfolio)
+    periods = int((active > 0).sum())
+    total_return = float(portfolio_equity[-1] - 1.0) if periods else float("nan")
+    deviation = portfolio[active > 0].std(ddof=1) if periods > 1 else float("nan")
+    tested = bars > 0
+    summary = {
+        "symbols": int(tested.sum()),
+        "periods": periods,
+        "total_return": total_return,
+        "annual_return": (1.0 + total_return) ** (periods_per_year / periods) - 1.0 if periods else float("nan"),
+        "sharpe": float(portfolio[active > 0].mean() / deviation * np.sqrt(periods_per_year)) if deviation and deviation > 0 else float("nan"),
+        "max_drawdown": float(_max_drawdown(portfolio_equity)) if periods else float("nan"),
+        "hit_rate": _ratio(((held & up) | (~held & valid & down)).sum(), valid.sum()),
+        "long_hit_rate": _ratio((held & up).sum(), held.sum()),
+        "exposure": _ratio(held.sum(), valid.sum()),
+        "trades": int(per_symbol["trades"].sum()),
+        "win_symbols": _ratio((per_symbol["total_return"][tested] > 0).sum(), tested.sum()),
+    }
+    return {"per_symbol": per_symbol, "summary": summary}
+
+
+def _ratio(numerator, denominator):
+    return float(numerator) / float(denominator) if denominator else float("nan")
+
+
+def backtest_rule(close, rule="macd_trend", params=None, cost=0.0, periods_per_year=252):
+    """
+    按信号规则回测。
+    :param close: array, (股票数, 交易日数) 收盘价
+    :param rule: str, SIGNAL_RULES 中的规则名
+    :param params: dict, 规则参数
+    :return: dict, 同 backtest_positions
+    """
+    if rule not in SIGNAL_RULES:
+        raise ValueError(f"未知的信号规则: {rule}")
+    close = np.asarray(close, dtype="float64")
+    filled = forward_fill(close)
+    positions = SIGNAL_RULES[rule](filled, **(params or {}))
+    return _evaluate(close, filled, positions, cost, periods_per_year)
+
+
+def expand_grid(grid):
+    """
+    参数网格展开为参数组合列表，如 {"fast": [8, 12], "slow": [26]} -> [{"fast": 8, "slow": 26}, ...]。
+    """
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+# 子进程内的收盘价矩阵，进程启动时传入一次，避免每个任务重复序列化
+_WORKER_CLOSE = {}
+
+
+def _init_worker(close):
+    _WORKER_CLOSE["close"] = close
+
+
+def _run_params(rule, params, cost, periods_per_year, close=None):
+    close = _WORKER_CLOSE["close"] if close is None else close
+    result = backtest_rule(close, rule, params, cost=cost, periods_per_year=periods_per_year)
+    return dict(result["summary"], params=params)
+
+
+def run_grid(close, rule="macd_trend", grid=None, cost=0.0, periods_per_year=252, max_workers=None):
+    """
+    参数网格搜索，各组参数在多个进程中并行回测。
+
+    :param close: array, (股票数, 交易日数) 收盘价
+    :param rule: str, 信号规则名
+    :param grid: dict, {参数名: 取值列表}
+    :param max_workers: int, 进程数，None 为 CPU 核数，1 为当前进程内顺序执行
+    :return: list[dict], 每组参数的组合统计（含 params），按总收益降序
+    """
+    if rule not in SIGNAL_RULES:
+        raise ValueError(f"未知的信号规则: {rule}")
+    combinations = expand_grid(grid or {})
+    if rule == "macd_trend":
+        # 快线周期不小于慢线周期的组合没有意义
+        combinations = [
+            params for params in combinations if params.get("fast", 12) < params.get("slow", 26)
+        ]
+    close = np.ascontiguousarray(close, dtype="float64")
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1 or len(combinations) <= 1:
+        results = [_run_params(rule, params, cost, periods_per_year, close) for params in combinations]
+    else:
+        workers = min(max_workers, len(combinations))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(close,)) as executor:
+            results = list(executor.map(
+                _run_params,
+                itertools.repeat(rule),
+                combinations,
+                itertools.repeat(cost),
+                itertools.repeat(periods_per_year),
+            ))
+    results.sort(key=lambda item: -np.nan_to_num(item["total_return"], nan=-np.inf))
+    return results
+
+
+def format_grid_results(results):
+    """
+    将网格搜索结果格式化为表格文本。
+    """
+    lines = [f"{'params':<36} {'return':>8} {'annual':>8} {'sharpe':>7} {'maxdd':>8} {'hit':>6} {'trades':>7}"]
+    for item in results:
+        params = ", ".join(f"{name}={value}" for name, value in item["params"].items())
+        lines.append(
+            f"{params:<36} {item['total_return']:>8.2%} {item['annual_return']:>8.2%} {item['sharpe']:>7.2f} "
+            f"{item['max_drawdown']:>8.2%} {item['hit_rate']:>6.1%} {item['trades']:>7d}"
+        )
+    return "\n".join(lines)
+
+
+def get_backtest_config():
+    """
+    读取 settings.json 中的 backtest 配置并补全默认值。
+    """
+    try:
+        backtest_settings = get_settings_service().get_settings().get("backtest", {})
+    except FileNotFoundError:
+        backtest_settings = {}
+    config = dict(DEFAULT_BACKTEST_CONFIG)
+    config.update(backtest_settings)
+    return config
+
+
+def backtest_universe(symbols=None, reader=None, config=None):
+    """
+    从本地 K 线存储读取按日期对齐的收盘价并执行网格搜索。
+    :param symbols: list[str], 股票代码，默认存储中的全部股票
+    :param reader: BarReader, 默认使用共享 daily 存储
+    :param config: dict, 回测配置，默认读取 settings.json
+    :return: list[dict], 同 run_grid
+    """
+    from src.storage.bar_reader import BarReader
+
+    config = config or get_backtest_config()
+    reader = reader or BarReader()
+    names, dates, panel = reader.read_panel(symbols, config["start"], config["end"], columns=("c",))
+    logging.info(f"回测数据: {len(names)} 只股票, {len(dates)} 个交易日")
+    return run_grid(
+        panel["c"],
+        rule=config["rule"],
+        grid=config["grid"],
+        cost=config["cost"],
+        periods_per_year=config["periods_per_year"],
+        max_workers=config["max_workers"],
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
+    print(format_grid_results(backtest_universe(sys.argv[1:] or None)))
@@ -0,0 +1,548 @@
+"""
+增量技术指标状态。
+
+实时盯盘时每来一根 K 线（或一笔 tick）都用全部历史重算指标的代价是 O(历史长度)。
+这里的指标对象用历史数据初始化一次，之后每根新 K 线只做常数次运算：
+均线用环形缓冲区维护窗口和，EMA/MACD/KDJ/RSI/ATR 按递推公式更新。
+计算口径与 src.analyzer.indicators 完全一致，同一段数据两边结果相同。
+
+每个指标都有两种更新方式：
+- update(...)：收盘的 K 线，写入状态；
+- peek(...)：尚未收盘的 K 线（盘中 tick），只计算不写入，下一次 peek 会覆盖。
+
+状态可以通过 snapshot()/restore() 转成 JSON 兼容的字典，进程重启后无需重新回放历史。
+"""
+import json
+import logging
+import math
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from itertools import islice
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from src.analyzer.indicators import COLUMN_ALIASES
+
+NAN = float("nan")
+
+# 快照格式版本，结构变化时递增，旧快照将被忽略并重新初始化
+SNAPSHOT_VERSION = 2
+
+
+def _window_after(buffer, value):
+    # 追加 value 后窗口内的数据（不修改 buffer）
+    skip = 1 if len(buffer) == buffer.maxlen else 0
+    return list(islice(buffer, skip, None)) + [value]
+
+
+class _IncrementalIndicator:
+    """
+    增量指标基类：子类实现 _next(...) 返回 (新状态, 输出值)，
+    update 写入新状态，peek 只返回输出值。
+    """
+    def update(self, *values):
+        state, output = self._next(*values)
+        self.__dict__.update(state)
+        self.count += 1
+        return output
+
+    def peek(self, *values):
+        return self._next(*values)[1]
+
+    def to_dict(self):
+        payload = {"type": type(self).__name__}
+        for name, value in vars(self).items():
+            if isinstance(value, deque):
+                value = {"deque": list(value), "maxlen": value.maxlen}
+            elif isinstance(value, _IncrementalIndicator):
+                value = value.to_dict()
+            elif isinstance(value, dict):
+                value = {key: item.to_dict() for key, item in value.items()}
+            payload[name] = value
+        return payload
+
+    @staticmethod
+    def from_dict(payload):
+        cls = _INDICATOR_TYPES[payload["type"]]
+        indicator = cls.__new__(cls)
+        for name, value in payload.items():
+            if name == "type":
+                continue
+            if isinstance(value, dict) and "deque" in value:
+                value = deque(value["deque"], maxlen=value["maxlen"])
+            elif isinstance(value, dict) and "type" in value:
+                value = _IncrementalIndicator.from_dict(value)
+            elif isinstance(value, dict):
+                value = {key: _IncrementalIndicator.from_dict(item) for key, item in value.items()}
+            setattr(indicator, name, value)
+        return indicator
+
+
+class RollingMean(_IncrementalIndicator):
+    """
+    简单移动平均，环形缓冲区维护窗口和；数据不足 window 或窗口内有缺失（NaN）时为 NaN。
+
+    :param window: int, 均线周期
+    """
+    # 每隔多少次更新用 fsum 重算窗口和，抵消浮点加减的累积误差
+    RESUM_EVERY = 1024
+
+    def __init__(self, window):
+        self.window = window
+        self.buffer = deque(maxlen=window)
+        self.total = 0.0
+        self.missing = 0
+        self.count = 0
+
+    def _next(self, value):
+        # 窗口和只累加有效值，另记窗口内的缺失数，缺失移出窗口后恢复输出
+        buffer = self.buffer
+        total, missing = self.total, self.missing
+        if math.isnan(value):
+            missing += 1
+        else:
+            total += value
+        if len(buffer) == self.window:
+            if math.isnan(buffer[0]):
+                missing -= 1
+            else:
+                total -= buffer[0]
+        size = min(len(buffer) + 1, self.window)
+        output = total / self.window if size == self.window and not missing else NAN
+        return {"total": total, "missing": missing}, output
+
+    def update(self, value):
+        output = super().update(value)
+        self.buffer.append(value)
+        if self.count % self.RESUM_EVERY == 0:
+            self.total = math.fsum(item for item in self.buffer if not math.isnan(item))
+        return output
+
+
+class ExponentialAverage(_IncrementalIndicator):
+    """
+    指数加权平均 y = y' + alpha * (x - y')，与 indicators.ewm 口径一致：
+    输入缺失（NaN）时沿用上一个值，缺失后第一个有效值的前值权重为 (1 - alpha)^(缺失数+1)。
+
+    :param alpha: float, 平滑系数
+    :param initial: float, 初始值；为 None 时以第一个输入为初值
+    """
+    def __init__(self, alpha, initial=None):
+        self.alpha = alpha
+        self.value = initial
+        self.skipped = 0
+        self.count = 0
+
+    @classmethod
+    def from_span(cls, span):
+        return cls(2.0 / (span + 1.0))
+
+    def _next(self, value):
+        if self.value is None:
+            return ({"value": None} if math.isnan(value) else {"value": value}), value
+        if math.isnan(value):
+            return {"skipped": self.skipped + 1}, self.value
+        weight = (1.0 - self.alpha) ** (self.skipped + 1)
+        result = (weight * self.value + self.alpha * value) / (weight + self.alpha)
+        return {"value": result, "skipped": 0}, result
+
+
+class Macd(_IncrementalIndicator):
+    """
+    MACD(fast, slow, signal)。
+    :return: dict, {"dif", "dea", "histogram"}
+    """
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast = ExponentialAverage.from_span(fast)
+        self.slow = ExponentialAverage.from_span(slow)
+        self.signal = ExponentialAverage.from_span(signal)
+        self.count = 0
+
+    def _next(self, close):
+        fast = self.fast.peek(close)
+        slow = self.slow.peek(close)
+        dif = fast - slow
+        dea = self.signal.peek(dif)
+        return {}, {"dif": dif, "dea": dea, "histogram": dif - dea}
+
+    def update(self, close):
+        output = super().update(close)
+        self.fast.update(close)
+        self.slow.update(close)
+        self.signal.update(output["dif"])
+        return output
+
+
+class Kdj(_IncrementalIndicator):
+    """
+    KDJ(n, m1, m2)，K、D 以 50 为初始值递推；区间最高价等于最低价时 RSV 取 50。
+    :return: dict, {"k", "d", "j"}
+    """
+    def __init__(self, n=9, m1=3, m2=3):
+        self.highs = deque(maxlen=n)
+        self.lows = deque(maxlen=n)
+        self.k = ExponentialAverage(1.0 / m1, initial=50.0)
+        self.d = ExponentialAverage(1.0 / m2, initial=50.0)
+        self.count = 0
+
+    def _rsv(self, high, low, close):
+        if math.isnan(close):
+            return NAN
+        highest = max(_window_after(self.highs, high))
+        lowest = min(_window_after(self.lows, low))
+        spread = highest - lowest
+        return (close - lowest) / spread * 100.0 if spread > 0 else 50.0
+
+    @staticmethod
+    def _output(k, d):
+        return {"k": k, "d": d, "j": 3.0 * k - 2.0 * d}
+
+    def _next(self, high, low, close):
+        k = self.k.peek(self._rsv(high, low, close))
+        return {}, self._output(k, self.d.peek(k))
+
+    def update(self, high, low, close):
+        rsv = self._rsv(high, low, close)
+        self.highs.append(high)
+        self.lows.append(low)
+        k = self.k.update(rsv)
+        self.count += 1
+        return self._output(k, self.d.update(k))
+
+
+class Bollinger(_IncrementalIndicator):
+    """
+    布林带，中轨为 window 周期均线，带宽为 width 倍样本标准差。
+    标准差在窗口内直接计算，代价只与 window 有关。
+    :return: dict, {"mid", "upper", "lower"}
+    """
+    def __init__(self, window=20, width=2.0, ddof=1):
+        self.mean = RollingMean(window)
+        self.width = width
+        self.ddof = ddof
+        self.count = 0
+
+    def _next(self, close):
+        mid = self.mean.peek(close)
+        if math.isnan(mid):
+            return {}, {"mid": NAN, "upper": NAN, "lower": NAN}
+        window = _window_after(self.mean.buffer, close)
+        variance = math.fsum((value - mid) ** 2 for value in window) / (len(window) - self.ddof)
+        std = math.sqrt(variance)
+        return {}, {"mid": mid, "upper": mid + self.width * std, "lower": mid - self.width * std}
+
+    def update(self, close):
+        output = super().update(close)
+        self.mean.update(close)
+        return output
+
+
+class Rsi(_IncrementalIndicator):
+    """
+    RSI（Wilder 平滑），第一根 K 线为 NaN；涨跌均为 0 时取 50。
+    """
+    def __init__(self, period=14):
+        self.previous = None
+        self.gain = ExponentialAverage(1.0 / period)
+        self.loss = ExponentialAverage(1.0 / period)
+        self.count = 0
+
+    def _next(self, close):
+        if self.previous is None:
+            return {}, NAN
+        delta = close - self.previous
+        gain = self.gain.peek(max(delta, 0.0))
+        loss = self.loss.peek(max(-delta, 0.0))
+        total = gain + loss
+        return {}, (gain / total * 100.0 if total > 0 else 50.0)
+
+    def update(self, close):
+        output = self.peek(close)
+        if self.previous is not None:
+            delta = close - self.previous
+            self.gain.update(max(delta, 0.0))
+            self.loss.update(max(-delta, 0.0))
+        self.previous = close
+        self.count += 1
+        return output
+
+
+class Atr(_IncrementalIndicator):
+    """
+    平均真实波幅（Wilder 平滑），第一根 K 线的真实波幅为最高价减最低价。
+    """
+    def __init__(self, period=14):
+        self.previous = None
+        self.average = ExponentialAverage(1.0 / period)
+        self.count = 0
+
+    def _true_range(self, high, low, close):
+        # 没有前收盘价（第一根或前一根缺失）时以当根收盘价代替
+        previous = close if self.previous is None or math.isnan(self.previous) else self.previous
+        if math.isnan(previous):
+            return NAN
+        return max(high - low, abs(high - previous), abs(low - previous))
+
+    def _next(self, high, low, close):
+        return {}, self.average.peek(self._true_range(high, low, close))
+
+    def update(self, high, low, close):
+        output = self.average.update(self._true_range(high, low, close))
+        self.previous = close
+        self.count += 1
+        return output
+
+
+class Obv(_IncrementalIndicator):
+    """
+    能量潮：收盘价上涨累加成交量，下跌累减，第一根为 0。
+    """
+    def __init__(self):
+        self.previous = None
+        self.total = 0.0
+        self.count = 0
+
+    def _next(self, close, volume):
+        total = self.total
+        if self.previous is not None and close != self.previous and not math.isnan(close - self.previous):
+            total += volume if close > self.previous else -volume
+        return {"previous": close, "total": total}, (NAN if math.isnan(close) else total)
+
+
+class Vwap(_IncrementalIndicator):
+    """
+    累计成交量加权平均价，成交额缺失时用典型价 (H+L+C)/3 估算。
+    """
+    def __init__(self):
+        self.amount = 0.0
+        self.volume = 0.0
+        self.count = 0
+
+    def _next(self, volume, amount):
+        # 缺失按 0 累加，同向量化引擎
+        total_amount = self.amount + (0.0 if math.isnan(amount) else amount)
+        total_volume = self.volume + (0.0 if math.isnan(volume) else volume)
+        output = total_amount / total_volume if total_volume > 0 else NAN
+        return {"amount": total_amount, "volume": total_volume}, output
+
+
+_INDICATOR_TYPES = {
+    cls.__name__: cls
+    for cls in (RollingMean, ExponentialAverage, Macd, Kdj, Bollinger, Rsi, Atr, Obv, Vwap)
+}
+
+
+def _field(bar, name):
+    for alias in COLUMN_ALIASES[name]:
+        value = bar.get(alias)
+        if value is not None:
+            return float(value)
+    return None
+
+
+class IncrementalIndicators:
+    """
+    单只股票的全部增量指标，输出键与 compute_indicators(last=True) 相同。
+
+    K 线字段名可以是 close/high/low/volume/amount 或存储列名 c/h/l/v/e；
+    缺少最高价/最低价时不计算 KDJ/ATR，缺少成交量时不计算 OBV/VWAP。
+
+    :param ma_windows: tuple, 需要计算的均线周期
+    """
+    def __init__(self, ma_windows=(5, 10, 20)):
+        self.ma_windows = tuple(ma_windows)
+        self.indicators = {
+            **{f"MA{window}": RollingMean(window) for window in self.ma_windows},
+            "EMA12": ExponentialAverage.from_span(12),
+            "EMA26": ExponentialAverage.from_span(26),
+            "MACD": Macd(),
+            "BOLL": Bollinger(),
+            "RSI14": Rsi(),
+            "KDJ": Kdj(),
+            "ATR14": Atr(),
+            "OBV": Obv(),
+            "VWAP": Vwap(),
+        }
+        self.count = 0
+        self.last_bar = None
+
+    def _step(self, bar, commit):
+        close = _field(bar, "close")
+        if close is None:
+            raise KeyError("计算指标需要收盘价字段 close")
+        high, low = _field(bar, "high"), _field(bar, "low")
+        volume, amount = _field(bar, "volume"), _field(bar, "amount")
+        indicators = self.indicators
+
+        def step(name, *values):
+            indicator = indicators[name]
+            return indicator.update(*values) if commit else indicator.peek(*values)
+
+        result = {f"MA{window}": step(f"MA{window}", close) for window in self.ma_windows}
+        result["EMA12"] = step("EMA12", close)
+        result["EMA26"] = step("EMA26", close)
+        macd_result = step("MACD", close)
+        result.update(MACD=macd_result["dif"], Signal=macd_result["dea"], Histogram=macd_result["histogram"])
+        boll_result = step("BOLL", close)
+        result.update(BOLL_MID=boll_result["mid"], BOLL_UPPER=boll_result["upper"], BOLL_LOWER=boll_result["lower"])
+        result["RSI14"] = step("RSI14", close)
+        if high is not None and low is not None:
+            kdj_result = step("KDJ", high, low, close)
+            result.update(K=kdj_result["k"], D=kdj_result["d"], J=kdj_result["j"])
+            result["ATR14"] = step("ATR14", high, low, close)
+        if volume is not None:
+            result["OBV"] = step("OBV", close, volume)
+            if amount is None and high is not None and low is not None:
+                amount = (high + low + close) / 3.0 * volume
+            if amount is not None:
+                result["VWAP"] = step("VWAP", volume, amount)
+        return result
+
+    def update(self, bar):
+        """
+        写入一根已收盘的 K 线。
+        :param bar: dict, K 线字段
+        :return: dict, 更新后的指标值
+        """
+        result = self._step(bar, commit=True)
+        self.count += 1
+        self.last_bar = dict(bar)
+        return result
+
+    def peek(self, bar):
+        """
+        计算未收盘 K 线（盘中 tick 聚合出的当前 K 线）的指标，不修改状态。
+        :param bar: dict, 当前 K 线字段
+        :return: dict, 指标值
+        """
+        return self._step(bar, commit=False)
+
+    def seed(self, history):
+        """
+        用历史 K 线初始化状态（只需执行一次）。
+        :param history: list[dict] 或 dict{列名: 序列}
+        :return: dict, 最后一根 K 线的指标值；无数据时为空字典
+        """
+        if isinstance(history, dict):
+            names = list(history)
+            rows = (dict(zip(names, values)) for values in zip(*(history[name] for name in names)))
+        else:
+            rows = history
+        result = {}
+        for bar in rows:
+            result = self.update(bar)
+        return result
+
+    def snapshot(self):
+        """
+        导出状态，结果可直接 json.dump。
+        """
+        return {
+            "version": SNAPSHOT_VERSION,
+            "ma_windows": list(self.ma_windows),
+            "count": self.count,
+            "last_bar": self.last_bar,
+            "indicators": {name: indicator.to_dict() for name, indicator in self.indicators.items()},
+        }
+
+    @classmethod
+    def restore(cls, snapshot):
+        """
+        从 snapshot() 的结果恢复状态。
+        :raises ValueError: 快照版本不匹配
+        """
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"指标快照版本不匹配: {snapshot.get('version')}")
+        state = cls(snapshot["ma_windows"])
+        state.count = snapshot["count"]
+        state.last_bar = snapshot.get("last_bar")
+        state.indicators = {
+            name: _IncrementalIndicator.from_dict(payload) for name, payload in snapshot["indicators"].items()
+        }
+        return state
+
+
+class IndicatorBook:
+    """
+    多只股票的增量指标集合，供实时盯盘调度器的回调使用，线程安全。
+
+    :param ma_windows: tuple, 均线周期
+    """
+    def __init__(self, ma_windows=(5, 10, 20)):
+        self.ma_windows = tuple(ma_windows)
+        self.states = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, symbol):
+        return symbol in self.states
+
+    def seed(self, symbol, history):
+        """
+        用历史 K 线初始化（或重新初始化）某只股票的状态。
+        """
+        state = IncrementalIndicators(self.ma_windows)
+        result = state.seed(history)
+        with self._lock:
+            self.states[symbol] = state
+        return result
+
+    def update(self, symbol, bar, closed=True):
+        """
+        推入一根 K 线。closed=False 表示盘中未收盘的 K 线，只计算不写入状态。
+        """
+        with self._lock:
+            state = self.states.get(symbol)
+            if state is None:
+                state = self.states[symbol] = IncrementalIndicators(self.ma_windows)
+            return state.update(bar) if closed else state.peek(bar)
+
+    def save(self, path):
+        """
+        将全部状态写入 JSON 文件（先写临时文件再替换，避免中断时损坏）。
+        """
+        with self._lock:
+            payload = {
+                "updated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "states": {symbol: state.snapshot() for symbol, state in self.states.items()},
+            }
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path, ma_windows=(5, 10, 20)):
+        """
+        从 save() 写入的文件恢复；文件不存在或损坏时返回空集合，
+        版本不匹配或均线周期不同的股票会被跳过，需要重新 seed。
+        """
+        book = cls(ma_windows)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except FileNotFoundError:
+            return book
+        except json.JSONDecodeError as e:
+            logging.warning(f"指标状态文件损坏，重新初始化: {path}, 错误: {e}")
+            return book
+        for symbol, snapshot in payload.get("states", {}).items():
+            try:
+                state = IncrementalIndicators.restore(snapshot)
+            except (KeyError, ValueError) as e:
+                logging.warning(f"跳过无法恢复的指标状态: {symbol}, 错误: {e}")
+                continue
+            if state.ma_windows != book.ma_windows:
+                logging.info(f"均线周期已变化，需重新初始化: {symbol}")
+                continue
+            book.states[symbol] = state
+        return book
@@ -0,0 +1,385 @@
+"""
+NumPy 向量化技术指标引擎。
+
+所有指标都以列数组为输入，沿最后一个维度（时间）计算，
+因此既可以传入单只股票的一维序列，也可以传入 (股票数, 时间) 的二维矩阵。
+输出与输入形状相同，数据不足的位置为 NaN。
+
+二维矩阵中各股票历史长度不同时，用 align_right 把每行的有效数据靠右对齐，
+前面补 NaN；前导 NaN 不影响后面的结果，每行与单独计算该股票完全一致。
+"""
+import numpy as np
+
+# 指标所需的列名，兼容存储列名（o/h/l/c/v/e）与常用字段名
+COLUMN_ALIASES = {
+    "open": ("open", "o"),
+    "high": ("high", "h"),
+    "low": ("low", "l"),
+    "close": ("close", "c"),
+    "volume": ("volume", "v"),
+    "amount": ("amount", "e"),
+}
+
+# ewm 分块时 (1 - alpha)^-t 允许达到的数量级
+_EWM_MAX_DECADES = 250
+
+
+def _as_float(values):
+    return np.asarray(values, dtype="float64")
+
+
+def _leading_nan(x):
+    # 每行第一个有效值之前的位置；没有 NaN 时返回 None，走快速路径
+    if x.size == 0 or not np.isnan(x[..., 0]).any():
+        return None
+    return np.logical_and.accumulate(np.isnan(x), axis=-1)
+
+
+def _first_valid(x):
+    index = np.argmax(~np.isnan(x), axis=-1)
+    return np.take_along_axis(x, index[..., None], axis=-1)[..., 0]
+
+
+def align_right(columns, mask=None):
+    """
+    将 (股票数, 时间) 矩阵每行的有效数据靠右对齐，无效位置移到行首并置为 NaN。
+    停牌等造成的中间缺口会被压缩掉，对齐后每行最后一列都是该股票的最新一根 K 线。
+
+    :param columns: dict, {列名: 二维数组}
+    :param mask: array(bool), 有效位置为 True，默认取收盘价非 NaN 的位置
+    :return: (dict, np.ndarray), 对齐后的列与每行的有效 K 线数
+    """
+    columns = {name: _as_float(values) for name, values in columns.items()}
+    if mask is None:
+        close = _column(columns, "close")
+        if close is None:
+            raise KeyError("未提供 mask 时需要收盘价列 close")
+        mask = ~np.isnan(close)
+    mask = np.asarray(mask, dtype=bool)
+    # 稳定排序把无效位置（False）排在前面，有效数据保持原有先后顺序
+    order = np.argsort(mask, axis=-1, kind="stable")
+    valid = np.take_along_axis(mask, order, axis=-1)
+    aligned = {
+        name: np.where(valid, np.take_along_axis(values, order, axis=-1), np.nan)
+        for name, values in columns.items()
+    }
+    return aligned, mask.sum(axis=-1)
+
+
+def ewm(values, alpha, initial=None):
+    """
+    指数加权移动平均（递推形式，等价于 pandas ewm(alpha=alpha, adjust=False)）。
+
+    递推 y[t] = alpha * x[t] + (1 - alpha) * y[t-1] 按块展开为累加和：
+    块内 y[t] = d^t * (y_prev + alpha * cumsum(x[i] * d^-i))，d = 1 - alpha，
+    块长按 d^-t 不超过 1e250 选取，避免逐元素的 Python 循环。
+
+    中间缺失（停牌、缺字段）同 pandas ignore_na=False：缺失处沿用上一个值，
+    缺失后第一个有效值的前值权重按间隔衰减为 d^(缺失数+1)，之后照常递推。
+
+    :param values: array, 输入序列，沿最后一维计算
+    :param alpha: float, 平滑系数 (0, 1]
+    :param initial: float or array, 初始值 y[-1]，默认使 y[0] = x[0]
+    :return: np.ndarray, 前导 NaN 的位置仍为 NaN，递推从第一个有效值开始
+    """
+    x = _as_float(values)
+    length = x.shape[-1]
+    decay = 1.0 - alpha
+    if length == 0 or decay <= 0:
+        return x.copy()
+    leading = _leading_nan(x)
+    if leading is not None:
+        # 前导 NaN 以初始值（缺省为第一个有效值）填充：y 在填充段保持初始值不变，
+        # 因而从第一个有效值起的结果与截掉前导 NaN 后单独计算相同
+        if initial is None:
+            initial = _first_valid(x)
+        fill = np.broadcast_to(np.asarray(initial, dtype="float64"), x.shape[:-1])
+        x = np.where(leading, fill[..., None], x)
+
+    if initial is None:
+        previous = x[..., 0].copy()
+    else:
+        previous = np.broadcast_to(np.asarray(initial, dtype="float64"), x.shape[:-1]).copy()
+    out = _ewm_blocks(x, alpha, previous)
+
+    # 中间缺失的行（全为 NaN 的行除外）逐行按有效段重新递推，没有缺失时不走这里
+    missing = np.isnan(x)
+    gaps = missing.any(axis=-1) & ~missing.all(axis=-1)
+    if gaps.any():
+        rows_x, rows_out = x.reshape(-1, length), out.reshape(-1, length)
+        rows_previous = previous.reshape(-1)
+        for row in np.flatnonzero(gaps.reshape(-1)):
+            rows_out[row] = _ewm_gaps(rows_x[row], alpha, rows_previous[row])
+    if leading is not None:
+        out[leading] = np.nan
+    return out
+
+
+def _ewm_blocks(x, alpha, previous):
+    # 无缺失时的分块递推，previous 为 y[-1]
+    length = x.shape[-1]
+    decay = 1.0 - alpha
+    block = max(1, min(length, int(_EWM_MAX_DECADES / -np.log10(decay))))
+    steps = np.arange(1, block + 1)
+    growth = decay ** -steps
+    shrink = decay ** steps
+
+    out = np.empty_like(x)
+    for start in range(0, length, block):
+        chunk = x[..., start:start + block]
+        size = chunk.shape[-1]
+        result = shrink[:size] * (previous[..., None] + alpha * np.cumsum(chunk * growth[:size], axis=-1))
+        out[..., start:start + size] = result
+        previous = result[..., -1]
+    return out
+
+
+def _ewm_gaps(x, alpha, previous):
+    # 一维序列按连续有效段递推，段间缺失处沿用上一个值
+    decay = 1.0 - alpha
+    out = np.empty_like(x)
+    padded = np.concatenate([[True], np.isnan(x), [True]])
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    position = 0
+    for start, stop in zip(edges[::2], edges[1::2]):
+        out[position:start] = previous
+        weight = decay ** (start - position + 1)
+        previous = (weight * previous + alpha * x[start]) / (weight + alpha)
+        out[start] = previous
+        if stop > start + 1:
+            out[start + 1:stop] = _ewm_blocks(x[start + 1:stop], alpha, np.asarray(previous))
+            previous = out[stop - 1]
+        position = stop
+    out[position:] = previous
+    return out
+
+
+def _window_sum(x, window):
+    # 窗口和：逐个位移相加（window 次整块加法），比在滑动窗口视图上归约快得多；
+    # 结果对应窗口末端位置 window-1 起，窗口内有 NaN 时为 NaN
+    length = x.shape[-1] - window + 1
+    total = x[..., window - 1:].copy()
+    for shift in range(1, window):
+        total += x[..., window - 1 - shift:window - 1 - shift + length]
+    return total
+
+
+def sma(values, window):
+    """
+    简单移动平均，前 window-1 个位置为 NaN（同 pandas rolling(window).mean()）。
+    """
+    x = _as_float(values)
+    out = np.full(x.shape, np.nan)
+    if x.shape[-1] >= window:
+        out[..., window - 1:] = _window_sum(x, window) / window
+    return out
+
+
+def ema(values, span):
+    """
+    指数移动平均，alpha = 2 / (span + 1)。
+    """
+    return ewm(values, 2.0 / (span + 1.0))
+
+
+def rolling_std(values, window, ddof=1):
+    """
+    滚动标准差，默认样本标准差（同 pandas rolling(window).std()）。
+    先求窗口均值再累加离差平方（两遍法），避免平方和相减的精度损失。
+    """
+    x = _as_float(values)
+    out = np.full(x.shape, np.nan)
+    if x.shape[-1] >= window:
+        length = x.shape[-1] - window + 1
+        mean = _window_sum(x, window) / window
+        squares = np.zeros(mean.shape)
+        for shift in range(window):
+            squares += (x[..., window - 1 - shift:window - 1 - shift + length] - mean) ** 2
+        out[..., window - 1:] = np.sqrt(squares / (window - ddof))
+    return out
+
+
+def _rolling_extreme(values, window, func, fill):
+    # 数据不足 window 时按已有数据计算（同 pandas rolling(window, min_periods=1)）
+    x = _as_float(values)
+    x = np.where(np.isnan(x), fill, x)
+    out = x.copy()
+    for shift in range(1, min(window, x.shape[-1])):
+        func(out[..., shift:], x[..., :-shift], out=out[..., shift:])
+    return out
+
+
+def llv(values, window):
+    """
+    window 周期内最低值。
+    """
+    return _rolling_extreme(values, window, np.minimum, np.inf)
+
+
+def hhv(values, window):
+    """
+    window 周期内最高值。
+    """
+    return _rolling_extreme(values, window, np.maximum, -np.inf)
+
+
+def macd(close, fast=12, slow=26, signal=9):
+    """
+    MACD。
+    :return: dict, {"dif", "dea", "histogram"}，histogram = dif - dea
+    """
+    dif = ema(close, fast) - ema(close, slow)
+    dea = ema(dif, signal)
+    return {"dif": dif, "dea": dea, "histogram": dif - dea}
+
+
+def kdj(high, low, close, n=9, m1=3, m2=3):
+    """
+    KDJ(n, m1, m2)，K、D 以 50 为初始值递推平滑：K = (m1-1)/m1 * K' + RSV/m1。
+    区间最高价等于最低价时 RSV 取 50。
+    :return: dict, {"k", "d", "j"}
+    """
+    close = _as_float(close)
+    lowest = llv(low, n)
+    highest = hhv(high, n)
+    spread = highest - lowest
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsv = np.where(spread > 0, (close - lowest) / spread * 100.0, 50.0)
+    rsv = np.where(np.isnan(close), np.nan, rsv)
+    k = ewm(rsv, 1.0 / m1, initial=50.0)
+    d = ewm(k, 1.0 / m2, initial=50.0)
+    return {"k": k, "d": d, "j": 3.0 * k - 2.0 * d}
+
+
+def boll(close, window=20, width=2.0, ddof=1):
+    """
+    布林带。
+    :return: dict, {"mid", "upper", "lower"}
+    """
+    mid = sma(close, window)
+    std = rolling_std(close, window, ddof=ddof)
+    return {"mid": mid, "upper": mid + width * std, "lower": mid - width * std}
+
+
+def _wilder(values, period):
+    # Wilder 平滑：首个值之前的位置为 NaN，其后以 alpha = 1/period 递推
+    x = _as_float(values)
+    out = np.full(x.shape, np.nan)
+    if x.shape[-1] > 1:
+        out[..., 1:] = ewm(x[..., 1:], 1.0 / period)
+    return out
+
+
+def rsi(close, period=14):
+    """
+    RSI（Wilder 平滑），第一个位置为 NaN；涨跌均为 0 时取 50。
+    """
+    close = _as_float(close)
+    delta = np.zeros(close.shape)
+    delta[..., 1:] = np.diff(close, axis=-1)
+    gain = _wilder(np.clip(delta, 0, None), period)
+    loss = _wilder(np.clip(-delta, 0, None), period)
+    total = gain + loss
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(total > 0, gain / total * 100.0, np.where(np.isnan(total), np.nan, 50.0))
+
+
+def true_range(high, low, close):
+    """
+    真实波幅，第一根 K 线为最高价减最低价。
+    """
+    high, low, close = _as_float(high), _as_float(low), _as_float(close)
+    previous = np.concatenate([close[..., :1], close[..., :-1]], axis=-1)
+    # 没有前收盘价（第一根 K 线）时以当根收盘价代替，结果即最高价减最低价
+    previous = np.where(np.isnan(previous), close, previous)
+    return np.maximum(high - low, np.maximum(np.abs(high - previous), np.abs(low - previous)))
+
+
+def atr(high, low, close, period=14):
+    """
+    平均真实波幅（Wilder 平滑，同 pandas ewm(alpha=1/period, adjust=False)）。
+    """
+    return ewm(true_range(high, low, close), 1.0 / period)
+
+
+def obv(close, volume):
+    """
+    能量潮：收盘价上涨累加成交量，下跌累减，第一根为 0。
+    """
+    close, volume = _as_float(close), _as_float(volume)
+    direction = np.zeros(close.shape)
+    direction[..., 1:] = np.sign(np.diff(close, axis=-1))
+    result = np.cumsum(np.nan_to_num(direction * volume), axis=-1)
+    return np.where(np.isnan(close), np.nan, result)
+
+
+def vwap(high, low, close, volume, amount=None):
+    """
+    累计成交量加权平均价。提供成交额时为 累计成交额 / 累计成交量，否则使用典型价 (H+L+C)/3。
+    """
+    volume = _as_float(volume)
+    if amount is None:
+        amount = (_as_float(high) + _as_float(low) + _as_float(close)) / 3.0 * volume
+    cumulative_volume = np.cumsum(np.nan_to_num(volume), axis=-1)
+    cumulative_amount = np.cumsum(np.nan_to_num(_as_float(amount)), axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(cumulative_volume > 0, cumulative_amount / cumulative_volume, np.nan)
+
+
+def _column(columns, name):
+    for alias in COLUMN_ALIASES[name]:
+        if alias in columns:
+            return columns[alias]
+    return None
+
+
+def compute_indicators(columns, last=False, ma_windows=(5, 10, 20)):
+    """
+    根据可用的列计算全部指标。只有收盘价时计算 MA/EMA/MACD/BOLL/RSI，
+    有最高价、最低价时加算 KDJ/ATR，有成交量时加算 OBV/VWAP。
+
+    :param columns: dict, {列名: 数组}，列名可为 close/high/low/volume/amount 或 c/h/l/v/e
+    :param last: bool or int, 为 True 时只返回最后一个值（float）；为正整数 n 时只保留最后 n 个位置
+                 （逐个指标截取，大矩阵不会同时持有全部完整序列）
+    :param ma_windows: tuple, 需要计算的均线周期
+    :return: dict, {指标名: 序列或最后值}
+    """
+    close = _column(columns, "close")
+    if close is None:
+        raise KeyError("计算指标需要收盘价列 close")
+    high, low = _column(columns, "high"), _column(columns, "low")
+    volume, amount = _column(columns, "volume"), _column(columns, "amount")
+
+    result = {}
+
+    def keep(**values):
+        for name, series in values.items():
+            result[name] = _trim(series, last)
+
+    keep(**{f"MA{window}": sma(close, window) for window in ma_windows})
+    keep(EMA12=ema(close, 12), EMA26=ema(close, 26))
+    macd_result = macd(close)
+    keep(MACD=macd_result["dif"], Signal=macd_result["dea"], Histogram=macd_result["histogram"])
+    boll_result = boll(close)
+    keep(BOLL_MID=boll_result["mid"], BOLL_UPPER=boll_result["upper"], BOLL_LOWER=boll_result["lower"])
+    keep(RSI14=rsi(close))
+    if high is not None and low is not None:
+        kdj_result = kdj(high, low, close)
+        keep(K=kdj_result["k"], D=kdj_result["d"], J=kdj_result["j"])
+        keep(ATR14=atr(high, low, close))
+    if volume is not None:
+        keep(OBV=obv(close, volume))
+        if amount is not None or (high is not None and low is not None):
+            keep(VWAP=vwap(high, low, close, volume, amount))
+    return result
+
+
+def _trim(values, last):
+    if last is True:
+        if values.ndim == 1:
+            return float(values[-1]) if len(values) else float("nan")
+        return values[..., -1].copy()
+    if last:
+        # 复制以释放完整序列
+        return values[..., -last:].copy()
+    return values
@@ -0,0 +1,327 @@
+"""
+本地规则选股器。
+
+在调用大模型之前，先用本地 K 线数据和 StockAnalyzer 的指标引擎对全市场做一次向量化筛选，
+按声明式条件（MACD 金叉、放量、KDJ 超卖、指标比较等）给出排序后的候选清单，
+只有候选清单里的股票才进入 stock_realtime_monitor 等大模型分析流程。
+
+条件在 settings.json 的 "screener" 节点中配置，例如::
+
+    "screener": {
+        "lookback": 120,
+        "match": 2,
+        "top_n": 20,
+        "conditions": [
+            {"type": "macd_cross", "direction": "golden", "within": 3},
+            {"type": "volume_spike", "window": 20, "ratio": 2.0},
+            {"type": "kdj_oversold", "line": "K", "threshold": 20},
+            {"type": "compare", "left": "close", "op": ">", "right": "MA20", "weight": 0.5}
+        ]
+    }
+"""
+import logging
+import operator
+import os
+import sys
+
+import numpy as np
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from config.settings import get_settings_service
+from src.analyzer.indicators import COLUMN_ALIASES, align_right, compute_indicators, sma
+
+# 默认选股配置，可在 settings.json 的 "screener" 节点中覆盖
+DEFAULT_SCREENER_CONFIG = {
+    "lookback": 120,     # 每只股票读取的 K 线根数
+    "min_bars": 35,      # 有效 K 线少于该值的股票不参与筛选（MACD 需要预热）
+    "match": 2,          # "all": 全部满足；"any": 任一满足；整数: 至少满足的条件数
+    "top_n": 20,         # 候选清单长度
+    "conditions": [
+        {"type": "macd_cross", "direction": "golden", "within": 3},
+        {"type": "volume_spike", "window": 20, "ratio": 2.0},
+        {"type": "kdj_oversold", "line": "K", "threshold": 20},
+    ],
+}
+
+# 交叉判断的相对容差
+CROSS_TOLERANCE = 1e-9
+
+COMPARISONS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le}
+
+# 条件类型 -> 评估函数 fn(context, **params) -> (是否满足, 强度)，两者均为 (股票数,) 数组。
+# 强度只用于同一条件内的排序，数值越大越靠前。
+CONDITIONS = {}
+
+
+def register_condition(name):
+    """
+    注册自定义条件类型的装饰器。
+    """
+    def decorator(func):
+        CONDITIONS[name] = func
+        return func
+    return decorator
+
+
+class ScreenContext:
+    """
+    条件评估的输入：靠右对齐的原始列、最近若干根 K 线的指标以及每只股票的有效 K 线数。
+    """
+    def __init__(self, columns, indicators, bars):
+        self.columns = columns
+        self.indicators = indicators
+        self.bars = bars
+
+    def column(self, name):
+        """
+        原始列（完整长度），name 为 close/volume 等字段名。
+        """
+        for alias in COLUMN_ALIASES.get(name, (name,)):
+            if alias in self.columns:
+                return self.columns[alias]
+        return None
+
+    def series(self, name):
+        """
+        指标或原始列最近若干根 K 线的值，形状 (股票数, history)。
+        """
+        if name in self.indicators:
+            return self.indicators[name]
+        values = self.column(name)
+        if values is None:
+            raise KeyError(f"未知的指标或字段: {name}")
+        history = next(iter(self.indicators.values())).shape[-1]
+        return values[..., -history:]
+
+    def latest(self, name):
+        return self.series(name)[..., -1]
+
+
+@register_condition("macd_cross")
+def macd_cross(context, direction="golden", within=1):
+    """
+    最近 within 根 K 线内 MACD(DIF) 上穿（golden）或下穿（dead）信号线，强度为柱状值占收盘价的比例。
+    """
+    sign = 1.0 if direction == "golden" else -1.0
+    spread = (context.series("MACD") - context.series("Signal")) * sign
+    # 横盘时 DIF 与 DEA 只差浮点舍入误差，按收盘价的相对量级视为 0，避免伪交叉
+    spread = np.where(np.abs(spread) <= CROSS_TOLERANCE * np.abs(context.series("close")), 0.0, spread)
+    with np.errstate(invalid="ignore"):
+        crossed = (spread[..., 1:] > 0) & (spread[..., :-1] <= 0)
+    passed = crossed[..., -within:].any(axis=-1) & (spread[..., -1] > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        strength = sign * context.latest("Histogram") / context.latest("close")
+    return passed, strength
+
+
+@register_condition("volume_spike")
+def volume_spike(context, window=20, ratio=2.0):
+    """
+    最新成交量达到前 window 根 K 线均量的 ratio 倍，强度为实际倍数。
+    """
+    volume = context.column("volume")
+    if volume is None:
+        return np.zeros(len(context.bars), dtype=bool), np.full(len(context.bars), np.nan)
+    average = sma(volume[..., :-1], window)[..., -1] if volume.shape[-1] > window else np.full(len(context.bars), np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        multiple = volume[..., -1] / average
+    return np.nan_to_num(multiple) >= ratio, multiple
+
+
+@register_condition("kdj_oversold")
+def kdj_oversold(context, line="K", threshold=20):
+    """
+    KDJ 指定线（K/D/J）低于 threshold，强度为低于阈值的幅度。
+    """
+    if line not in context.indicators:
+        return np.zeros(len(context.bars), dtype=bool), np.full(len(context.bars), np.nan)
+    value = context.latest(line)
+    with np.errstate(invalid="ignore"):
+        return value < threshold, threshold - value
+
+
+@register_condition("compare")
+def compare(context, left, op, right):
+    """
+    通用比较：left/right 为指标名、字段名或数值，如 RSI14 < 30、close > MA20。
+    强度为 left 相对 right 的偏离比例（按比较方向取正）。
+    """
+    if op not in COMPARISONS:
+        raise ValueError(f"不支持的比较运算符: {op}")
+    left_value = context.latest(left) if isinstance(left, str) else np.full(len(context.bars), float(left))
+    right_value = context.latest(right) if isinstance(right, str) else float(right)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        passed = COMPARISONS[op](left_value, right_value)
+        strength = (left_value - right_value) / np.abs(right_value)
+    return passed, strength if op in (">", ">=") else -strength
+
+
+def _percentile_rank(values, passed):
+    # 满足条件的股票按强度排名，映射到 (0, 1]；未满足或强度缺失的为 0
+    result = np.zeros(len(values))
+    candidates = np.flatnonzero(passed & ~np.isnan(values))
+    if len(candidates):
+        order = np.argsort(np.argsort(values[candidates], kind="stable"), kind="stable")
+        result[candidates] = (order + 1) / len(candidates)
+    return result
+
+
+class Screener:
+    """
+    声明式条件选股器。
+
+    :param conditions: list[dict], 条件列表，每项包含 type 及该类型的参数，可选 name（展示名）和 weight（权重）
+    :param match: str or int, "all" / "any" / 至少满足的条件数
+    :param top_n: int, 候选清单长度，None 表示不截断
+    :param min_bars: int, 参与筛选所需的最少有效 K 线数
+    """
+    def __init__(self, conditions, match="all", top_n=20, min_bars=35):
+        self.conditions = []
+        for spec in conditions:
+            spec = dict(spec)
+            condition_type = spec.pop("type", None)
+            if condition_type not in CONDITIONS:
+                raise ValueError(f"未知的选股条件类型: {condition_type}")
+            name = spec.pop("name", condition_type)
+            weight = float(spec.pop("weight", 1.0))
+            self.conditions.append((name, CONDITIONS[condition_type], weight, spec))
+        if not self.conditions:
+            raise ValueError("至少需要一个选股条件")
+        if match == "all":
+            match = len(self.conditions)
+        elif match == "any":
+            match = 1
+        self.min_matches = int(match)
+        self.top_n = top_n
+        self.min_bars = min_bars
+
+    def _history(self):
+        # 指标需要保留的最近 K 线根数（交叉类条件需要前一根）
+        return max(int(params.get("within", 1)) + 1 for _, _, _, params in self.conditions)
+
+    def evaluate(self, symbols, price_data, mask=None):
+        """
+        评估全部股票，返回每个条件的满足情况与综合得分。
+        :param symbols: list[str], 与矩阵各行对应的股票代码
+        :param price_data: dict, {列名: 二维数组}（如 BarReader.read_matrix 的结果），缺失为 NaN
+        :param mask: array(bool), 有效 K 线位置，默认收盘价非 NaN
+        :return: dict, {"symbols", "bars", "passed": {条件名: 数组}, "matches", "score", "indicators"}
+        """
+        symbols = list(symbols)
+        aligned, bars = align_right(price_data, mask)
+        if any(values.shape[0] != len(symbols) for values in aligned.values()):
+            raise ValueError("股票代码数量与矩阵行数不一致")
+        indicators = compute_indicators(aligned, last=self._history())
+        context = ScreenContext(aligned, indicators, bars)
+
+        eligible = bars >= self.min_bars
+        passed = {}
+        matches = np.zeros(len(symbols), dtype=np.int64)
+        score = np.zeros(len(symbols))
+        for name, func, weight, params in self.conditions:
+            condition_passed, strength = func(context, **params)
+            condition_passed = np.asarray(condition_passed, dtype=bool) & eligible
+            passed[name] = condition_passed
+            matches += condition_passed
+            # 满足一个条件至少得 0.5 * weight，同条件内强度越高越接近 weight
+            score += weight * condition_passed * (0.5 + 0.5 * _percentile_rank(np.asarray(strength, dtype=float), condition_passed))
+        return {
+            "symbols": symbols,
+            "bars": bars,
+            "passed": passed,
+            "matches": matches,
+            "score": score,
+            "indicators": {name: values[..., -1] for name, values in indicators.items()},
+            "close": context.latest("close"),
+        }
+
+    def screen(self, symbols, price_data, mask=None):
+        """
+        筛选并排序，返回候选清单。
+        :return: list[dict], 每项包含 symbol、score、matched（满足的条件名）、close、bars 和最新指标值，按得分降序
+        """
+        evaluation = self.evaluate(symbols, price_data, mask)
+        selected = np.flatnonzero(evaluation["matches"] >= self.min_matches)
+        order = selected[np.lexsort((-evaluation["score"][selected], -evaluation["matches"][selected]))]
+        if self.top_n is not None:
+            order = order[:self.top_n]
+        shortlist = []
+        for row in order:
+            shortlist.append({
+                "symbol": evaluation["symbols"][row],
+                "score": round(float(evaluation["score"][row]), 4),
+                "matched": [name for name, values in evaluation["passed"].items() if values[row]],
+                "close": float(evaluation["close"][row]),
+                "bars": int(evaluation["bars"][row]),
+                "indicators": {name: float(values[row]) for name, values in evaluation["indicators"].items()},
+            })
+        return shortlist
+
+
+def format_shortlist(shortlist, indicators=("MA5", "MA20", "MACD", "Signal", "K", "D", "RSI14")):
+    """
+    将候选清单格式化为文本，便于记录日志或作为大模型提示词的一部分。
+    """
+    lines = []
+    for rank, item in enumerate(shortlist, start=1):
+        values = ", ".join(
+            f"{name}={item['indicators'][name]:.2f}" for name in indicators if name in item["indicators"]
+        )
+        lines.append(f"{rank}. {item['symbol']} 收盘 {item['close']:.2f} 得分 {item['score']:.2f} "
+                     f"条件 {'/'.join(item['matched'])} | {values}")
+    return "\n".join(lines)
+
+
+def get_screener_config():
+    """
+    读取 settings.json 中的 screener 配置并补全默认值。
+    """
+    try:
+        screener_settings = get_settings_service().get_settings().get("screener", {})
+    except FileNotFoundError:
+        screener_settings = {}
+    config = dict(DEFAULT_SCREENER_CONFIG)
+    config.update(screener_settings)
+    return config
+
+
+def screen_universe(symbols=None, reader=None, config=None, end=None):
+    """
+    从本地 K 线存储读取全市场（或指定股票）数据并筛选。
+    :param symbols: list[str], 股票代码，默认存储中的全部股票
+    :param reader: BarReader, 默认使用共享 daily 存储
+    :param config: dict, 选股配置，默认读取 settings.json
+    :param end: 截止日期，None 表示最新
+    :return: list[dict], 候选清单
+    """
+    from src.storage.bar_reader import BarReader
+
+    config = config or get_screener_config()
+    reader = reader or BarReader()
+    names, matrix, _ = reader.read_matrix(symbols, length=config["lookback"], end=end)
+    screener = Screener(
+        config["conditions"], match=config["match"], top_n=config["top_n"], min_bars=config["min_bars"]
+    )
+    shortlist = screener.screen(names, matrix)
+    logging.info(f"选股完成: {len(names)} 只股票中筛出 {len(shortlist)} 只")
+    return shortlist
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
+    arguments = sys.argv[1:]
+    monitor = "--monitor" in arguments
+    codes = [argument for argument in arguments if not argument.startswith("--")]
+    result = screen_universe(codes or None)
+    print(format_shortlist(result))
+    if monitor:
+        # 只有候选清单中的股票交给大模型分析
+        from src.analyzer.stock_realtime_monitor import stock_realtime_monitor
+
+        for item in result:
+            stock_realtime_monitor(item["symbol"])
@@ -4,8 +4,12 @@ import json
 import pandas as pd
 import logging
 import datetime
+import functools
 from src.data_fetcher.fetch_api_data import fetch_api_data
-from src.llm.api_request import submit_request_to_api, CONFIG
+from src.data_fetcher.field_mapper import get_field_mapper
+from src.data_fetcher.parallel_fetch import fetch_concurrently
+from src.data_fetcher.response_cache import get_response_cache
+from src.llm.api_request import submit_request_to_api, load_config
 
 
 # 动态添加项目根目录到 sys.path
@@ -18,7 +22,7 @@ logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
 
 
 # 数据获取模块
-def get_stock_data(stock_code, date, api_key_combined, additional_params=None):
+def get_stock_data(stock_code, date, api_key_combined, additional_params=None, timeout=None):
     """
     获取股票数据的通用函数。
 
@@ -26,13 +30,14 @@ def get_stock_data(stock_code, date, api_key_combined, additional_params=None):
     :param date: str, 日期 (YYYY-MM-DD)
     :param api_key_combined: str, API 字典中对应的 API Key
     :param additional_params: dict, 可选的额外参数
+    :param timeout: float, 请求超时（秒）
     :return: dict, 返回的 API 数据
     """
     try:
         if additional_params is None:
             additional_params = {}
         additional_params.update({"stock_code": stock_code, "date": date})
-        data = fetch_api_data(api_key_combined, additional_params)
+        data = fetch_api_data(api_key_combined, additional_params, timeout=timeout)
         logging.info(f"成功获取数据: {api_key_combined} -> {stock_code}")
         return data
     except Exception as e:
@@ -49,29 +54,8 @@ def map_field_names(api_key_combined, data):
     :return: 替换字段名后的数据
     """
     try:
-        fields_map = {}
-        with open("config/api_fields_dictionary.json", "r", encoding="utf-8") as f:
-            api_data = json.load(f)
-        
-        for api in api_data:
-            if api["API Key Combined"] == api_key_combined:
-                fields_map = {field["field_name"]: field["field_description"] for field in api["fields"]}
-                break
-
-        if not fields_map:
-            raise ValueError(f"未找到API Key Combined为'{api_key_combined}'的字段映射")
-
-        if isinstance(data, list):
-            mapped_data = [
-                {fields_map.get(key, key): value for key, value in item.items()}
-                for item in data
-            ]
-        elif isinstance(data, dict):
-            mapped_data = {fields_map.get(key, key): value for key, value in data.items()}
-        else:
-            raise ValueError("不支持的数据格式")
-
-        return mapped_data
+        # 字段字典由共享的 FieldMapper 缓存，不再每次读取文件
+        return get_field_mapper().map_records(api_key_combined, data)
     except Exception as e:
         logging.error(f"字段名替换失败: {e}")
         return data
@@ -116,14 +100,15 @@ def save_data_to_csv(data, file_path, api_key_combined):
     :param api_key_combined: str, API Key Combined
     """
     try:
-        mapped_data = map_field_names(api_key_combined, data)
-
-        if isinstance(mapped_data, dict):
-            mapped_data = [mapped_data]
-        if not isinstance(mapped_data, list):
+        if not isinstance(data, (dict, list)):
             raise ValueError("数据格式错误，无法保存为 CSV")
 
-        df = pd.DataFrame(mapped_data)
+        # 先构建 DataFrame 再批量重命名列，避免逐行替换字段名
+        df = pd.DataFrame([data] if isinstance(data, dict) else data)
+        try:
+            df = get_field_mapper().to_frame(api_key_combined, df)
+        except Exception as e:
+            logging.error(f"字段名替换失败: {e}")
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
         df.to_csv(file_path, index=False, encoding="utf-8")
         logging.info(f"数据已保存到: {file_path}")
@@ -158,7 +143,7 @@ def analyze_data(txt_file_path, output_folder="data/analysis_results"):
         
         # 调用大模型
         model_name = "gpt-4-all"  # 替换为实际使用的模型名称
-        settings = CONFIG  # 从配置加载
+        settings = load_config()  # 从配置加载
         result = submit_request_to_api(model_name, prompt_text, "", settings)
         
         # 验证模型返回内容
@@ -213,13 +198,27 @@ def monitor_stock(stock_code, date):
         "market_order_book": "ssjy_five-tier_market_order_book",
     }
 
-    all_data = {}
+    # 并发配置：settings.json 中的 monitor.max_workers / monitor.endpoint_timeout（单个请求超时）
+    # / monitor.batch_deadline（整批总时限，默认不限）
+    monitor_config = load_config().get("monitor", {})
+    max_workers = monitor_config.get("max_workers", len(api_list))
+    endpoint_timeout = monitor_config.get("endpoint_timeout", 15)
+    batch_deadline = monitor_config.get("batch_deadline")
 
+    tasks = {}
     for key, api_key_combined in api_list.items():
         additional_params = None
         if "kdj" in key or "macd" or "histrical" in key:
             additional_params = {"time_frame": "dn", "index_code": key.split("_")[-1].upper()}
-        all_data[key] = get_stock_data(stock_code, date, api_key_combined, additional_params)
+        tasks[key] = functools.partial(
+            get_stock_data, stock_code, date, api_key_combined, additional_params, endpoint_timeout
+        )
+
+    # 各接口并发请求，结果按 api_list 的顺序组装
+    all_data = fetch_concurrently(tasks, max_workers=max_workers, deadline=batch_deadline, default=dict)
+    response_cache = get_response_cache()
+    if response_cache is not None:
+        logging.info(f"响应缓存统计: {response_cache.stats}, 命中率 {response_cache.hit_rate():.0%}")
 
     # 使用 datetime 模块生成时间戳
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
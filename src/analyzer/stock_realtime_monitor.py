@@ -3,8 +3,11 @@ import sys
 import json
 import logging
 import datetime
+import functools
 from src.data_fetcher.fetch_api_data import fetch_api_data
-from src.llm.api_request import submit_request_to_api, CONFIG
+from src.data_fetcher.field_mapper import get_field_mapper
+from src.data_fetcher.parallel_fetch import fetch_concurrently
+from src.llm.api_request import submit_request_to_api, load_config
 
 # 动态添加项目根目录到 sys.path
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
@@ -15,16 +18,17 @@ if project_root not in sys.path:
 logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
 
 
-def get_realtime_data(stock_code, api_key_combined):
+def get_realtime_data(stock_code, api_key_combined, timeout=None):
     """
     获取实时盯盘数据的通用函数。
 
     :param stock_code: str, 股票代码
     :param api_key_combined: str, API 字典中对应的 API Key
+    :param timeout: float, 请求超时（秒）
     :return: dict, 返回的 API 数据
     """
     try:
-        data = fetch_api_data(api_key_combined, {"stock_code": stock_code})
+        data = fetch_api_data(api_key_combined, {"stock_code": stock_code}, timeout=timeout)
         logging.info(f"成功获取实时数据: {api_key_combined} -> {stock_code}")
         return data
     except Exception as e:
@@ -41,28 +45,8 @@ def map_field_names(api_key_combined, data):
     :return: list[dict] 或 dict, 替换后的数据
     """
     try:
-        fields_map = {}
-        with open("config/api_fields_dictionary.json", "r", encoding="utf-8") as f:
-            api_data = json.load(f)
-        for api in api_data:
-            if api["API Key Combined"] == api_key_combined:
-                fields_map = {field["field_name"]: field["field_description"] for field in api["fields"]}
-                break
-
-        if not fields_map:
-            raise ValueError(f"未找到 API Key Combined 为 '{api_key_combined}' 的字段映射")
-
-        if isinstance(data, list):
-            mapped_data = [
-                {fields_map.get(key, key): value for key, value in item.items()}
-                for item in data
-            ]
-        elif isinstance(data, dict):
-            mapped_data = {fields_map.get(key, key): value for key, value in data.items()}
-        else:
-            raise ValueError("不支持的数据格式")
-
-        return mapped_data
+        # 字段字典由共享的 FieldMapper 缓存，不再每次读取文件
+        return get_field_mapper().map_records(api_key_combined, data)
     except Exception as e:
         logging.error(f"字段名映射失败: {e}")
         return data
@@ -115,7 +99,7 @@ def analyze_realtime_data(txt_file_path):
         """
 
         model_name = "gpt-4-all"
-        result = submit_request_to_api(model_name, prompt_text, "", CONFIG)
+        result = submit_request_to_api(model_name, prompt_text, "", load_config())
 
         if not result or "choices" not in result or not result["choices"]:
             raise ValueError("大模型未返回有效结果")
@@ -168,10 +152,24 @@ def stock_realtime_monitor(stock_code):
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     txt_file_path = f"data/realtime_monitor/{stock_code}_realtime_{timestamp}.txt"
 
+    # 并发配置：settings.json 中的 monitor.max_workers / monitor.endpoint_timeout（单个请求超时）
+    # / monitor.batch_deadline（整批总时限，默认不限）
+    monitor_config = load_config().get("monitor", {})
+    max_workers = monitor_config.get("max_workers", len(api_list))
+    endpoint_timeout = monitor_config.get("endpoint_timeout", 15)
+    batch_deadline = monitor_config.get("batch_deadline")
+
+    # 各接口并发请求，同一时刻的快照不再依次等待六次往返
+    tasks = {
+        api_key_combined: functools.partial(get_realtime_data, stock_code, api_key_combined, endpoint_timeout)
+        for api_key_combined in api_list
+    }
+    all_data = fetch_concurrently(tasks, max_workers=max_workers, deadline=batch_deadline, default=dict)
+
+    # 按 api_list 的顺序写入，保证输出文件结构稳定
     for api_key_combined, description in api_list.items():
         try:
-            data = get_realtime_data(stock_code, api_key_combined)
-            save_realtime_data_to_txt(data, txt_file_path, api_key_combined)
+            save_realtime_data_to_txt(all_data[api_key_combined], txt_file_path, api_key_combined)
         except Exception as e:
             logging.error(f"{description} 数据处理失败: {e}")
 
@@ -184,4 +182,5 @@ def stock_realtime_monitor(stock_code):
 
 
 if __name__ == "__main__":
-    stock_realtime_monitor("300624")
\ No newline at end of file
+    for code in sys.argv[1:] or ["300624"]:
+        stock_realtime_monitor(code)
\ No newline at end of file
@@ -0,0 +1,282 @@
+import heapq
+import itertools
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from config.settings import get_settings
+from src.data_fetcher.fetch_api_data import fetch_api_data
+from src.utils.trading_calendar import get_trading_calendar
+
+# 配置日志
+logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
+
+# 默认轮询间隔（秒）：盘口变化快、频率高；逐笔与大单数据量大、频率低
+DEFAULT_ENDPOINT_INTERVALS = {
+    "ssjy_five-tier_market_order_book": 5,
+    "ssjy_real-time_trading_data_interface": 10,
+    "ssjy_intraday_time-sharing_transactions": 60,
+    "ssjy_intraday_large_single_transactions": 60,
+    "ssjy_intraday_price-by-price_turnover": 120,
+    "ssjy_intraday_transactions": 120,
+}
+
+
+class WatchlistScheduler:
+    """
+    多股票实时盯盘调度器。
+
+    每个 (股票, 接口) 按各自的间隔轮询；首轮的起始时间在间隔内均匀错开，
+    请求之间保持最小间隔，避免所有股票在同一时刻集中发出请求。
+    所有请求共享同一个线程池和 HTTP 连接池，并统计每只股票的实际轮询速率与延迟。
+
+    :param symbols: list[str], 股票代码列表
+    :param endpoint_intervals: dict, {API Key Combined: 轮询间隔（秒）}
+    :param max_workers: int, 同时进行的请求上限
+    :param min_request_interval: float, 相邻两次请求的最小间隔（秒）
+    :param fetcher: callable(symbol, api_key_combined) -> data, 默认调用 fetch_api_data
+    :param on_data: callable(symbol, api_key_combined, data), 获取到数据后的回调
+    :param market_hours_only: bool, 是否只在交易时段内轮询（午间休市、收盘后、节假日暂停）
+    :param calendar: TradingCalendar, 交易日历，默认使用共享日历
+    """
+    def __init__(self, symbols, endpoint_intervals=None, max_workers=8, min_request_interval=0.0,
+                 fetcher=None, on_data=None, market_hours_only=False, calendar=None):
+        self.symbols = list(dict.fromkeys(symbols))
+        self.endpoint_intervals = dict(endpoint_intervals or DEFAULT_ENDPOINT_INTERVALS)
+        self.max_workers = max_workers
+        self.min_request_interval = min_request_interval
+        self.fetcher = fetcher or self._fetch
+        self.on_data = on_data
+        self.market_hours_only = market_hours_only
+        self.calendar = calendar
+        self.latest = {}
+
+        self._heap = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._in_flight = set()
+        self._next_request_at = 0.0
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._executor = None
+        self._started_at = None
+        self.stats = {
+            symbol: {"polls": 0, "errors": 0, "skipped": 0, "lag_total": 0.0, "lag_max": 0.0}
+            for symbol in self.symbols
+        }
+
+    @staticmethod
+    def _fetch(symbol, api_key_combined):
+        return fetch_api_data(api_key_combined, {"stock_code": symbol})
+
+    def _seed_schedule(self, now):
+        # 同一接口的各股票在一个间隔内均匀错开，不同接口再相互错开一小段
+        symbol_count = max(1, len(self.symbols))
+        endpoint_count = max(1, len(self.endpoint_intervals))
+        for endpoint_index, (api_key, interval) in enumerate(self.endpoint_intervals.items()):
+            step = interval / symbol_count
+            for symbol_index, symbol in enumerate(self.symbols):
+                due = now + step * symbol_index + step * endpoint_index / endpoint_count
+                heapq.heappush(self._heap, (due, next(self._sequence), symbol, api_key))
+
+    def _pace(self):
+        # 保证相邻请求之间的最小间隔，将突发请求摊平
+        now = time.monotonic()
+        start_at = max(now, self._next_request_at)
+        self._next_request_at = start_at + self.min_request_interval
+        if start_at > now:
+            self._stop_event.wait(start_at - now)
+
+    def _poll(self, symbol, api_key, due):
+        lag = time.monotonic() - due
+        try:
+            data = self.fetcher(symbol, api_key)
+            self.latest[(symbol, api_key)] = data
+            if self.on_data:
+                self.on_data(symbol, api_key, data)
+            with self._lock:
+                stats = self.stats[symbol]
+                stats["polls"] += 1
+                stats["lag_total"] += lag
+                stats["lag_max"] = max(stats["lag_max"], lag)
+        except Exception as e:
+            logging.error(f"轮询失败: {api_key} -> {symbol}, 错误: {e}")
+            with self._lock:
+                self.stats[symbol]["errors"] += 1
+        finally:
+            with self._lock:
+                self._in_flight.discard((symbol, api_key))
+            self._slots.release()
+
+    def _wait_for_session(self):
+        """
+        休市期间暂停，直到开盘或停止；返回是否发生过暂停。
+        """
+        calendar = self.calendar or get_trading_calendar()
+        paused = False
+        while not self._stop_event.is_set():
+            wait_seconds = calendar.seconds_until_open()
+            if wait_seconds <= 0:
+                break
+            if not paused:
+                logging.info(f"休市中，暂停轮询，{wait_seconds:.0f} 秒后开盘")
+                paused = True
+            self._stop_event.wait(min(wait_seconds, 30.0))
+        return paused
+
+    def _dispatch_loop(self):
+        while not self._stop_event.is_set():
+            if self.market_hours_only and self._wait_for_session():
+                # 开盘后重新错开各请求，避免休市期间积压的任务同时发出
+                self._heap.clear()
+                self._seed_schedule(time.monotonic())
+                continue
+            due, _, symbol, api_key = self._heap[0]
+            delay = due - time.monotonic()
+            if delay > 0:
+                self._stop_event.wait(min(delay, 1.0))
+                continue
+            heapq.heappop(self._heap)
+
+            # 固定频率调度；落后超过一个间隔时不补发，直接从当前时间重新计时
+            interval = self.endpoint_intervals[api_key]
+            next_due = due + interval
+            now = time.monotonic()
+            if next_due < now:
+                next_due = now + interval
+            heapq.heappush(self._heap, (next_due, next(self._sequence), symbol, api_key))
+
+            with self._lock:
+                # 上一次请求尚未返回时跳过本轮，避免同一接口请求堆积
+                if (symbol, api_key) in self._in_flight:
+                    self.stats[symbol]["skipped"] += 1
+                    continue
+                self._in_flight.add((symbol, api_key))
+
+            while not self._slots.acquire(timeout=0.5):
+                if self._stop_event.is_set():
+                    return
+            self._pace()
+            self._executor.submit(self._poll, symbol, api_key, due)
+
+    def start(self):
+        """
+        在后台线程中启动调度。
+        """
+        if self._thread is not None:
+            raise RuntimeError("调度器已启动")
+        if not self.symbols or not self.endpoint_intervals:
+            raise ValueError("股票列表和接口列表不能为空")
+        self._started_at = time.monotonic()
+        self._seed_schedule(self._started_at)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="watchlist")
+        self._thread = threading.Thread(target=self._dispatch_loop, name="watchlist-dispatcher", daemon=True)
+        self._thread.start()
+        logging.info(f"盯盘调度器已启动: {len(self.symbols)} 只股票, {len(self.endpoint_intervals)} 个接口")
+
+    def stop(self, wait=True):
+        """
+        停止调度并等待进行中的请求结束。
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+
+    def run(self, duration=None, report_interval=60):
+        """
+        阻塞运行调度器，定期输出统计报告。
+
+        :param duration: float, 运行时长（秒），None 表示直到 Ctrl+C
+        :param report_interval: float, 报告输出间隔（秒）
+        """
+        self.start()
+        deadline = None if duration is None else time.monotonic() + duration
+        try:
+            while deadline is None or time.monotonic() < deadline:
+                remaining = report_interval if deadline is None else min(report_interval, deadline - time.monotonic())
+                if self._stop_event.wait(max(0.0, remaining)):
+                    break
+                logging.info(f"盯盘统计:\n{self.format_report()}")
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def report(self):
+        """
+        统计每只股票的实际轮询速率与延迟。
+
+        :return: dict, {symbol: {"polls", "errors", "skipped", "polls_per_minute",
+                 "expected_per_minute", "avg_lag", "max_lag"}}
+        """
+        elapsed = max(1e-9, time.monotonic() - (self._started_at or time.monotonic()))
+        expected_per_minute = sum(60.0 / interval for interval in self.endpoint_intervals.values())
+        result = {}
+        with self._lock:
+            for symbol, stats in self.stats.items():
+                polls = stats["polls"]
+                result[symbol] = {
+                    "polls": polls,
+                    "errors": stats["errors"],
+                    "skipped": stats["skipped"],
+                    "polls_per_minute": polls * 60.0 / elapsed,
+                    "expected_per_minute": expected_per_minute,
+                    "avg_lag": stats["lag_total"] / polls if polls else 0.0,
+                    "max_lag": stats["lag_max"],
+                }
+        return result
+
+    def format_report(self):
+        """
+        生成可读的统计报告。
+        """
+        lines = []
+        for symbol, stats in self.report().items():
+            lines.append(
+                f"  {symbol}: {stats['polls_per_minute']:.1f}/{stats['expected_per_minute']:.1f} 次/分钟, "
+                f"平均延迟 {stats['avg_lag']:.2f}s, 最大延迟 {stats['max_lag']:.2f}s, "
+                f"失败 {stats['errors']}, 跳过 {stats['skipped']}"
+            )
+        return "\n".join(lines)
+
+
+def create_scheduler_from_settings(settings=None, **kwargs):
+    """
+    根据 settings.json 中的 watchlist 配置创建调度器。
+
+    配置示例::
+
+        "watchlist": {
+            "symbols": ["300624", "600519"],
+            "endpoints": {"ssjy_five-tier_market_order_book": 5},
+            "max_workers": 8,
+            "min_request_interval": 0.05,
+            "market_hours_only": true
+        }
+    """
+    settings = settings if settings is not None else get_settings()
+    watchlist_config = settings.get("watchlist", {})
+    return WatchlistScheduler(
+        watchlist_config.get("symbols", []),
+        endpoint_intervals=watchlist_config.get("endpoints"),
+        max_workers=watchlist_config.get("max_workers", 8),
+        min_request_interval=watchlist_config.get("min_request_interval", 0.0),
+        market_hours_only=watchlist_config.get("market_hours_only", True),
+        **kwargs
+    )
+
+
+if __name__ == "__main__":
+    create_scheduler_from_settings().run()
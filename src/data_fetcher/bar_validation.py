@@ -0,0 +1,266 @@
+import logging
+import os
+import sys
+from operator import itemgetter
+
+import numpy as np
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+# 必盈 API 的 K 线字段名
+BY_BAR_FIELDS = {"time": "t", "open": "o", "close": "c", "high": "h", "low": "l", "volume": "v"}
+
+# 必盈 API 历史 K 线接口（hszbl/fsjy）的字段名，时间字段为 d
+BY_KLINE_FIELDS = dict(BY_BAR_FIELDS, time="d")
+
+# Alpha Vantage 转换后的 K 线字段名
+AV_BAR_FIELDS = {"time": "timestamp", "open": "open", "close": "close", "high": "high", "low": "low", "volume": "volume"}
+
+# 拒绝原因，按检查顺序排列；每行只计入第一个命中的原因
+REJECT_REASONS = ("missing_field", "invalid_type", "high_below_low", "negative_volume", "duplicate_timestamp")
+
+# 时间字段之外需要转换类型的字段
+_NUMERIC_FIELDS = ("open", "close", "high", "low", "volume")
+
+# 对象列按块转换，含无法转换的值时只有所在的块退回逐值检查
+_CHUNK_SIZE = 8192
+
+# 成交量以 int64 保存，绝对值不小于 2^63 的值无法表示
+_INT64_LIMIT = 2.0 ** 63
+
+
+def records_to_columns(records, names):
+    """
+    将记录列表转换为列字典 {字段名: list}，缺失字段记为 None。
+    """
+    columns = {}
+    for name in names:
+        try:
+            columns[name] = list(map(itemgetter(name), records))
+        except KeyError:
+            columns[name] = [record.get(name) for record in records]
+    return columns
+
+
+class _RecordColumn:
+    """
+    记录列表中某个字段的只读列视图。数值字段按块直接从记录取值转换，不先复制为列表；缺失字段取值为 None。
+    """
+    def __init__(self, records, name):
+        self.records = records
+        self.name = name
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index].get(self.name)
+
+    def __iter__(self):
+        try:
+            return iter(list(map(itemgetter(self.name), self.records)))
+        except KeyError:
+            return (record.get(self.name) for record in self.records)
+
+    def chunk(self, start, stop):
+        return _RecordChunk(self.records[start:stop], self.name)
+
+
+class _RecordChunk(_RecordColumn):
+    def __iter__(self):
+        # 缺少字段时抛出 KeyError，由调用方按块退回逐值检查
+        return map(itemgetter(self.name), self.records)
+
+
+def _record_columns(records, fields, keep=()):
+    # 时间字段与保留字段复制为列表，数值字段使用列视图
+    numeric = {fields[logical] for logical in _NUMERIC_FIELDS}
+    names = list(fields.values()) + [name for name in keep if name not in fields.values()]
+    columns = records_to_columns(records, [name for name in names if name not in numeric])
+    columns.update({name: _RecordColumn(records, name) for name in numeric})
+    return columns, names
+
+
+def _to_numeric(values, parse):
+    """
+    按 parse（float 或 int）的语义把一列转换为 float64，无法转换的值为 NaN。
+    数值数组直接转换；其余按块交给 np.fromiter（与内置 float()/int() 的转换规则一致）。
+    """
+    if isinstance(values, np.ndarray) and values.dtype.kind in "biuf":
+        values = values.astype("float64")
+        return np.trunc(values) if parse is int else values
+    if not isinstance(values, (list, _RecordColumn)):
+        values = list(values)
+    dtype = "int64" if parse is int else "float64"
+    result = np.empty(len(values), dtype="float64")
+    for start in range(0, len(values), _CHUNK_SIZE):
+        stop = min(start + _CHUNK_SIZE, len(values))
+        chunk = values.chunk(start, stop) if isinstance(values, _RecordColumn) else values[start:stop]
+        try:
+            result[start:stop] = np.fromiter(chunk, dtype=dtype, count=stop - start)
+        except (KeyError, TypeError, ValueError, OverflowError):
+            result[start:stop] = [_parse_or_nan(parse, values[index]) for index in range(start, stop)]
+    return result
+
+
+def _parse_or_nan(parse, value):
+    try:
+        return parse(value)
+    except (TypeError, ValueError, OverflowError):
+        return np.nan
+
+
+def _time_codes(times):
+    """
+    时间字段编码：无重复且无缺失时返回 None；否则返回整数编码，缺失（None/NaN）为 -1。
+    """
+    try:
+        unique = set(times)
+    except TypeError:
+        unique = None
+    if unique is not None and len(unique) == len(times) and None not in unique:
+        return None
+    import pandas as pd
+
+    return pd.factorize(np.asarray(times, dtype=object))[0]
+
+
+def validate_bar_columns(columns, fields=BY_BAR_FIELDS, example_limit=3):
+    """
+    向量化校验一批 K 线。
+
+    依次检查字段缺失（缺少字段或值为 None/NaN）、类型转换（价格按 float()、成交量按 int() 的语义：
+    成交量数值截断取整，'12.5' 这类非整数字符串视为类型错误；inf 与超出 int64 范围的成交量视为类型错误）、
+    最高价不低于最低价、成交量非负，最后在有效行中按时间戳去重（保留第一次出现）。
+
+    Args:
+        columns (dict): {字段名: 序列} 的列式批次。
+        fields (dict): 逻辑字段（time/open/close/high/low/volume）到实际字段名的映射。
+        example_limit (int): 拒绝摘要中每种原因保留的示例行号数量。
+    Returns:
+        tuple: (mask, converted, summary)
+            mask (np.ndarray): 有效行的布尔掩码。
+            converted (dict): {实际字段名: 转换后的数组}，价格为 float64，成交量为 int64。
+            summary (dict): {"total", "valid", "rejected": {原因: 数量}, "examples": {原因: [行号]}}。
+    """
+    present = [columns[name] for name in fields.values() if name in columns]
+    total = len(present[0]) if present else 0
+    reasons = np.full(total, -1, dtype=np.int8)
+
+    def reject(condition, reason):
+        # 只标记尚未被拒绝的行
+        reasons[(reasons < 0) & condition] = REJECT_REASONS.index(reason)
+
+    time_name = fields["time"]
+    times = columns.get(time_name)
+    codes = None if times is None else _time_codes(times)
+    missing = np.full(total, times is None) if codes is None else codes < 0
+
+    converted, invalid = {}, np.zeros(total, dtype=bool)
+    for logical in _NUMERIC_FIELDS:
+        name = fields[logical]
+        values = columns.get(name)
+        if values is None:
+            converted[name] = np.full(total, np.nan)
+            missing[:] = True
+            continue
+        numeric = _to_numeric(values, int if logical == "volume" else float)
+        if logical == "volume":
+            # 超出 int64 范围的成交量按类型错误处理
+            numeric[np.abs(numeric) >= _INT64_LIMIT] = np.nan
+        bad = np.flatnonzero(~np.isfinite(numeric))
+        if len(bad):
+            # 只对转换失败的少数行区分缺失与类型错误
+            empty = np.array([_is_missing(values[index]) for index in bad.tolist()], dtype=bool)
+            missing[bad[empty]] = True
+            invalid[bad[~empty]] = True
+        converted[name] = numeric
+    reject(missing, "missing_field")
+    reject(invalid, "invalid_type")
+
+    with np.errstate(invalid="ignore"):
+        reject(converted[fields["high"]] < converted[fields["low"]], "high_below_low")
+        reject(converted[fields["volume"]] < 0, "negative_volume")
+
+    if codes is not None:
+        valid = np.flatnonzero(reasons < 0)
+        duplicated = np.ones(total, dtype=bool)
+        duplicated[valid[np.unique(codes[valid], return_index=True)[1]]] = False
+        reject(duplicated, "duplicate_timestamp")
+
+    mask = reasons < 0
+    volume = converted[fields["volume"]]
+    converted[fields["volume"]] = np.where(mask, np.nan_to_num(volume), 0).astype("int64")
+    converted[time_name] = np.asarray(times if times is not None else [None] * total, dtype=object)
+
+    counts = np.bincount(reasons[reasons >= 0], minlength=len(REJECT_REASONS))
+    summary = {
+        "total": total,
+        "valid": int(mask.sum()),
+        "rejected": {reason: int(count) for reason, count in zip(REJECT_REASONS, counts) if count},
+        "examples": {
+            reason: np.flatnonzero(reasons == index)[:example_limit].tolist()
+            for index, reason in enumerate(REJECT_REASONS) if counts[index]
+        },
+    }
+    return mask, converted, summary
+
+
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and np.isnan(value))
+
+
+def validate_bars(batch, fields=BY_BAR_FIELDS, keep=()):
+    """
+    校验一批 K 线并返回干净的列式批次，不修改输入记录。
+    结果可直接交给 BarStore.append。
+    Args:
+        batch (list or dict): 记录列表或列字典。
+        fields (dict): 字段名映射。
+        keep (tuple): 不参与校验、原样保留的其他字段（如成交额 'e'），缺失为 None。
+    Returns:
+        tuple: (clean, summary)，clean 为 {实际字段名: 有效行数组}。
+    """
+    if isinstance(batch, dict):
+        columns, names = batch, list(fields.values()) + [name for name in keep if name not in fields.values()]
+    else:
+        columns, names = _record_columns(batch, fields, keep)
+    mask, converted, summary = validate_bar_columns(columns, fields)
+    clean = {name: values[mask] for name, values in converted.items()}
+    for name in names[len(fields):]:
+        if name in columns:
+            clean[name] = np.asarray(columns[name], dtype=object)[mask]
+    return clean, summary
+
+
+def clean_records(records, fields=BY_BAR_FIELDS):
+    """
+    校验记录列表，返回转换了类型的有效记录（保留其余字段）和拒绝摘要。
+    需要逐条记录的调用方使用；批量入库请用 validate_bars 返回的列式批次，省去逐条回写。
+    """
+    columns, _ = _record_columns(records, fields)
+    mask, converted, summary = validate_bar_columns(columns, fields)
+    kept = np.flatnonzero(mask).tolist()
+    cleaned = [records[index] for index in kept]
+    for logical in _NUMERIC_FIELDS:
+        name = fields[logical]
+        # 已是目标类型（价格 float、成交量 int）的列不回写
+        expected = int if logical == "volume" else float
+        if set(map(type, columns[name])) == {expected}:
+            continue
+        for entry, value in zip(cleaned, converted[name][kept].tolist()):
+            entry[name] = value
+    return cleaned, summary
+
+
+def log_rejection_summary(summary):
+    """
+    输出一行拒绝摘要，替代逐行告警。
+    """
+    if summary["rejected"]:
+        logging.warning(f"跳过无效条目 {summary['total'] - summary['valid']} 条: "
+                        f"{summary['rejected']}, 示例行号: {summary['examples']}")
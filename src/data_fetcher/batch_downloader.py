@@ -0,0 +1,233 @@
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from config.settings import PROJECT_ROOT, get_settings_service
+
+# 默认批量下载配置，可在 settings.json 的 "batch_download" 节点中覆盖
+DEFAULT_BATCH_CONFIG = {
+    "max_workers": 8,            # 并发请求数（总速率仍受限流器约束）
+    "checkpoint_every": 50,      # 每完成多少只股票保存一次进度
+    "checkpoint_dir": "data/checkpoints",
+}
+
+
+class Checkpoint:
+    """
+    批量任务的进度文件：记录已完成和失败的股票，中断后重新运行时跳过已完成部分。
+    """
+    def __init__(self, path):
+        self.path = path
+        self.completed = set()
+        self.failed = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except FileNotFoundError:
+            return
+        except json.JSONDecodeError as e:
+            logging.warning(f"进度文件损坏，重新开始: {self.path}, 错误: {e}")
+            return
+        self.completed = set(payload.get("completed", []))
+        self.failed = dict(payload.get("failed", {}))
+
+    def mark(self, symbol, error=None):
+        with self._lock:
+            if error is None:
+                self.completed.add(symbol)
+                self.failed.pop(symbol, None)
+            else:
+                self.failed[symbol] = str(error)
+
+    def save(self):
+        with self._lock:
+            payload = {
+                "completed": sorted(self.completed),
+                "failed": dict(self.failed),
+                "updated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            }
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+    def reset(self):
+        with self._lock:
+            self.completed.clear()
+            self.failed.clear()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class BatchDownloader:
+    """
+    多股票批量下载器：并发请求、断点续传、结果直接写入本地存储。
+
+    :param fetcher: callable(symbol) -> data, 获取单只股票的数据
+    :param writer: callable(symbol, data), 写入本地存储
+    :param checkpoint_path: str, 进度文件路径
+    :param max_workers: int, 并发数
+    :param checkpoint_every: int, 每完成多少只股票保存一次进度
+    """
+    def __init__(self, fetcher, writer, checkpoint_path, max_workers=8, checkpoint_every=50):
+        self.fetcher = fetcher
+        self.writer = writer
+        self.checkpoint = Checkpoint(checkpoint_path)
+        self.max_workers = max(1, max_workers)
+        self.checkpoint_every = max(1, checkpoint_every)
+
+    def _download(self, symbol):
+        self.writer(symbol, self.fetcher(symbol))
+
+    def run(self, symbols, retry_failed=True):
+        """
+        下载全部股票，已完成的股票直接跳过。
+        :param symbols: list[str], 股票代码列表
+        :param retry_failed: bool, 是否重试上次失败的股票
+        :return: dict, {"total", "skipped", "completed", "failed", "elapsed"}
+        """
+        symbols = list(dict.fromkeys(symbols))
+        pending = [
+            symbol for symbol in symbols
+            if symbol not in self.checkpoint.completed
+            and (retry_failed or symbol not in self.checkpoint.failed)
+        ]
+        skipped = len(symbols) - len(pending)
+        logging.info(f"批量下载: 共 {len(symbols)} 只, 跳过 {skipped} 只, 待下载 {len(pending)} 只")
+
+        started = time.monotonic()
+        completed = failed = since_checkpoint = 0
+        queue = iter(pending)
+        in_flight = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="batch") as executor:
+            try:
+                # 只保持有限数量的任务在途，避免一次性为数千只股票创建 Future
+                for symbol in queue:
+                    in_flight[executor.submit(self._download, symbol)] = symbol
+                    if len(in_flight) >= self.max_workers * 2:
+                        break
+                while in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        symbol = in_flight.pop(future)
+                        error = future.exception()
+                        if error is None:
+                            completed += 1
+                        else:
+                            failed += 1
+                            logging.warning(f"下载失败: {symbol}, 错误: {error}")
+                        self.checkpoint.mark(symbol, error)
+                        since_checkpoint += 1
+                        next_symbol = next(queue, None)
+                        if next_symbol is not None:
+                            in_flight[executor.submit(self._download, next_symbol)] = next_symbol
+                    if since_checkpoint >= self.checkpoint_every:
+                        self.checkpoint.save()
+                        since_checkpoint = 0
+                        logging.info(f"批量下载进度: 完成 {completed}, 失败 {failed}, 剩余 {len(pending) - completed - failed}")
+            finally:
+                for future in in_flight:
+                    future.cancel()
+                self.checkpoint.save()
+
+        return {
+            "total": len(symbols),
+            "skipped": skipped,
+            "completed": completed,
+            "failed": failed,
+            "elapsed": time.monotonic() - started,
+        }
+
+
+def _last_stored_date(store, symbol):
+    import numpy as np
+
+    if not store.length(symbol):
+        return None
+    last_time = store.read(symbol, ["t"])["t"][-1]
+    return str(np.datetime64(int(last_time), "s"))[:10]
+
+
+def download_history_batch(symbols=None, time_frame="dn", start_date=None, end_date=None,
+                           max_workers=None, checkpoint_path=None, dataset=None):
+    """
+    批量下载历史 K 线并追加到列式存储。已有数据的股票只请求最后日期之后的部分。
+
+    :param symbols: list[str], 股票代码列表，默认使用 fetch_stock_list 返回的全部股票
+    :param time_frame: str, K 线周期
+    :param start_date: str, 开始日期 'YYYY-MM-DD'，已有数据时以最后日期为准
+    :param end_date: str, 截止日期 'YYYY-MM-DD'
+    :param max_workers: int, 并发数，默认读取 batch_download.max_workers
+    :param checkpoint_path: str, 进度文件路径，默认 data/checkpoints/history_<dataset>_<end_date>.json
+    :param dataset: str, 列式存储数据集名称，默认按周期推导（'dn' 为 daily）；与周期不一致时抛出 ValueError
+    :return: dict, 下载统计
+    """
+    from src.data_fetcher.bar_validation import BY_BAR_FIELDS, BY_KLINE_FIELDS, log_rejection_summary, validate_bars
+    from src.data_fetcher.fetch_data_by import fetch_kline_data, fetch_stock_list
+    from src.storage.bar_store import bar_dataset, get_bar_store
+
+    # 不同周期的 K 线不能写入同一数据集，否则分钟线会混入日线
+    expected_dataset = bar_dataset(time_frame)
+    if dataset is None:
+        dataset = expected_dataset
+    elif dataset != expected_dataset:
+        raise ValueError(f"数据集 {dataset} 与周期 {time_frame} 不一致，应为 {expected_dataset}")
+
+    try:
+        batch_settings = get_settings_service().get_settings().get("batch_download", {})
+    except FileNotFoundError:
+        batch_settings = {}
+    config = dict(DEFAULT_BATCH_CONFIG)
+    config.update(batch_settings)
+
+    if symbols is None:
+        symbols = [item["dm"].split(".")[0] for item in fetch_stock_list()]
+    end_date = end_date or time.strftime("%Y-%m-%d")
+    if checkpoint_path is None:
+        checkpoint_path = os.path.join(PROJECT_ROOT, config["checkpoint_dir"], f"history_{dataset}_{end_date}.json")
+    store = get_bar_store(dataset)
+
+    def fetcher(symbol):
+        last_date = _last_stored_date(store, symbol)
+        return fetch_kline_data(symbol, time_frame, last_date or start_date, end_date)
+
+    def writer(symbol, data):
+        fields = BY_KLINE_FIELDS if data and "d" in data[0] else BY_BAR_FIELDS
+        # 列式批次直接入库，不逐条回写记录
+        clean, rejection_summary = validate_bars(data, fields, keep=("e",))
+        log_rejection_summary(rejection_summary)
+        if rejection_summary["valid"]:
+            store.append(symbol, clean)
+
+    downloader = BatchDownloader(
+        fetcher,
+        writer,
+        checkpoint_path,
+        max_workers=max_workers or config["max_workers"],
+        checkpoint_every=config["checkpoint_every"],
+    )
+    summary = downloader.run(symbols)
+    logging.info(f"批量下载完成: {summary}")
+    return summary
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    download_history_batch(sys.argv[1:] or None)
@@ -0,0 +1,386 @@
+import json
+import logging
+import os
+import string
+import sys
+import threading
+import time
+from datetime import datetime
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from config.settings import PROJECT_ROOT, get_settings_service
+from src.data_fetcher.response_cache import MISS, get_response_cache
+from src.utils import http_client
+from src.utils.json_stream import iter_column_chunks, iter_json_array
+from src.utils.rate_limiter import get_rate_limiter
+
+
+def resolve_project_path(path):
+    """
+    将配置中的相对路径解析为项目根目录下的绝对路径。
+    """
+    if not path:
+        return None
+    return os.path.join(PROJECT_ROOT, path)
+
+
+# 接口支持的日期区间与周期参数名（按优先级），以及日期参数的格式
+START_DATE_PARAMS = ("st", "start_date", "begin_date", "start")
+END_DATE_PARAMS = ("et", "end_date", "end")
+PERIOD_PARAMS = ("time_frame", "period")
+DATE_PARAM_FORMATS = {"st": "%Y%m%d", "et": "%Y%m%d"}
+DEFAULT_DATE_FORMAT = "%Y-%m-%d"
+
+
+def request_period(*params):
+    """
+    从请求参数（路径参数、查询参数字典）中取 K 线周期，没有时返回 None。
+    """
+    for values in params:
+        for name in PERIOD_PARAMS:
+            if values and values.get(name):
+                return values[name]
+    return None
+
+
+def format_date_param(name, value):
+    """
+    将 'YYYY-MM-DD' 日期转换为接口参数要求的格式。
+    """
+    return datetime.strptime(str(value)[:10], "%Y-%m-%d").strftime(DATE_PARAM_FORMATS.get(name, DEFAULT_DATE_FORMAT))
+
+
+def filter_records_by_date(records, start_date=None, end_date=None):
+    """
+    客户端按日期区间（含两端）过滤记录，时间字段为 't' 或 'd'，按日期部分比较。
+    """
+    filtered = []
+    for record in records:
+        value = record.get("t", record.get("d"))
+        if value is None:
+            continue
+        day = str(value)[:10]
+        if (start_date is None or day >= start_date) and (end_date is None or day <= end_date):
+            filtered.append(record)
+    return filtered
+
+
+def mask_api_key(url, api_key):
+    """
+    隐藏 URL 中的 api_key，用于日志输出。
+    """
+    return url.replace(api_key, "***") if api_key else url
+
+
+def _path_prefixes(url_template):
+    # URL 模板中第一个占位符之前的各级路径前缀，如 '/hsmy/lscj/{stock_code}' -> ['hsmy', 'hsmy/lscj']
+    static_part = url_template.split("{", 1)[0]
+    segments = [segment for segment in static_part.split("/") if segment]
+    if "{" in url_template and not static_part.endswith("/") and segments:
+        # 最后一段与占位符相连（如 'abc{code}'），不是完整路径段
+        segments = segments[:-1]
+    return ["/".join(segments[:index]) for index in range(1, len(segments) + 1)]
+
+
+def _file_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except (OSError, TypeError):
+        return None
+
+
+class ApiEndpoint:
+    """
+    API 数据字典中单个接口的预处理结果：参数说明只解析一次，URL 模板预先拆分为字面量与占位符。
+    """
+    def __init__(self, api_info):
+        self.key = api_info.get("API Key Combined")
+        self.info = api_info
+        self.url_template = api_info.get("url_template") or ""
+
+        # API Params 为 JSON 字符串，从 Excel 转换而来时可能为空值
+        raw_params = api_info.get("API Params")
+        self.params = json.loads(raw_params) if isinstance(raw_params, str) and raw_params.strip() else {}
+
+        # 预编译 URL 模板: [(字面量, 占位符, 格式说明, 转换标记), ...]
+        self.segments = list(string.Formatter().parse(self.url_template))
+        self.placeholders = tuple(field for _, field, _, _ in self.segments if field)
+
+    def required_params(self, exclude=()):
+        """
+        返回必需参数名（排除由配置提供的参数，如 api_key）。
+        """
+        return [key for key in self.params if key not in exclude]
+
+    def find_param(self, candidates):
+        """
+        返回接口声明的第一个候选参数名（参数说明或 URL 模板中），未声明时返回 None。
+        """
+        for name in candidates:
+            if name in self.params or name in self.placeholders:
+                return name
+        return None
+
+    def date_range_params(self):
+        """
+        返回接口声明的 (开始日期参数, 截止日期参数)，任一未声明时对应位置为 None。
+        """
+        return self.find_param(START_DATE_PARAMS), self.find_param(END_DATE_PARAMS)
+
+    def render_path(self, params):
+        """
+        使用预编译的模板片段生成请求路径，等价于 url_template.format(**params)。
+        """
+        parts = []
+        for literal, field, format_spec, conversion in self.segments:
+            parts.append(literal)
+            if field is None:
+                continue
+            if field not in params:
+                raise KeyError(field)
+            value = params[field]
+            if conversion == "r":
+                value = repr(value)
+            elif conversion == "a":
+                value = ascii(value)
+            elif conversion == "s":
+                value = str(value)
+            parts.append(format(value, format_spec) if format_spec else str(value))
+        return "".join(parts)
+
+
+class ByApiManager:
+    """
+    必盈 API 管理器：一次性加载 API 数据字典与字段数据字典并按 API Key Combined 建立索引，
+    提供 URL 构建与数据请求。
+
+    :param settings: dict, 配置字典，默认使用全局缓存的 settings.json
+    """
+    def __init__(self, settings=None):
+        self.settings = settings if settings is not None else get_settings_service().get_settings()
+        byapi_config = self.settings.get("byapi", {})
+        self.api_key = byapi_config.get("api_key")
+        self.base_url = (byapi_config.get("api_url") or "").rstrip("/")
+        self.api_data_path = resolve_project_path(byapi_config.get("api_data_json_path"))
+        self.fields_data_path = resolve_project_path(byapi_config.get("fields_data_json_path"))
+
+        self.api_data = self.load_api_data()
+        self.endpoints = {key: ApiEndpoint(info) for key, info in self.api_data.items()}
+        # URL 路径前缀索引，同一前缀按数据字典顺序取第一个接口
+        self._prefix_index = {}
+        for endpoint in self.endpoints.values():
+            for prefix in _path_prefixes(endpoint.url_template):
+                self._prefix_index.setdefault(prefix, endpoint)
+        self.fields_data = self.load_fields_data()
+        self._fields_index = {}
+        for field in self.fields_data:
+            self._fields_index.setdefault(field.get("API Key Combined"), []).append(field)
+
+    def load_api_data(self):
+        """
+        加载 API 数据字典并按 API Key Combined 建立索引。
+        :return: dict, {API Key Combined: API 信息}
+        """
+        if not self.api_data_path or not os.path.exists(self.api_data_path):
+            raise FileNotFoundError(f"API 数据字典未找到: {self.api_data_path}")
+        with open(self.api_data_path, "r", encoding="utf-8") as f:
+            api_data_list = json.load(f)
+        return {item["API Key Combined"]: item for item in api_data_list if item.get("API Key Combined")}
+
+    def load_fields_data(self):
+        """
+        加载字段数据字典（可选）。
+        :return: list[dict], 字段信息列表
+        """
+        if not self.fields_data_path:
+            return []
+        if not os.path.exists(self.fields_data_path):
+            logging.warning(f"字段数据字典未找到: {self.fields_data_path}")
+            return []
+        with open(self.fields_data_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def get_endpoint(self, api_key_combined):
+        """
+        按 API Key Combined 获取预处理后的接口信息。
+        """
+        endpoint = self.endpoints.get(api_key_combined)
+        if endpoint is None:
+            raise ValueError(f"API '{api_key_combined}' 未找到")
+        return endpoint
+
+    def find_endpoint(self, path_prefix):
+        """
+        按 URL 模板的路径前缀（完整路径段，如 'hsmy/lscj'）查找接口，未找到时返回 None。
+        """
+        return self._prefix_index.get(path_prefix.strip("/"))
+
+    def get_fields_by_api_key(self, api_key_combined):
+        """
+        获取指定 API 的字段信息列表。
+        """
+        return self._fields_index.get(api_key_combined, [])
+
+    def build_url(self, api_key_combined, additional_params=None):
+        """
+        校验参数并生成完整请求 URL。
+
+        :param api_key_combined: str, 唯一主键 (Category Code + "_" + API Code)
+        :param additional_params: dict, 动态参数（如 stock_code 等，不包括 api_key）
+        :return: str, 完整 URL
+        """
+        if not self.api_key:
+            raise ValueError("配置文件中未找到有效的 api_key")
+        endpoint = self.get_endpoint(api_key_combined)
+        if additional_params is None:
+            additional_params = {}
+
+        # api_key 由配置文件提供，不要求调用方传入
+        missing_params = [key for key in endpoint.required_params(exclude=("api_key",)) if key not in additional_params]
+        if missing_params:
+            raise ValueError(f"缺少必需参数: {missing_params}")
+
+        formatted_params = {**additional_params, "api_key": self.api_key}
+        api_path = endpoint.render_path(formatted_params)
+        return f"{self.base_url}/{api_path.lstrip('/')}"
+
+    def fetch_api_data(self, api_key_combined, additional_params=None, timeout=None, use_cache=True, **kwargs):
+        """
+        请求指定 API 的数据。命中响应缓存时直接返回，否则按许可证与接口限流发起请求。
+
+        :param api_key_combined: str, 唯一主键
+        :param additional_params: dict, 动态参数
+        :param timeout: float, 请求超时（秒），默认使用 HTTP 配置
+        :param use_cache: bool, 是否使用响应缓存（按接口 TTL 缓存，实时类接口默认不缓存）
+        :param kwargs: dict, 作为查询字符串附加的参数
+        :return: dict or list, API 返回的 JSON
+        """
+        full_url = self.build_url(api_key_combined, additional_params)
+        logging.debug(f"请求 URL: {mask_api_key(full_url, self.api_key)}")
+
+        cache = get_response_cache() if use_cache else None
+        if cache is not None:
+            cache_key = cache.make_key(full_url, kwargs)
+            cached = cache.get(api_key_combined, cache_key)
+            if cached is not MISS:
+                return cached
+
+        response = get_rate_limiter().call(
+            api_key_combined, http_client.get, full_url, params=kwargs, timeout=timeout
+        )
+        response.raise_for_status()
+        data = response.json()
+        if cache is not None:
+            cache.put(api_key_combined, cache_key, data, period=request_period(additional_params, kwargs))
+        return data
+
+
+    def stream_api_data(self, api_key_combined, additional_params=None, chunk_size=None, timeout=None, **kwargs):
+        """
+        以流式方式请求数据：边接收边解析顶层 JSON 数组，逐行产出或按固定行数产出列式块。
+
+        :param api_key_combined: str, 唯一主键
+        :param additional_params: dict, 动态参数
+        :param chunk_size: int, 为 None 时逐行产出 dict，否则产出 {字段名: [值, ...]} 的列式块
+        :param timeout: float, 请求超时（秒）
+        :param kwargs: dict, 作为查询字符串附加的参数
+        :return: generator
+        """
+        full_url = self.build_url(api_key_combined, additional_params)
+        response = get_rate_limiter().call(
+            api_key_combined, http_client.get, full_url, params=kwargs, timeout=timeout, stream=True
+        )
+        try:
+            response.raise_for_status()
+            rows = iter_json_array(response.iter_content(chunk_size=65536), response.encoding or "utf-8")
+            yield from (rows if chunk_size is None else iter_column_chunks(rows, chunk_size))
+        finally:
+            response.close()
+
+    def fetch_range(self, api_key_combined, additional_params=None, start_date=None, end_date=None,
+                    period=None, timeout=None, use_cache=True):
+        """
+        请求日期区间内的数据。接口声明了开始/截止日期参数时由服务端过滤，
+        否则请求全部数据后在客户端按日期过滤。
+
+        :param api_key_combined: str, 唯一主键
+        :param additional_params: dict, 动态参数（如 stock_code）
+        :param start_date: str, 开始日期 'YYYY-MM-DD'
+        :param end_date: str, 截止日期 'YYYY-MM-DD'
+        :param period: str, 周期（如 time_frame 的 'dn'、'5m'），接口未声明周期参数时忽略
+        :param timeout: float, 请求超时（秒）
+        :param use_cache: bool, 是否使用响应缓存
+        :return: list, 日期区间内的记录
+        """
+        endpoint = self.get_endpoint(api_key_combined)
+        params = dict(additional_params or {})
+        query = {}
+
+        def set_param(name, value):
+            params[name] = value
+            # 不在 URL 模板中的参数作为查询字符串发送
+            if name not in endpoint.placeholders:
+                query[name] = value
+
+        if period is not None:
+            period_param = endpoint.find_param(PERIOD_PARAMS)
+            if period_param:
+                set_param(period_param, period)
+            else:
+                logging.warning(f"接口 {api_key_combined} 不支持周期参数，忽略 period={period}")
+
+        start_param, end_param = endpoint.date_range_params()
+        if start_date and start_param:
+            set_param(start_param, format_date_param(start_param, start_date))
+        if end_date and end_param:
+            set_param(end_param, format_date_param(end_param, end_date))
+
+        data = self.fetch_api_data(api_key_combined, params, timeout=timeout, use_cache=use_cache, **query)
+        if not isinstance(data, list):
+            return data
+        # 服务端未处理的区间端在客户端补充过滤
+        return filter_records_by_date(
+            data,
+            None if start_param else start_date,
+            None if end_param else end_date,
+        )
+
+
+# 数据字典文件的 mtime 检查间隔（秒）；settings.json 变化时立即检查
+DICTIONARY_CHECK_INTERVAL = 5.0
+
+_MANAGER_CACHE = {"signature": None, "manager": None, "settings_version": None, "checked_at": 0.0}
+_MANAGER_LOCK = threading.Lock()
+
+def get_api_manager():
+    """
+    获取进程内共享的 ByApiManager。settings.json 或数据字典文件变化时自动重建；
+    数据字典的 mtime 最多每 DICTIONARY_CHECK_INTERVAL 秒检查一次。
+
+    :return: ByApiManager
+    """
+    service = get_settings_service()
+    settings = service.get_settings()
+    now = time.monotonic()
+    with _MANAGER_LOCK:
+        manager = _MANAGER_CACHE["manager"]
+        if (manager is not None and _MANAGER_CACHE["settings_version"] == service.version
+                and now - _MANAGER_CACHE["checked_at"] < DICTIONARY_CHECK_INTERVAL):
+            return manager
+        byapi_config = settings.get("byapi", {})
+        signature = (
+            service.version,
+            _file_mtime(resolve_project_path(byapi_config.get("api_data_json_path"))),
+            _file_mtime(resolve_project_path(byapi_config.get("fields_data_json_path"))),
+        )
+        if manager is None or _MANAGER_CACHE["signature"] != signature:
+            _MANAGER_CACHE["manager"] = ByApiManager(settings)
+            _MANAGER_CACHE["signature"] = signature
+        _MANAGER_CACHE["settings_version"] = service.version
+        _MANAGER_CACHE["checked_at"] = now
+        return _MANAGER_CACHE["manager"]
@@ -1,7 +1,6 @@
 import json
 import logging
 import os
-import requests
 import csv
 import sys
 
@@ -11,15 +10,16 @@ if __name__ == "__main__" and "src" not in sys.path:
     if project_root not in sys.path:
         sys.path.insert(0, project_root)
 
+from config.settings import get_settings
+from src.data_fetcher.bar_validation import AV_BAR_FIELDS, clean_records, log_rejection_summary
+from src.utils import http_client
+
 logging.basicConfig(level=logging.INFO)
 
 # 加载 API 配置
 def load_api_config():
-    settings_path = "config/settings.json"
     try:
-        with open(settings_path, "r") as f:
-            settings = json.load(f)
-        logging.info("API configuration successfully loaded.")
+        settings = get_settings()
         return {
             "api_key": settings["alphavantage"]["api_key"],
             "base_url": settings["alphavantage"]["api_url"]
@@ -31,13 +31,14 @@ API_CONFIG = load_api_config()
 
 # 通用的时间序列数据获取函数
 def fetch_time_series_data(symbol, interval):
+    api_config = load_api_config()
     params = {
         "function": "TIME_SERIES_INTRADAY",
         "symbol": symbol,
         "interval": interval,
-        "apikey": API_CONFIG["api_key"]
+        "apikey": api_config["api_key"]
     }
-    response = requests.get(API_CONFIG["base_url"], params=params)
+    response = http_client.get(api_config["base_url"], params=params)
     if response.status_code != 200:
         logging.error(f"API request failed with status code {response.status_code}: {response.text}")
         raise RuntimeError("Failed to fetch data from API.")
@@ -74,12 +75,13 @@ def fetch_intraday_data(symbol, interval="5min"):
 
 # 获取每日历史数据
 def fetch_daily_data(symbol, days=5):
+    api_config = load_api_config()
     params = {
         "function": "TIME_SERIES_DAILY",
         "symbol": symbol,
-        "apikey": API_CONFIG["api_key"]
+        "apikey": api_config["api_key"]
     }
-    response = requests.get(API_CONFIG["base_url"], params=params)
+    response = http_client.get(api_config["base_url"], params=params)
     if response.status_code != 200:
         logging.error(f"API request failed with status code {response.status_code}: {response.text}")
         raise RuntimeError("Failed to fetch daily data from API.")
@@ -106,38 +108,12 @@ def fetch_daily_data(symbol, days=5):
 
 # 清洗和验证数据
 def clean_and_validate_data(data):
+    """
+    按列批量校验 K 线，无效条目汇总为一条日志。
+    """
     logging.info("Starting data cleaning and validation.")
-    cleaned_data = []
-    seen_timestamps = set()
-
-    for idx, entry in enumerate(data):
-        try:
-            # 验证字段完整性
-            required_keys = ["timestamp", "open", "close", "high", "low", "volume"]
-            for key in required_keys:
-                if key not in entry:
-                    raise ValueError(f"Missing required field: {key}")
-            
-            # 转换类型并验证范围
-            entry["open"] = float(entry["open"])
-            entry["close"] = float(entry["close"])
-            entry["high"] = float(entry["high"])
-            entry["low"] = float(entry["low"])
-            entry["volume"] = int(entry["volume"])
-            if entry["high"] < entry["low"]:
-                raise ValueError("High price cannot be lower than low price.")
-            if entry["volume"] < 0:
-                raise ValueError("Volume cannot be negative.")
-            
-            # 检查时间戳重复
-            if entry["timestamp"] in seen_timestamps:
-                raise ValueError("Duplicate timestamp detected.")
-            seen_timestamps.add(entry["timestamp"])
-            
-            cleaned_data.append(entry)
-        except (ValueError, KeyError) as e:
-            logging.warning(f"Skipping invalid entry at index {idx}: {entry}, Reason: {e}")
-    
+    cleaned_data, summary = clean_records(data, AV_BAR_FIELDS)
+    log_rejection_summary(summary)
     logging.info(f"Data cleaning completed. Valid entries: {len(cleaned_data)}")
     return cleaned_data
 
@@ -1,7 +1,6 @@
 import json
 import logging
 import os
-import requests
 import sys
 
 # 添加项目根目录到 sys.path
@@ -10,14 +9,20 @@ if __name__ == "__main__" and "src" not in sys.path:
     if project_root not in sys.path:
         sys.path.insert(0, project_root)
 
+from config.settings import get_settings
+from src.data_fetcher.bar_validation import BY_BAR_FIELDS, clean_records, log_rejection_summary
+from src.data_fetcher.by_api_manager import get_api_manager
+from src.data_fetcher.symbol_master import normalize_code
+from src.utils import http_client
+from src.storage.history_store import get_history_store
+from src.utils.rate_limiter import endpoint_key, get_rate_limiter
+
 logging.basicConfig(level=logging.INFO)
 
 # 加载 API 配置
 def load_api_config():
-    settings_path = "config/settings.json"
     try:
-        with open(settings_path, "r") as f:
-            settings = json.load(f)
+        settings = get_settings()
         return {
             "api_key": settings["byapi"]["api_key"],
             "base_url": settings["byapi"]["api_url"]
@@ -29,8 +34,9 @@ API_CONFIG = load_api_config()
 
 # 获取沪深股票列表
 def fetch_stock_list():
-    url = f"{API_CONFIG['base_url']}hslt/list/{API_CONFIG['api_key']}"
-    response = requests.get(url)
+    api_config = load_api_config()
+    url = f"{api_config['base_url']}hslt/list/{api_config['api_key']}"
+    response = get_rate_limiter().call(endpoint_key("hslt/list"), http_client.get, url)
     response_data = response.json()
     if isinstance(response_data, list):
         return response_data
@@ -43,8 +49,9 @@ def fetch_realtime_data(symbol):
     """
     获取股票的实时交易数据
     """
-    url = f"{API_CONFIG['base_url']}hsrl/ssjy/{symbol}/{API_CONFIG['api_key']}"
-    response = requests.get(url)
+    api_config = load_api_config()
+    url = f"{api_config['base_url']}hsrl/ssjy/{symbol}/{api_config['api_key']}"
+    response = get_rate_limiter().call(endpoint_key("hsrl/ssjy"), http_client.get, url)
     response_data = response.json()
 
     try:
@@ -64,10 +71,63 @@ def fetch_realtime_data(symbol):
         logging.error(f"API 响应数据解析失败: {response_data}")
         raise ValueError(f"无法获取 {symbol} 的实时交易数据，请检查 API 配置或参数。") from e
     
+# 查找支持日期区间参数的接口
+def _find_range_endpoint(path_prefix):
+    """
+    在 API 数据字典中查找指定路径的接口，仅当其声明了开始或截止日期参数时返回。
+    Returns:
+        tuple: (ApiEndpoint, ByApiManager)，不支持时为 (None, None)。
+    """
+    try:
+        manager = get_api_manager()
+    except (FileNotFoundError, ValueError) as e:
+        logging.debug(f"API 数据字典不可用，使用客户端过滤: {e}")
+        return None, None
+    endpoint = manager.find_endpoint(path_prefix)
+    if endpoint is None or not any(endpoint.date_range_params()):
+        return None, None
+    return endpoint, manager
+
+# 获取指定周期的历史 K 线
+def fetch_kline_data(symbol, time_frame="dn", start_date=None, end_date=None,
+                     api_key_combined="lssj_historical_intraday_trading"):
+    """
+    获取指定周期的历史 K 线。周期与日期区间在数据字典声明了对应参数时由服务端处理，
+    否则在客户端按日期过滤。
+    Args:
+        symbol (str): 股票代码，例如 '000001'
+        time_frame (str): 周期，如 'dn'（日线）、'5m'
+        start_date (str): 开始日期（格式 'YYYY-MM-DD'）
+        end_date (str): 截止日期（格式 'YYYY-MM-DD'）
+        api_key_combined (str): 数据字典中的接口主键
+    Returns:
+        list: K 线数据列表
+    """
+    symbol = normalize_code(symbol) or symbol
+    return get_api_manager().fetch_range(
+        api_key_combined, {"stock_code": symbol}, start_date, end_date, period=time_frame
+    )
+
+# 下载完整历史交易数据
+def download_historical_data(symbol):
+    """
+    从服务端下载完整的历史成交分布数据（接口不支持时间参数）
+    """
+    api_config = load_api_config()
+    url = f"{api_config['base_url']}hsmy/lscj/{symbol}/{api_config['api_key']}"
+    response = get_rate_limiter().call(endpoint_key("hsmy/lscj"), http_client.get, url)
+    response.raise_for_status()
+    return response.json()
+
 # 获取历史交易数据
 def fetch_historical_data(symbol, start_date=None, end_date=None):
     """
     获取历史交易数据 (历史成交分布)，支持时间范围过滤
+    数据先增量同步到本地历史存储，再从本地按日期区间查询；
+    本地已覆盖所需日期或刚同步过时不再请求服务端。
+    接口支持日期区间参数时，本地未覆盖的区间直接向服务端请求，结果不写入本地存储。
+    hsmy/lscj 接口没有日期参数，每次同步都下载完整历史：盘中截止日期为今天时，
+    每隔 min_refresh_seconds 仍会下载一次完整数据；收盘后同步过一次即不再下载，直到下一个交易时段开盘。
     Args:
         symbol (str): 股票代码，例如 '000001'
         start_date (str): 开始日期（格式 'YYYY-MM-DD'），默认最近10天
@@ -77,8 +137,8 @@ def fetch_historical_data(symbol, start_date=None, end_date=None):
     """
     from datetime import datetime, timedelta
 
-    # 确保 symbol 格式正确（去除 sh、sz 前缀，只保留纯数字代码）
-    symbol = symbol.replace("sh", "").replace("sz", "")
+    # 确保 symbol 格式正确（去除交易所前缀/后缀，只保留纯数字代码）
+    symbol = normalize_code(symbol) or symbol
 
     # 默认获取最近10天的数据
     if not start_date:
@@ -86,62 +146,44 @@ def fetch_historical_data(symbol, start_date=None, end_date=None):
     if not end_date:
         end_date = datetime.now().strftime('%Y-%m-%d')
 
-    # 构建 API 请求 URL，假设 API 支持时间参数
-    url = f"{API_CONFIG['base_url']}hsmy/lscj/{symbol}/{API_CONFIG['api_key']}"
     logging.info(f"Fetching historical data for {symbol} from {start_date} to {end_date}...")
+    store = get_history_store("hsmy_lscj")
 
-    try:
-        # 模拟 API 调用 (替换为真实 API 请求逻辑)
-        response = requests.get(url)
-        response.raise_for_status()
-        raw_data = response.json()
+    # 本地存储未覆盖所需日期、且数据字典声明了日期区间参数时，只向服务端请求区间内的数据。
+    # 区间结果只是部分窗口，不合并进按完整历史维护的本地存储：否则最后日期前移后，
+    # 更早的区间会被误判为已覆盖，回退到本地查询时返回不完整的历史
+    endpoint, manager = _find_range_endpoint("hsmy/lscj")
+    if endpoint is not None and store.needs_sync(symbol, end_date):
+        try:
+            data = manager.fetch_range(endpoint.key, {"stock_code": symbol}, start_date, end_date)
+            logging.info(f"Fetched {len(data)} records for the specified date range.")
+            return data
+        except Exception as e:
+            logging.error(f"Error fetching historical data by range: {e}")
 
-        # 过滤数据
-        filtered_data = [
-            record for record in raw_data
-            if start_date <= record['t'] <= end_date
-        ]
+    try:
+        store.sync(symbol, lambda: download_historical_data(symbol), end_date)
+    except Exception as e:
+        # 同步失败时仍返回本地已有的数据
+        logging.error(f"Error fetching historical data: {e}")
 
+    try:
+        filtered_data = store.query(symbol, start_date, end_date)
         logging.info(f"Fetched {len(filtered_data)} records for the specified date range.")
         return filtered_data
     except Exception as e:
-        logging.error(f"Error fetching historical data: {e}")
+        logging.error(f"Error reading historical data: {e}")
         return []
     
 # 清洗和验证数据
 def clean_and_validate_data(data):
+    """
+    清洗和验证 K 线数据：字段完整、类型转换、最高价不低于最低价、成交量非负、时间戳去重。
+    校验以列为单位批量执行，无效条目汇总为一条日志。
+    """
     logging.info("开始数据清洗和验证。")
-    cleaned_data = []
-    seen_timestamps = set()
-
-    for entry in data:
-        try:
-            # 验证字段完整性
-            required_keys = ["t", "o", "c", "h", "l", "v"]
-            for key in required_keys:
-                if key not in entry:
-                    raise ValueError(f"缺少必要字段: {key}")
-            
-            # 转换类型并验证范围
-            entry["o"] = float(entry["o"])
-            entry["c"] = float(entry["c"])
-            entry["h"] = float(entry["h"])
-            entry["l"] = float(entry["l"])
-            entry["v"] = int(entry["v"])
-            if entry["h"] < entry["l"]:
-                raise ValueError("最高价不能低于最低价。")
-            if entry["v"] < 0:
-                raise ValueError("成交量不能为负。")
-            
-            # 检查时间戳重复
-            if entry["t"] in seen_timestamps:
-                raise ValueError("检测到重复的时间戳。")
-            seen_timestamps.add(entry["t"])
-            
-            cleaned_data.append(entry)
-        except (ValueError, KeyError) as e:
-            logging.warning(f"跳过无效条目: {entry}, 原因: {e}")
-    
+    cleaned_data, summary = clean_records(data, BY_BAR_FIELDS)
+    log_rejection_summary(summary)
     logging.info(f"数据清洗完成。有效条目数: {len(cleaned_data)}")
     return cleaned_data
 
@@ -0,0 +1,136 @@
+import json
+import os
+import sys
+import threading
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from config.settings import get_settings_service
+from src.data_fetcher.by_api_manager import resolve_project_path
+
+DEFAULT_FIELDS_DICTIONARY = "config/api_fields_dictionary.json"
+
+
+class FieldMapper:
+    """
+    API 字段名映射：将接口返回的字段名（如 o、h、l）替换为字段说明（如 开盘价（元））。
+
+    字段字典只加载一次并按 API Key Combined 建立映射表；文件修改后在下一次访问时重新加载。
+    列表数据按“键集合”缓存重命名结果，同结构的行只计算一次新键名；
+    DataFrame 与列式数据直接批量重命名列。
+
+    :param dictionary_path: str, api_fields_dictionary.json 的路径
+    """
+    def __init__(self, dictionary_path):
+        self.dictionary_path = dictionary_path
+        self._mappings = None
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            mtime = os.stat(self.dictionary_path).st_mtime_ns
+        except FileNotFoundError:
+            raise FileNotFoundError(f"字段字典未找到: {self.dictionary_path}")
+        with self._lock:
+            if self._mappings is None or mtime != self._mtime:
+                with open(self.dictionary_path, "r", encoding="utf-8") as f:
+                    api_data = json.load(f)
+                self._mappings = {
+                    api["API Key Combined"]: {field["field_name"]: field["field_description"] for field in api["fields"]}
+                    for api in api_data
+                }
+                self._mtime = mtime
+            return self._mappings
+
+    def get_mapping(self, api_key_combined):
+        """
+        获取指定 API 的字段映射表。
+
+        :param api_key_combined: str, API Key Combined
+        :return: dict, {field_name: field_description}
+        """
+        fields_map = self._load().get(api_key_combined)
+        if not fields_map:
+            raise ValueError(f"未找到 API Key Combined 为 '{api_key_combined}' 的字段映射")
+        return fields_map
+
+    def map_records(self, api_key_combined, data):
+        """
+        替换 dict 或 list[dict] 数据的字段名。
+
+        :param api_key_combined: str, API Key Combined
+        :param data: list[dict] 或 dict, API 返回的数据
+        :return: list[dict] 或 dict, 替换后的数据
+        """
+        fields_map = self.get_mapping(api_key_combined)
+        if isinstance(data, dict):
+            return {fields_map.get(key, key): value for key, value in data.items()}
+        if not isinstance(data, list):
+            raise ValueError("不支持的数据格式")
+
+        # 同一接口返回的行通常字段一致，按键集合缓存新键名
+        renamed_keys = {}
+        mapped_data = []
+        for item in data:
+            keys = tuple(item)
+            new_keys = renamed_keys.get(keys)
+            if new_keys is None:
+                new_keys = renamed_keys[keys] = [fields_map.get(key, key) for key in keys]
+            mapped_data.append(dict(zip(new_keys, item.values())))
+        return mapped_data
+
+    def map_columns(self, api_key_combined, columns):
+        """
+        替换列式数据（{字段名: 列数据}）的字段名，列数据本身不复制。
+
+        :param api_key_combined: str, API Key Combined
+        :param columns: dict, {field_name: list 或 ndarray}
+        :return: dict, {field_description: 列数据}
+        """
+        fields_map = self.get_mapping(api_key_combined)
+        return {fields_map.get(key, key): values for key, values in columns.items()}
+
+    def to_frame(self, api_key_combined, data):
+        """
+        将 API 数据转换为 DataFrame 并批量重命名列。
+
+        :param api_key_combined: str, API Key Combined
+        :param data: list[dict]、dict 或 DataFrame
+        :return: pandas.DataFrame
+        """
+        import pandas as pd
+
+        if isinstance(data, dict):
+            data = [data]
+        df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+        return df.rename(columns=self.get_mapping(api_key_combined))
+
+
+_MAPPERS = {}
+_MAPPERS_LOCK = threading.Lock()
+
+def get_field_mapper(dictionary_path=None):
+    """
+    获取进程内共享的字段映射器。
+
+    :param dictionary_path: str, 字段字典路径，默认读取 settings.json 中的
+        byapi.api_fields_json_path，未配置时使用 config/api_fields_dictionary.json
+    :return: FieldMapper
+    """
+    if dictionary_path is None:
+        try:
+            byapi_config = get_settings_service().get_settings().get("byapi", {})
+        except FileNotFoundError:
+            byapi_config = {}
+        dictionary_path = byapi_config.get("api_fields_json_path", DEFAULT_FIELDS_DICTIONARY)
+    dictionary_path = resolve_project_path(dictionary_path)
+    with _MAPPERS_LOCK:
+        mapper = _MAPPERS.get(dictionary_path)
+        if mapper is None:
+            mapper = _MAPPERS[dictionary_path] = FieldMapper(dictionary_path)
+        return mapper
@@ -0,0 +1,42 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+
+def fetch_concurrently(tasks, max_workers=None, deadline=None, default=None):
+    """
+    并发执行多个数据获取任务，并按任务的原始顺序返回结果。
+
+    单个请求的超时由任务自身传给 HTTP 调用（如 fetch_api_data 的 timeout 参数），
+    这里不再按提交时间计时，排队等待线程的任务不会因此提前超时。
+
+    :param tasks: dict, {任务名: 无参可调用对象}，结果顺序与该 dict 的顺序一致
+    :param max_workers: int, 最大并发数，默认等于任务数
+    :param deadline: float, 整批任务的总时限（秒，从提交起计），None 表示不限；
+                     超过时限仍未完成的任务按失败处理
+    :param default: 任务失败或超时时使用的默认值工厂（无参可调用），默认返回 None
+    :return: dict, {任务名: 结果}
+    """
+    if not tasks:
+        return {}
+    max_workers = max(1, min(max_workers or len(tasks), len(tasks)))
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch")
+    results = {}
+    try:
+        expires_at = None if deadline is None else time.monotonic() + deadline
+        futures = {name: executor.submit(task) for name, task in tasks.items()}
+        for name, future in futures.items():
+            remaining = None if expires_at is None else max(0.0, expires_at - time.monotonic())
+            try:
+                results[name] = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                future.cancel()
+                logging.error(f"获取数据超时: {name} (超过整批时限 {deadline} 秒)")
+                results[name] = default() if default else None
+            except Exception as e:
+                logging.error(f"获取数据失败: {name}, 错误: {e}")
+                results[name] = default() if default else None
+    finally:
+        # 不等待已超过时限的任务，其 HTTP 请求会在各自的超时后结束
+        executor.shutdown(wait=False, cancel_futures=True)
+    return results
@@ -0,0 +1,277 @@
+import copy
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from config.settings import PROJECT_ROOT, get_settings_service
+from src.utils.trading_calendar import get_trading_calendar
+
+# 默认配置，可在 settings.json 的 "response_cache" 节点中覆盖
+DEFAULT_RESPONSE_CACHE_CONFIG = {
+    "enabled": True,
+    "path": "data/cache/responses",
+    "default_ttl": 0,          # 未匹配规则的接口不缓存
+    "ttls": {},                # {API Key Combined 或前缀: 盘中缓存秒数}，0 表示不缓存
+    "max_memory_entries": 512,
+    "prune_interval": 3600,    # 清理磁盘上过期缓存文件的最小间隔（秒）
+}
+
+# 默认按接口前缀设置的盘中缓存时间（秒）：历史类数据按 K 线周期更新，实时类数据不缓存。
+# 请求带周期参数时改按周期计算，这里的值只用于没有周期参数的请求
+DEFAULT_ENDPOINT_TTLS = {
+    "lssj_": 300,
+    "ssjy_": 0,
+}
+
+
+def period_seconds(period):
+    """
+    K 线周期对应的缓存秒数：分钟周期（'5m'、'60m'）为一根 K 线的时长，
+    日线及以上（'dn'、'wq'、'mh' 等）在当前交易时段内不变，为 math.inf；无法识别时返回 None。
+    """
+    period = str(period or "").strip().lower()
+    minutes = re.fullmatch(r"(\d+)m", period)
+    if minutes:
+        return int(minutes.group(1)) * 60
+    if len(period) == 2 and period[0] in "dwmy":
+        return math.inf
+    return None
+
+MISS = object()
+
+
+class ResponseCache:
+    """
+    API 响应缓存：按请求 URL 与参数缓存 JSON 结果，内存与磁盘两级存储。
+    盘中按 K 线周期（无周期参数时按接口 TTL）过期且不跨越当前交易时段，
+    休市期间（含午间休市、节假日）缓存到下一次开盘。磁盘上的过期文件在读取时删除，并定期清理。
+
+    :param root: str, 磁盘缓存目录
+    :param ttls: dict, {API Key Combined 或前缀: 盘中缓存秒数}，最长前缀优先
+    :param default_ttl: float, 未匹配规则时的缓存秒数
+    :param max_memory_entries: int, 内存中保留的最大条目数
+    :param clock: callable() -> datetime, 当前时间，便于测试替换
+    :param calendar: TradingCalendar, 交易日历，默认使用共享日历
+    :param prune_interval: float, 清理磁盘过期文件的最小间隔（秒），0 表示每次写入都清理
+    """
+    def __init__(self, root, ttls=None, default_ttl=0, max_memory_entries=512, clock=datetime.now,
+                 calendar=None, prune_interval=3600):
+        self.root = root
+        self.ttls = dict(DEFAULT_ENDPOINT_TTLS)
+        self.ttls.update(ttls or {})
+        self.default_ttl = default_ttl
+        self.max_memory_entries = max_memory_entries
+        self.clock = clock
+        self.calendar = calendar
+        self.prune_interval = prune_interval
+        self._pruned_at = None
+        self._memory = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "expired": 0, "pruned": 0}
+
+    def ttl_for(self, api_key_combined, period=None):
+        """
+        获取接口的盘中缓存秒数：完整主键的配置优先；其次请求的 K 线周期；最后按最长前缀。
+        前缀规则为 0 的接口（实时类）不论周期都不缓存。
+        """
+        if api_key_combined in self.ttls:
+            return self.ttls[api_key_combined]
+        matches = [prefix for prefix in self.ttls if api_key_combined.startswith(prefix)]
+        ttl = self.ttls[max(matches, key=len)] if matches else self.default_ttl
+        if ttl and period is not None:
+            return period_seconds(period) or ttl
+        return ttl
+
+    def expires_at(self, api_key_combined, now=None, period=None):
+        """
+        计算新缓存条目的过期时间戳，不缓存时返回 None。
+        """
+        ttl = self.ttl_for(api_key_combined, period)
+        if not ttl:
+            return None
+        now = now or self.clock()
+        calendar = self.calendar or get_trading_calendar()
+        session_end = calendar.session_end(now)
+        if session_end is not None:
+            expiry = session_end if math.isinf(ttl) else min(now + timedelta(seconds=ttl), session_end)
+        else:
+            # 休市期间数据不再变化，下一次开盘时过期
+            expiry = calendar.next_open(now)
+        return expiry.timestamp()
+
+    @staticmethod
+    def make_key(url, params=None):
+        payload = json.dumps([url, params or {}], sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, api_key_combined, key):
+        return os.path.join(self.root, api_key_combined, f"{key}.json")
+
+    def get(self, api_key_combined, key):
+        """
+        读取缓存，未命中或已过期时返回 MISS。
+        """
+        now = self.clock().timestamp()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self.stats["hits"] += 1
+                    # 返回副本，避免调用方修改缓存中的数据
+                    return copy.deepcopy(entry[1])
+                del self._memory[key]
+        try:
+            with open(self._path(api_key_combined, key), "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            payload = None
+        with self._lock:
+            if payload is not None and payload["expires_at"] > now:
+                self.stats["hits"] += 1
+                self.stats["disk_hits"] += 1
+                self._remember(key, payload["expires_at"], copy.deepcopy(payload["data"]))
+                return payload["data"]
+            if payload is not None:
+                self.stats["expired"] += 1
+            self.stats["misses"] += 1
+        if payload is not None:
+            self._remove(self._path(api_key_combined, key))
+        return MISS
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            logging.warning(f"删除响应缓存文件失败: {path}, 错误: {e}")
+            return False
+
+    def _remember(self, key, expires_at, data):
+        if len(self._memory) >= self.max_memory_entries:
+            # 淘汰最早写入的条目
+            self._memory.pop(next(iter(self._memory)))
+        self._memory[key] = (expires_at, data)
+
+    def put(self, api_key_combined, key, data, period=None):
+        """
+        写入缓存；接口不缓存时直接返回 False。
+        :param period: str, 请求的 K 线周期（如 'dn'、'5m'），决定缓存时长
+        """
+        expires_at = self.expires_at(api_key_combined, period=period)
+        if expires_at is None:
+            return False
+        self._maybe_prune()
+        with self._lock:
+            self._remember(key, expires_at, copy.deepcopy(data))
+            self.stats["stores"] += 1
+        directory = os.path.join(self.root, api_key_combined)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"stored_at": time.time(), "expires_at": expires_at, "data": data}, f, ensure_ascii=False)
+            os.replace(temp_path, self._path(api_key_combined, key))
+        except OSError as e:
+            logging.warning(f"写入响应缓存失败: {e}")
+        return True
+
+    def _maybe_prune(self):
+        now = time.monotonic()
+        with self._lock:
+            if self._pruned_at is not None and now - self._pruned_at < self.prune_interval:
+                return
+            self._pruned_at = now
+        self.prune()
+
+    def _cache_files(self):
+        if not os.path.isdir(self.root):
+            return
+        for directory in os.scandir(self.root):
+            if directory.is_dir():
+                for entry in os.scandir(directory.path):
+                    if entry.name.endswith(".json") or entry.name.endswith(".tmp"):
+                        yield entry
+
+    def prune(self):
+        """
+        删除磁盘上已过期或无法解析的缓存文件。
+        :return: int, 删除的文件数
+        """
+        now = self.clock().timestamp()
+        removed = 0
+        for entry in self._cache_files():
+            try:
+                try:
+                    with open(entry.path, "r", encoding="utf-8") as f:
+                        expired = json.load(f)["expires_at"] <= now
+                except (ValueError, KeyError, TypeError):
+                    # 写入中断留下的临时文件或损坏的文件
+                    expired = time.time() - entry.stat().st_mtime > self.prune_interval
+            except OSError:
+                continue
+            if expired and self._remove(entry.path):
+                removed += 1
+        with self._lock:
+            self.stats["pruned"] += removed
+        if removed:
+            logging.info(f"已清理 {removed} 个过期的响应缓存文件: {self.root}")
+        return removed
+
+    def clear(self):
+        """
+        清空内存与磁盘缓存。
+        """
+        with self._lock:
+            self._memory.clear()
+        for entry in self._cache_files():
+            self._remove(entry.path)
+
+    def hit_rate(self):
+        total = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / total if total else 0.0
+
+
+_CACHE = {"config": None, "cache": None}
+_CACHE_LOCK = threading.Lock()
+
+
+def get_response_cache():
+    """
+    获取进程内共享的响应缓存，未启用时返回 None。
+    """
+    try:
+        cache_settings = get_settings_service().get_settings().get("response_cache", {})
+    except FileNotFoundError:
+        cache_settings = {}
+    config = dict(DEFAULT_RESPONSE_CACHE_CONFIG)
+    config.update(cache_settings)
+    if not config["enabled"]:
+        return None
+    with _CACHE_LOCK:
+        if _CACHE["cache"] is None or _CACHE["config"] != config:
+            _CACHE["config"] = json.loads(json.dumps(config))
+            _CACHE["cache"] = ResponseCache(
+                os.path.join(PROJECT_ROOT, config["path"]),
+                ttls=config["ttls"],
+                default_ttl=config["default_ttl"],
+                max_memory_entries=config["max_memory_entries"],
+                prune_interval=config["prune_interval"],
+            )
+        return _CACHE["cache"]
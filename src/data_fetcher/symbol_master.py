@@ -0,0 +1,245 @@
+import bisect
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from config.settings import PROJECT_ROOT, get_settings_service
+
+try:
+    from pypinyin import Style, lazy_pinyin
+except ImportError:  # 可选依赖：未安装时不支持拼音首字母检索
+    lazy_pinyin = None
+
+# 默认配置，可在 settings.json 的 "symbol_master" 节点中覆盖
+DEFAULT_SYMBOL_MASTER_CONFIG = {
+    "cache_path": "data/cache/stock_list.json",
+    "ttl_seconds": 86400,   # 股票列表缓存有效期（秒）
+    "retry_seconds": 300,   # 刷新失败后再次请求服务端的最小间隔（秒）
+}
+
+_CODE_PATTERN = re.compile(r"^(?:(sh|sz|bj))?(\d{6})(?:\.(sh|sz|bj))?$", re.IGNORECASE)
+
+
+def infer_exchange(code):
+    """
+    按代码首位推断交易所：6/9 为上海，0/2/3 为深圳，4/8 为北京。
+    """
+    return {"6": "sh", "9": "sh", "0": "sz", "2": "sz", "3": "sz", "4": "bj", "8": "bj"}.get(code[:1])
+
+
+def normalize_code(symbol):
+    """
+    规范化股票代码：'sh600519'、'600519.SH'、' 600519 ' 均返回 '600519'，无法识别时返回 None。
+    """
+    match = _CODE_PATTERN.match(str(symbol).strip().replace(" ", ""))
+    return match.group(2) if match else None
+
+
+def _pinyin_initials(name):
+    if lazy_pinyin is None:
+        return None
+    return "".join(lazy_pinyin(name, style=Style.FIRST_LETTER)).lower()
+
+
+class SymbolMaster:
+    """
+    A 股代码表：本地缓存 hslt/list 的结果并按有效期刷新，
+    按代码、带交易所前缀的代码、名称建立索引，支持名称/拼音首字母前缀检索。
+
+    :param cache_path: str, 缓存文件路径
+    :param ttl_seconds: float, 缓存有效期（秒）
+    :param loader: callable() -> list[dict], 获取股票列表，默认调用 fetch_stock_list
+    :param retry_seconds: float, 刷新失败后再次请求的最小间隔（秒），期间不再访问服务端
+    """
+    def __init__(self, cache_path, ttl_seconds=86400, loader=None, retry_seconds=300):
+        self.cache_path = cache_path
+        self.ttl_seconds = ttl_seconds
+        self.retry_seconds = retry_seconds
+        self.loader = loader or self._default_loader
+        self.fetched_at = 0.0
+        self._retry_at = 0.0
+        self._last_error = None
+        self._lock = threading.Lock()
+        self._by_code = {}
+        self._by_name = {}
+        self._codes = []
+        self._names = []
+        self._initials = []
+        self._substrings = {}
+
+    @staticmethod
+    def _default_loader():
+        from src.data_fetcher.fetch_data_by import fetch_stock_list
+
+        return fetch_stock_list()
+
+    def _read_cache(self):
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+            return payload.get("fetched_at", 0.0), payload.get("items", [])
+        except (FileNotFoundError, json.JSONDecodeError):
+            return 0.0, None
+
+    def _write_cache(self, fetched_at, items):
+        directory = os.path.dirname(self.cache_path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"fetched_at": fetched_at, "items": items}, f, ensure_ascii=False)
+        os.replace(temp_path, self.cache_path)
+
+    def _build_index(self, items):
+        by_code, by_name = {}, {}
+        for item in items:
+            code = normalize_code(item.get("dm", ""))
+            if code is None:
+                continue
+            exchange = (item.get("jys") or infer_exchange(code) or "").lower()
+            record = {"code": code, "name": item.get("mc", ""), "exchange": exchange}
+            by_code[code] = record
+            if record["name"]:
+                by_name[record["name"]] = record
+        self._by_code = by_code
+        self._by_name = by_name
+        self._codes = sorted(by_code)
+        self._names = sorted(by_name)
+        # 名称的所有子串 -> 包含该子串的名称（按名称排序），用于包含匹配
+        substrings = {}
+        for name in self._names:
+            for start in range(len(name)):
+                for stop in range(start + 1, len(name) + 1):
+                    names = substrings.setdefault(name[start:stop], [])
+                    if not names or names[-1] != name:
+                        names.append(name)
+        self._substrings = substrings
+        initials = []
+        for name, record in by_name.items():
+            value = _pinyin_initials(name)
+            if value:
+                initials.append((value, record["code"]))
+        self._initials = sorted(initials)
+
+    def refresh(self, force=False):
+        """
+        缓存过期（或 force 为 True）时重新获取股票列表；获取失败时继续使用旧缓存，
+        retry_seconds 内不再请求服务端（没有任何缓存时直接抛出上一次的错误）。
+        """
+        with self._lock:
+            now = time.time()
+            if not force and now < self._retry_at:
+                if self._by_code:
+                    return
+                raise self._last_error
+            if not force and self._by_code and now - self.fetched_at < self.ttl_seconds:
+                return
+            fetched_at, items = self._read_cache()
+            if force or items is None or now - fetched_at >= self.ttl_seconds:
+                try:
+                    items = self.loader()
+                    fetched_at = now
+                    self._write_cache(fetched_at, items)
+                except Exception as e:
+                    self._retry_at = now + self.retry_seconds
+                    self._last_error = e
+                    if items is None:
+                        raise
+                    logging.warning(f"刷新股票列表失败，使用本地缓存，{self.retry_seconds} 秒后重试: {e}")
+            self.fetched_at = fetched_at
+            self._build_index(items)
+
+    def lookup(self, text):
+        """
+        按代码（可带交易所前缀/后缀）或完整名称精确查找。
+        :return: dict or None, {"code", "name", "exchange"}
+        """
+        self.refresh()
+        text = str(text).strip()
+        code = normalize_code(text)
+        if code is not None:
+            return self._by_code.get(code)
+        return self._by_name.get(text.replace(" ", ""))
+
+    def is_valid(self, text):
+        return self.lookup(text) is not None
+
+    def prefixed_code(self, text):
+        """
+        返回带交易所前缀的代码，如 'sh600519'，未找到时返回 None。
+        """
+        record = self.lookup(text)
+        return f"{record['exchange']}{record['code']}" if record else None
+
+    def search(self, query, limit=10):
+        """
+        模糊检索：代码前缀、名称前缀、拼音首字母前缀，最后按名称包含匹配补充。
+        :return: list[dict]
+        """
+        self.refresh()
+        query = str(query).strip().replace(" ", "")
+        if not query:
+            return []
+        results = {}
+
+        def add(record):
+            results.setdefault(record["code"], record)
+            return len(results) >= limit
+
+        digits = re.sub(r"^(sh|sz|bj)", "", query.lower())
+        if digits.isdigit():
+            for index in range(bisect.bisect_left(self._codes, digits), len(self._codes)):
+                code = self._codes[index]
+                if not code.startswith(digits) or add(self._by_code[code]):
+                    break
+            return list(results.values())
+
+        for index in range(bisect.bisect_left(self._names, query), len(self._names)):
+            name = self._names[index]
+            if not name.startswith(query) or add(self._by_name[name]):
+                break
+        lowered = query.lower()
+        if len(results) < limit and lowered.isascii():
+            for index in range(bisect.bisect_left(self._initials, (lowered,)), len(self._initials)):
+                initials, code = self._initials[index]
+                if not initials.startswith(lowered) or add(self._by_code[code]):
+                    break
+        if len(results) < limit:
+            for name in self._substrings.get(query, ()):
+                if add(self._by_name[name]):
+                    break
+        return list(results.values())
+
+
+_MASTER = {"instance": None}
+_MASTER_LOCK = threading.Lock()
+
+
+def get_symbol_master():
+    """
+    获取进程内共享的股票代码表。
+    """
+    with _MASTER_LOCK:
+        if _MASTER["instance"] is None:
+            try:
+                master_settings = get_settings_service().get_settings().get("symbol_master", {})
+            except FileNotFoundError:
+                master_settings = {}
+            config = dict(DEFAULT_SYMBOL_MASTER_CONFIG)
+            config.update(master_settings)
+            _MASTER["instance"] = SymbolMaster(
+                os.path.join(PROJECT_ROOT, config["cache_path"]),
+                ttl_seconds=config["ttl_seconds"],
+                retry_seconds=config["retry_seconds"],
+            )
+        return _MASTER["instance"]
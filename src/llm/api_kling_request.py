@@ -1,11 +1,20 @@
-import http.client
 import json
 import os
 import logging
+import sys
 import time
 from urllib.parse import urlparse
 from urllib.request import urlretrieve
 
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from config.settings import get_settings
+from src.utils import http_client
+
 # 配置日志
 logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
 
@@ -14,9 +23,7 @@ TASKS_FILE = "output/tasks.json"
 
 # 加载配置
 def load_config():
-    config_path = os.path.join(os.path.dirname(__file__), "../../config/settings.json")
-    with open(config_path, "r") as f:
-        return json.load(f)
+    return get_settings()
 
 # 加载任务 JSON 文件
 def load_tasks():
@@ -52,11 +59,8 @@ def send_post_request(endpoint, payload, headers):
     config = load_config()
     base_url = config["api_config"]["api_url"].rstrip("/")  # 确保无尾随 "/"
 
-    conn = http.client.HTTPSConnection(base_url.replace("https://", ""))
     logging.info(f"[DEBUG] Sending POST request to: {endpoint}")
-    conn.request("POST", endpoint, json.dumps(payload), headers)
-
-    response = conn.getresponse()
+    response = http_client.post(f"{base_url}{endpoint}", data=json.dumps(payload), headers=headers)
     return decode_response(response)
 
 # 发送 GET 请求
@@ -70,18 +74,14 @@ def send_get_request(endpoint):
         "Content-Type": "application/json"
     }
 
-    conn = http.client.HTTPSConnection(base_url.replace("https://", ""))
     logging.info(f"[DEBUG] Sending GET request to: {endpoint}")
-    conn.request("GET", endpoint, headers=headers)
-    response = conn.getresponse()
+    response = http_client.get(f"{base_url}{endpoint}", headers=headers)
     return decode_response(response)
 
 # 解码响应
 def decode_response(response):
-    raw_data = response.read()
-    if response.headers.get("Content-Encoding") == "gzip":
-        import gzip
-        raw_data = gzip.decompress(raw_data)
+    # requests 已按 Content-Encoding 自动解压 gzip
+    raw_data = response.content
     try:
         return json.loads(raw_data.decode("utf-8"))
     except Exception as e:
@@ -2,12 +2,21 @@ import asyncio
 import websockets
 import json
 import os
+import sys
 import base64
 from pydub import AudioSegment
 import io
 import logging
 from datetime import datetime
 
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from config.settings import get_settings
+
 # 设置日志记录
 logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
 
@@ -21,11 +30,7 @@ def load_config():
     Returns:
         dict: 配置文件内容。
     """
-    config_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../config/settings.json"))
-    if not os.path.exists(config_path):
-        raise FileNotFoundError(f"配置文件未找到: {config_path}")
-    with open(config_path, "r") as f:
-        return json.load(f)
+    return get_settings()
 
 
 def convert_https_to_wss(url):
@@ -1,6 +1,5 @@
 import requests
 import os
-import json
 import sys
 
 # 添加项目根目录到 sys.path
@@ -9,16 +8,15 @@ if __name__ == "__main__" and "src" not in sys.path:
     if project_root not in sys.path:
         sys.path.insert(0, project_root)
 
+from config.settings import get_settings
+from src.utils import http_client
+
 # 使用相对路径加载配置文件
 def load_config():
     """
     加载配置文件
     """
-    config_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../config/settings.json"))
-    if not os.path.exists(config_path):
-        raise FileNotFoundError(f"配置文件未找到: {config_path}")
-    with open(config_path, "r") as f:
-        return json.load(f)
+    return get_settings()
 
 CONFIG = load_config()
 
@@ -57,7 +55,7 @@ def submit_request_to_api(model_name, prompt_text, image_url, settings):
 
     try:
         # print(f"向大模型发送请求: {data}")
-        response = requests.post(f"{api_url}/v1/chat/completions", headers=headers, json=data)
+        response = http_client.post(f"{api_url}/v1/chat/completions", headers=headers, json=data)
         response.raise_for_status()
         result = response.json()
         print(f"大模型返回的原始结果: {result}")
@@ -1,7 +1,6 @@
 import os
 import sys
 import json
-import http.client
 from base64 import b64decode
 
 # 添加项目根目录到 sys.path
@@ -10,6 +9,9 @@ if __name__ == "__main__" and "src" not in sys.path:
     if project_root not in sys.path:
         sys.path.insert(0, project_root)
 
+from config.settings import get_settings
+from src.utils import http_client
+
 
 # 加载配置
 def load_config():
@@ -18,11 +20,7 @@ def load_config():
     Returns:
         dict: 配置文件内容。
     """
-    config_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../config/settings.json"))
-    if not os.path.exists(config_path):
-        raise FileNotFoundError(f"配置文件未找到: {config_path}")
-    with open(config_path, "r") as f:
-        return json.load(f)
+    return get_settings()
 
 
 # 语音生成函数
@@ -47,7 +45,7 @@ def generate_speech(text, model="tts-1-hd", voice="onyx", response_format="mp3",
     if not api_url.startswith("https://"):
         raise ValueError("API URL 必须以 https:// 开头")
     host = api_url.replace("https://", "").split("/")[0]
-    endpoint = "/v1/audio/speech"
+    endpoint = f"https://{host}/v1/audio/speech"
 
     # 请求体
     payload = json.dumps({
@@ -66,15 +64,13 @@ def generate_speech(text, model="tts-1-hd", voice="onyx", response_format="mp3",
 
     # 发送请求
     try:
-        conn = http.client.HTTPSConnection(host)
-        conn.request("POST", endpoint, payload, headers)
-        res = conn.getresponse()
+        res = http_client.post(endpoint, data=payload, headers=headers)
 
-        if res.status != 200:
-            raise Exception(f"API 请求失败，状态码: {res.status}, 原因: {res.reason}")
+        if res.status_code != 200:
+            raise Exception(f"API 请求失败，状态码: {res.status_code}, 原因: {res.reason}")
 
         # 读取返回的音频数据
-        audio_data = res.read()
+        audio_data = res.content
         output_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../output", output_file))
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         with open(output_path, "wb") as f:
@@ -82,8 +78,6 @@ def generate_speech(text, model="tts-1-hd", voice="onyx", response_format="mp3",
         print(f"语音已保存到 {output_path}")
     except Exception as e:
         print(f"请求失败: {e}")
-    finally:
-        conn.close()
 
 
 if __name__ == "__main__":
@@ -1,8 +1,10 @@
+import copy
 import json
 import os
-import datetime
 import re
+import signal
 import sys
+import threading
 
 from utils.path_manager import add_project_root_to_path
 
@@ -10,35 +12,36 @@ from utils.path_manager import add_project_root_to_path
 add_project_root_to_path()
 
 from pynput import keyboard
+from config.settings import get_settings, get_settings_service
 from src.screenshot.screen_capture import capture_fullscreen
 from src.upload_images.upload_images import upload_image_to_github
 from src.llm.api_request import submit_request_to_api, extract_stock_info_from_model
 from src.ocr.ocr_processor import extract_text_from_image, extract_stock_info
 from src.data_fetcher.fetch_data_by import fetch_historical_data, save_data_to_file
+from src.workflow import WorkflowExecutor, JobQueue
+from src.utils.trading_calendar import get_trading_calendar
 # 加载配置文件
-def load_settings(config_path="config/settings.json"):
+def load_settings(config_path=None):
     try:
-        with open(config_path, "r") as f:
-            print(f"成功加载配置文件: {config_path}")
-            settings = json.load(f)
-
-            # 设置默认值
-            settings.setdefault("prompts", {})
-            settings["prompts"].setdefault("system_role", "你是一个股票分析师具备非常强的股票交易能力，可以看懂图片，识别股票信息和预判股票走势。")
-            settings["prompts"].setdefault("image_recognition", "从图片中识别出，股票代码，股票名称，股票k线种类（如几日k线，分时线，60分钟线等），并帮我分析图中股票的相关信息做出预测：")
-            return settings
-    except FileNotFoundError:
-        print(f"配置文件 {config_path} 未找到，请确保配置文件存在")
+        # 读取进程级缓存的配置，复制一份以免默认值写回共享缓存
+        settings = copy.deepcopy(get_settings(config_path))
+        print(f"成功加载配置文件: {get_settings_service(config_path).config_path}")
+
+        # 设置默认值
+        settings.setdefault("prompts", {})
+        settings["prompts"].setdefault("system_role", "你是一个股票分析师具备非常强的股票交易能力，可以看懂图片，识别股票信息和预判股票走势。")
+        settings["prompts"].setdefault("image_recognition", "从图片中识别出，股票代码，股票名称，股票k线种类（如几日k线，分时线，60分钟线等），并帮我分析图中股票的相关信息做出预测：")
+        return settings
+    except FileNotFoundError as e:
+        print(f"{e}，请确保配置文件存在")
         raise
     except json.JSONDecodeError as e:
-        print(f"配置文件 {config_path} 格式错误: {e}")
+        print(f"配置文件格式错误: {e}")
         raise
 
-# 动态生成默认时间范围
-def get_default_date_range():
-    end_date = datetime.datetime.now().strftime("%Y-%m-%d")
-    start_date = (datetime.datetime.now() - datetime.timedelta(days=10)).strftime("%Y-%m-%d")
-    return start_date, end_date
+# 动态生成默认时间范围：最近 N 个交易日（跳过周末与节假日）
+def get_default_date_range(trading_days=10):
+    return get_trading_calendar().recent_range(trading_days)
 
 # Step 1: 截图
 def take_screenshot(settings):
@@ -97,13 +100,51 @@ def perform_ocr(screenshot_path, settings):
 # Step 5: 分析结果并获取股票历史数据
 import re
 
-def analyze_data(model_result, ocr_text, settings):
+def fetch_history(stock_code, settings):
+    """
+    获取默认时间范围内的股票历史数据并保存到文件。
+    Args:
+        stock_code (str): 6 位股票代码。
+        settings (dict): 配置字典。
+    Returns:
+        list: 历史数据列表。
+    """
+    start_date, end_date = get_default_date_range()
+    print(f"尝试获取历史数据，时间范围：{start_date} 至 {end_date}")
+    historical_data = fetch_historical_data(stock_code, start_date=start_date, end_date=end_date)
+    if historical_data:
+        print(f"获取到 {len(historical_data)} 条历史记录。")
+        save_data_to_file(historical_data, settings.get("output_file"))
+        print(f"历史数据已保存到文件：{settings.get('output_file')}")
+    else:
+        print(f"未获取到历史数据，股票代码：{stock_code}")
+    return historical_data
+
+def prefetch_history(ocr_result, settings):
+    """
+    根据 OCR 识别出的股票代码提前获取历史数据，与大模型调用并行执行。
+    Args:
+        ocr_result (tuple): perform_ocr 的返回值 (text, stock_info)，OCR 失败时为 None。
+        settings (dict): 配置字典。
+    Returns:
+        tuple: (股票代码, 历史数据)，未识别出代码时返回 None。
+    """
+    stock_info = ocr_result[1] if ocr_result else None
+    code_match = re.search(r"\d{6}", (stock_info or {}).get("code") or "")
+    if not code_match:
+        print("OCR 未识别出股票代码，等待大模型结果后再获取历史数据。")
+        return None
+    stock_code = code_match.group()
+    return stock_code, fetch_history(stock_code, settings)
+
+def analyze_data(model_result, ocr_text, settings, prefetched_history=None):
     """
     综合分析大模型返回内容和OCR提取的股票信息。
     Args:
         model_result (dict): 大模型返回的原始结果。
         ocr_text (str): OCR 提取的文本内容。
         settings (dict): 配置字典。
+        prefetched_history (tuple): prefetch_history 预取的 (股票代码, 历史数据)，代码一致时直接复用。
     """
     print("\n=== 综合分析结果 ===")
     print(f"大模型返回的原始结果：\n{model_result}")
@@ -128,18 +169,18 @@ def analyze_data(model_result, ocr_text, settings):
         print(f"解析大模型返回内容时出错：{e}")
         stock_code, stock_name, kline_type = None, None, None
 
+    # 大模型未识别出代码时，退回使用 OCR 预取的结果
+    if not stock_code and prefetched_history:
+        stock_code = prefetched_history[0]
+        print(f"使用 OCR 识别的股票代码：{stock_code}")
+
     # 获取历史数据
     if stock_code:
-        start_date, end_date = get_default_date_range()
-        print(f"尝试获取历史数据，时间范围：{start_date} 至 {end_date}")
+        if prefetched_history and prefetched_history[0] == stock_code:
+            print(f"复用已预取的历史数据，股票代码：{stock_code}")
+            return
         try:
-            historical_data = fetch_historical_data(stock_code, start_date=start_date, end_date=end_date)
-            if historical_data:
-                print(f"获取到 {len(historical_data)} 条历史记录。")
-                save_data_to_file(historical_data, settings.get("output_file"))
-                print(f"历史数据已保存到文件：{settings.get('output_file')}")
-            else:
-                print(f"未获取到历史数据，股票代码：{stock_code}")
+            fetch_history(stock_code, settings)
         except Exception as e:
             print(f"获取历史数据失败: {e}")
     else:
@@ -148,27 +189,50 @@ def analyze_data(model_result, ocr_text, settings):
 
 # 主流程：整合各个步骤
 def process_workflow(settings):
+    """
+    按依赖关系并发执行操作流：
+    截图 -> (上传 -> 大模型) / (OCR -> 预取历史数据) -> 综合分析。
+    Returns:
+        WorkflowResult: 各阶段结果与耗时。
+    """
     print("触发操作流...")
-    try:
-        # Step 1: 截图
-        screenshot_path = take_screenshot(settings)
-
-        # Step 2: 上传截图
-        image_url = upload_to_github(screenshot_path, settings)
+    max_workers = settings.get("workflow", {}).get("max_workers", 4)
+    executor = WorkflowExecutor(max_workers=max_workers)
 
-        # Step 3: 调用大模型
-        model_result = call_ai_api(image_url, settings)
-
-        # Step 4: 本地 OCR 识别
-        ocr_text, stock_info = perform_ocr(screenshot_path, settings)
+    # Step 1: 截图
+    executor.add_stage("screenshot", lambda deps: take_screenshot(settings))
+    # Step 2: 上传截图
+    executor.add_stage("upload", lambda deps: upload_to_github(deps["screenshot"], settings), ["screenshot"])
+    # Step 3: 本地 OCR 识别（只依赖截图，与上传、大模型并行）
+    executor.add_stage("ocr", lambda deps: perform_ocr(deps["screenshot"], settings), ["screenshot"], optional=True)
+    # Step 4: 调用大模型
+    executor.add_stage("model", lambda deps: call_ai_api(deps["upload"], settings), ["upload"])
+    # Step 5: OCR 得到代码后立即预取历史数据
+    executor.add_stage("history", lambda deps: prefetch_history(deps["ocr"], settings), ["ocr"], optional=True)
+    # Step 6: 综合分析结果
+    executor.add_stage(
+        "analyze",
+        lambda deps: analyze_data(deps["model"], deps["ocr"][0] if deps["ocr"] else None, settings, deps["history"]),
+        ["model", "ocr", "history"],
+    )
 
-        # Step 5: 综合分析结果并获取股票历史数据
-        analyze_data(model_result, ocr_text, settings)
-    except Exception as e:
-        print(f"操作流中发生错误: {e}")
+    result = executor.run()
+    for name, error in result.errors.items():
+        print(f"操作流中发生错误 ({name}): {error}")
+    print(result.format_timings())
+    return result
 
 # 绑定快捷键
-def bind_shortcut(shortcut, action):
+def bind_shortcut(shortcut, action, stop_event=None):
+    """
+    绑定全局快捷键，返回 pynput 监听器。
+    Args:
+        shortcut (str): 快捷键组合（如 'ctrl+shift+i'）。
+        action (callable): 快捷键触发时执行的操作，在监听线程中调用，应尽快返回（如 JobQueue.submit）。
+        stop_event (threading.Event): 退出事件，置位后不再触发新的操作流并停止监听。
+    Returns:
+        keyboard.Listener: 已启动的监听器。
+    """
     def parse_key(key_string):
         keys = key_string.lower().split("+")
         parsed_keys = []
@@ -185,6 +249,12 @@ def bind_shortcut(shortcut, action):
     current_keys = set()
 
     def on_press(key):
+        # 正在退出时返回 False，结束监听线程
+        if stop_event is not None and stop_event.is_set():
+            return False
+        # 按住按键时系统会重复发送按下事件，只在组合键刚凑齐时触发一次
+        if key in current_keys:
+            return
         current_keys.add(key)
         if all(k in current_keys for k in shortcut_keys):
             action()
@@ -197,6 +267,57 @@ def bind_shortcut(shortcut, action):
     listener.start()
     return listener
 
+# 注册退出信号
+def install_signal_handlers(stop_event):
+    """
+    将 SIGINT / SIGTERM 转换为退出事件，由主线程统一完成清理。
+    """
+    def handle_signal(signum, frame):
+        print(f"\n收到退出信号 ({signum})，等待进行中的操作流结束...")
+        stop_event.set()
+
+    for sig_name in ("SIGINT", "SIGTERM"):
+        sig = getattr(signal, sig_name, None)
+        if sig is None:
+            continue
+        try:
+            signal.signal(sig, handle_signal)
+        except ValueError:
+            # 只能在主线程注册信号处理函数
+            pass
+
+# 阻塞等待退出，并清理监听器
+def run_until_shutdown(listener, settings, stop_event=None, job_queue=None):
+    """
+    阻塞主线程直到收到退出信号或监听器结束，随后等待进行中的操作流完成。
+    Args:
+        listener (keyboard.Listener): bind_shortcut 返回的监听器。
+        settings (dict): 配置字典，读取 runtime.poll_interval / runtime.shutdown_timeout。
+        stop_event (threading.Event): 退出事件，默认新建。
+        job_queue (JobQueue): 执行操作流的任务队列，退出时等待其中的任务结束。
+    """
+    runtime_config = settings.get("runtime", {})
+    poll_interval = runtime_config.get("poll_interval", 1.0)
+    shutdown_timeout = runtime_config.get("shutdown_timeout", 30)
+
+    if stop_event is None:
+        stop_event = threading.Event()
+    install_signal_handlers(stop_event)
+
+    try:
+        # Event.wait 阻塞在锁上不占用 CPU，超时只用于检查监听线程是否仍然存活
+        while listener.is_alive() and not stop_event.wait(poll_interval):
+            pass
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_event.set()
+        listener.stop()
+        listener.join(shutdown_timeout)
+        # 丢弃排队中的操作流，等待执行中的操作流结束
+        if job_queue is not None and not job_queue.shutdown(shutdown_timeout):
+            print(f"操作流在 {shutdown_timeout} 秒内未结束，强制退出")
+
 # 主程序入口
 def main():
     print("StockAI 启动...")
@@ -208,16 +329,24 @@ def main():
     screenshot_shortcut = settings.get("shortcuts", {}).get("screenshot", "ctrl+shift+i")
     print(f"绑定截图快捷键为: {screenshot_shortcut}")
 
+    # 操作流在任务队列的工作线程中执行，快捷键回调只负责投递
+    workflow_config = settings.get("workflow", {})
+    job_queue = JobQueue(
+        lambda: process_workflow(settings),
+        max_concurrency=workflow_config.get("max_concurrency", 1),
+        queue_size=workflow_config.get("queue_size", 1),
+        debounce_seconds=workflow_config.get("debounce_seconds", 1.0),
+        name="workflow",
+    )
+
     # 绑定快捷键，触发操作流
-    bind_shortcut(screenshot_shortcut, lambda: process_workflow(settings))
+    stop_event = threading.Event()
+    listener = bind_shortcut(screenshot_shortcut, job_queue.submit, stop_event)
 
-    # 防止主线程退出
+    # 阻塞主线程直到退出
     print("按下 Ctrl+C 退出程序")
-    try:
-        while True:
-            pass
-    except KeyboardInterrupt:
-        print("\n程序退出")
+    run_until_shutdown(listener, settings, stop_event, job_queue)
+    print("\n程序退出")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,230 @@
+import os
+import sys
+import threading
+from datetime import date, datetime
+
+import numpy as np
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from src.storage.bar_store import BarStore, get_bar_store
+
+# 存储列名到常用字段名的映射，便于直接交给 StockAnalyzer 等按长字段名取值的代码
+LONG_NAMES = {"t": "date", "o": "open", "h": "high", "l": "low", "c": "close", "v": "volume", "e": "amount"}
+
+
+def to_seconds(value, end=False):
+    """
+    将日期转为 Unix 秒。只有日期部分的截止日期按当天最后一秒处理。
+    Args:
+        value (str|date|datetime|int): 日期。
+        end (bool): 是否为区间截止日期。
+    Returns:
+        int: Unix 秒。
+    """
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    date_only = isinstance(value, date) and not isinstance(value, datetime)
+    if isinstance(value, str):
+        date_only = len(value.strip()) == 10
+    seconds = int(np.datetime64(value, "s").astype("<i8"))
+    return seconds + 86399 if end and date_only else seconds
+
+
+class BarView:
+    """
+    单只股票 K 线的只读列视图。各列为内存映射数组的切片，不复制数据。
+    """
+    def __init__(self, symbol, columns):
+        self.symbol = symbol
+        self.columns = columns
+
+    def __len__(self):
+        return len(self.columns["t"]) if "t" in self.columns else 0
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    def __contains__(self, column):
+        return column in self.columns
+
+    def slice(self, start=None, end=None):
+        """
+        按日期区间（含两端）切片，对时间列二分查找。
+        Args:
+            start: 开始日期，None 表示不限。
+            end: 截止日期，None 表示不限。
+        Returns:
+            BarView: 新的视图（仍不复制数据）。
+        """
+        times = self.columns["t"]
+        left = 0 if start is None else int(np.searchsorted(times, to_seconds(start), side="left"))
+        right = len(times) if end is None else int(np.searchsorted(times, to_seconds(end, end=True), side="right"))
+        return BarView(self.symbol, {column: values[left:right] for column, values in self.columns.items()})
+
+    def tail(self, count):
+        """
+        最近 count 根 K 线。
+        """
+        return BarView(self.symbol, {column: values[-count:] for column, values in self.columns.items()})
+
+    def to_columns(self, long_names=False):
+        """
+        返回 {列名: 数组} 字典，long_names 为 True 时使用 open/close 等字段名。
+        """
+        if not long_names:
+            return dict(self.columns)
+        return {LONG_NAMES.get(column, column): values for column, values in self.columns.items()}
+
+    def to_frame(self):
+        """
+        转换为 DataFrame（会复制数据）。
+        """
+        import pandas as pd
+
+        frame = pd.DataFrame({column: np.asarray(values) for column, values in self.columns.items()})
+        if "t" in frame:
+            frame["t"] = pd.to_datetime(frame["t"], unit="s")
+        return frame
+
+
+class BarReader:
+    """
+    K 线内存映射读取器。同一股票的映射按行数缓存，数据追加后自动重新映射。
+    """
+    def __init__(self, store=None):
+        """
+        Args:
+            store (BarStore|str): K 线存储或其根目录，默认使用共享的 daily 存储。
+        """
+        if store is None:
+            store = get_bar_store()
+        elif isinstance(store, str):
+            store = BarStore(store)
+        self.store = store
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def open(self, symbol, columns=None):
+        """
+        打开股票 K 线，返回零拷贝视图。
+        Args:
+            symbol (str): 股票代码。
+            columns (list): 需要的列，默认全部。
+        Returns:
+            BarView: 视图。
+        """
+        length = self.store.length(symbol)
+        with self._lock:
+            cached = self._cache.get(symbol)
+            if cached is None or cached[0] != length:
+                cached = (length, self.store.read(symbol, mmap=True))
+                self._cache[symbol] = cached
+        mapped = cached[1]
+        selected = list(mapped) if columns is None else columns
+        missing = [column for column in selected if column not in mapped]
+        if missing:
+            raise KeyError(f"K 线数据不包含列: {missing}")
+        return BarView(symbol, {column: mapped[column] for column in selected})
+
+    def read_range(self, symbol, start=None, end=None, columns=None):
+        """
+        读取日期区间内的 K 线视图。
+        """
+        if columns is not None and "t" not in columns:
+            columns = ["t"] + list(columns)
+        return self.open(symbol, columns).slice(start, end)
+
+    def scan(self, symbols=None, start=None, end=None, columns=None):
+        """
+        逐只股票遍历 K 线视图，不会把全部历史同时读入内存。
+        Args:
+            symbols (list): 股票代码列表，默认存储中的全部股票。
+            start, end: 日期区间。
+            columns (list): 需要的列。
+        Yields:
+            (str, BarView): 股票代码与视图。
+        """
+        if columns is not None and "t" not in columns:
+            columns = ["t"] + list(columns)
+        for symbol in symbols if symbols is not None else self.store.symbols():
+            # 不经过缓存，视图释放后映射随之释放
+            try:
+                mapped = self.store.read(symbol, columns, mmap=True)
+            except KeyError:
+                continue
+            yield symbol, BarView(symbol, mapped).slice(start, end)
+
+    def read_matrix(self, symbols=None, length=250, end=None, columns=("o", "h", "l", "c", "v", "e")):
+        """
+        读取多只股票截至 end 的最近 length 根 K 线，组成 (股票数, length) 矩阵。
+        每行靠右对齐（最后一列为各自的最新 K 线），历史不足的行前面补 NaN，
+        可直接传给 StockAnalyzer.analyze_batch。
+        Args:
+            symbols (list): 股票代码列表，默认存储中的全部股票。
+            length (int): 每只股票取的 K 线根数。
+            end: 截止日期，None 表示最新。
+            columns (tuple): 需要的列，缺少该列的股票整行为 NaN。
+        Returns:
+            (list, dict, np.ndarray): 股票代码、{列名: 二维数组}、每行有效 K 线数。
+        """
+        columns = [column for column in columns if column != "t"]
+        symbols = list(self.store.symbols() if symbols is None else symbols)
+        matrix = {column: np.full((len(symbols), length), np.nan) for column in columns}
+        counts = np.zeros(len(symbols), dtype=np.int64)
+        names = []
+        for symbol in symbols:
+            meta = self.store.read_meta(symbol)
+            if meta is None:
+                continue
+            available = [column for column in columns if column in meta["schema"]]
+            # 逐只复制最近 length 根到矩阵后即释放映射，同一时刻只打开一只股票的列文件
+            view = BarView(symbol, self.store.read(symbol, ["t"] + available, mmap=True)).slice(None, end).tail(length)
+            row, size = len(names), len(view)
+            names.append(symbol)
+            counts[row] = size
+            if size:
+                for column in available:
+                    matrix[column][row, length - size:] = view[column]
+            del view
+        if len(names) < len(symbols):
+            matrix = {column: values[:len(names)].copy() for column, values in matrix.items()}
+            counts = counts[:len(names)]
+        return names, matrix, counts
+
+    def read_panel(self, symbols=None, start=None, end=None, columns=("c",)):
+        """
+        读取日期区间内多只股票的 K 线，按日期对齐为 (股票数, 交易日数) 矩阵。
+        交易日为所有股票日期的并集，某只股票当天没有数据（未上市、停牌）时为 NaN。
+        Args:
+            symbols (list): 股票代码列表，默认存储中的全部股票。
+            start, end: 日期区间。
+            columns (tuple): 需要的列。
+        Returns:
+            (list, np.ndarray, dict): 股票代码、日期（Unix 秒）、{列名: 二维数组}。
+        """
+        columns = [column for column in columns if column != "t"]
+        names, rows = [], []
+        for symbol, view in self.scan(symbols, start, end, columns):
+            # 复制区间内的数据后释放映射，避免股票数多时耗尽文件描述符
+            names.append(symbol)
+            rows.append({column: np.array(view[column], copy=True) for column in ["t"] + columns})
+            del view
+        dates = np.unique(np.concatenate([row["t"] for row in rows])) if rows else np.empty(0, dtype=np.int64)
+        panel = {column: np.full((len(rows), len(dates)), np.nan) for column in columns}
+        for index, row in enumerate(rows):
+            positions = np.searchsorted(dates, row["t"])
+            for column in columns:
+                panel[column][index, positions] = row[column]
+        return names, dates, panel
+
+    def close(self):
+        """
+        释放缓存的映射。
+        """
+        with self._lock:
+            self._cache.clear()
@@ -0,0 +1,287 @@
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+
+import numpy as np
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from config.settings import PROJECT_ROOT, get_settings_service
+
+DEFAULT_BAR_STORE_PATH = "data/bars"
+
+# K 线周期对应的数据集名称，未列出的周期以周期本身命名（如 '5m'）
+BAR_DATASETS = {"dn": "daily"}
+
+# K 线列式存储的默认结构：时间为 Unix 秒（int64），其余为 float64，固定小端序
+DEFAULT_BAR_SCHEMA = {
+    "t": "<i8",   # 时间
+    "o": "<f8",   # 开盘价
+    "h": "<f8",   # 最高价
+    "l": "<f8",   # 最低价
+    "c": "<f8",   # 收盘价
+    "v": "<f8",   # 成交量
+    "e": "<f8",   # 成交额
+}
+
+# 不同数据源的字段名映射到存储列名
+FIELD_ALIASES = {
+    "d": "t", "date": "t", "timestamp": "t",
+    "open": "o", "high": "h", "low": "l", "close": "c",
+    "volume": "v", "amount": "e",
+}
+
+
+def to_epoch_seconds(values):
+    """
+    将时间字符串（'2024-11-29' 或 '2024-11-29 15:00:00'）或 datetime64 转为 Unix 秒。
+    """
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.integer):
+        return values.astype("<i8")
+    return values.astype("datetime64[s]").astype("<i8")
+
+
+def normalize_bars(bars, schema):
+    """
+    将记录列表或列字典转换为按存储结构类型化的列字典，按时间排序并去重（后出现的覆盖先出现的）。
+    记录列表中缺少时间字段（或时间为 None）的记录无法定位，逐条剔除。
+    Args:
+        bars (list or dict): [{"t": ..., "o": ...}, ...] 或 {"t": [...], "o": [...]}。
+        schema (dict): 列名到 dtype 的映射。
+    Returns:
+        dict: {列名: np.ndarray}。
+    Raises:
+        ValueError: 列字典缺少时间列。
+    """
+    if isinstance(bars, dict):
+        source = {FIELD_ALIASES.get(key, key): value for key, value in bars.items()}
+    else:
+        rows = []
+        for bar in bars:
+            row = {FIELD_ALIASES.get(key, key): value for key, value in bar.items()}
+            if row.get("t") is not None:
+                rows.append(row)
+        if len(rows) < len(bars):
+            logging.warning(f"忽略 {len(bars) - len(rows)} 条缺少时间字段的 K 线")
+        source = {"t": [row["t"] for row in rows]}
+        for index, row in enumerate(rows):
+            for column, value in row.items():
+                if column == "t" or column not in schema:
+                    continue
+                if column not in source:
+                    source[column] = [np.nan] * len(rows)
+                source[column][index] = value
+    if "t" not in source:
+        raise ValueError("K 线数据缺少时间字段")
+
+    times = to_epoch_seconds(source["t"])
+    columns = {"t": times}
+    for column, dtype in schema.items():
+        if column == "t":
+            continue
+        values = source.get(column)
+        columns[column] = (
+            np.full(len(times), np.nan, dtype=dtype) if values is None else np.asarray(values, dtype=dtype)
+        )
+
+    # 稳定排序后保留每个时间戳最后一次出现的记录
+    order = np.argsort(times, kind="stable")
+    sorted_times = times[order]
+    keep = np.ones(len(order), dtype=bool)
+    keep[:-1] = sorted_times[1:] != sorted_times[:-1]
+    order = order[keep]
+    return {column: np.ascontiguousarray(values[order]) for column, values in columns.items()}
+
+
+class BarStore:
+    """
+    K 线列式存储。
+
+    每只股票一个目录，每列一个定长二进制文件（<列名>.col），
+    meta.json 记录列类型与行数。追加时只写入新增行，读取时直接内存映射，无需解析文本。
+    """
+    def __init__(self, root, schema=None):
+        """
+        Args:
+            root (str): 存储根目录。
+            schema (dict): 新建数据时使用的列结构，默认 DEFAULT_BAR_SCHEMA。
+        """
+        self.root = root
+        self.schema = dict(schema or DEFAULT_BAR_SCHEMA)
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    def _lock(self, symbol):
+        with self._locks_lock:
+            return self._locks.setdefault(symbol, threading.Lock())
+
+    def symbol_dir(self, symbol):
+        return os.path.join(self.root, symbol)
+
+    def _column_path(self, symbol, column):
+        return os.path.join(self.symbol_dir(symbol), f"{column}.col")
+
+    def _meta_path(self, symbol):
+        return os.path.join(self.symbol_dir(symbol), "meta.json")
+
+    def read_meta(self, symbol):
+        """
+        读取元数据。
+        Returns:
+            dict or None: {"symbol", "schema", "length"}，不存在时为 None。
+        """
+        try:
+            with open(self._meta_path(symbol), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _write_meta(self, symbol, meta):
+        directory = self.symbol_dir(symbol)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(temp_path, self._meta_path(symbol))
+
+    def symbols(self):
+        """
+        列出已存储的股票代码。
+        """
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name for name in os.listdir(self.root)
+            if os.path.exists(os.path.join(self.root, name, "meta.json"))
+        )
+
+    def length(self, symbol):
+        meta = self.read_meta(symbol)
+        return meta["length"] if meta else 0
+
+    def append(self, symbol, bars):
+        """
+        追加 K 线。早于已存储最后时间的记录被忽略，与最后一根时间相同的记录覆盖最后一根（当日 K 线会更新）。
+        Args:
+            symbol (str): 股票代码。
+            bars (list or dict): 记录列表或列字典。
+        Returns:
+            int: 写入（新增或覆盖）的行数。
+        """
+        with self._lock(symbol):
+            meta = self.read_meta(symbol)
+            schema = meta["schema"] if meta else self.schema
+            columns = normalize_bars(bars, schema)
+            length = meta["length"] if meta else 0
+            os.makedirs(self.symbol_dir(symbol), exist_ok=True)
+
+            start = length
+            if length:
+                last_time = int(np.fromfile(self._column_path(symbol, "t"), dtype=schema["t"], count=1,
+                                            offset=(length - 1) * np.dtype(schema["t"]).itemsize)[0])
+                times = columns["t"]
+                skipped = int(np.searchsorted(times, last_time, side="left"))
+                if skipped:
+                    logging.debug(f"{symbol}: 忽略 {skipped} 条早于已存储数据的 K 线")
+                columns = {column: values[skipped:] for column, values in columns.items()}
+                if len(columns["t"]) and columns["t"][0] == last_time:
+                    start = length - 1
+
+            rows = len(columns["t"])
+            if not rows:
+                return 0
+            # 先写数据再更新行数；中途失败时 meta 中的行数仍指向旧数据
+            for column, dtype in schema.items():
+                path = self._column_path(symbol, column)
+                with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+                    f.seek(start * np.dtype(dtype).itemsize)
+                    f.write(np.ascontiguousarray(columns[column], dtype=dtype).tobytes())
+                    f.truncate()
+            self._write_meta(symbol, {"symbol": symbol, "schema": schema, "length": start + rows})
+            return rows
+
+    def write(self, symbol, bars):
+        """
+        覆盖写入全部 K 线。
+        """
+        with self._lock(symbol):
+            meta = self.read_meta(symbol)
+            if meta:
+                meta["length"] = 0
+                self._write_meta(symbol, meta)
+        return self.append(symbol, bars)
+
+    def read(self, symbol, columns=None, mmap=True):
+        """
+        读取 K 线列。
+        Args:
+            symbol (str): 股票代码。
+            columns (list): 需要的列，默认全部。
+            mmap (bool): 为 True 时返回只读内存映射，否则读入内存。
+        Returns:
+            dict: {列名: np.ndarray}。
+        """
+        meta = self.read_meta(symbol)
+        if meta is None:
+            raise KeyError(f"未找到 {symbol} 的 K 线数据")
+        schema = meta["schema"]
+        length = meta["length"]
+        result = {}
+        for column in columns or list(schema):
+            if column not in schema:
+                raise KeyError(f"K 线数据不包含列: {column}")
+            dtype = np.dtype(schema[column])
+            if length == 0:
+                result[column] = np.empty(0, dtype=dtype)
+            elif mmap:
+                result[column] = np.memmap(self._column_path(symbol, column), dtype=dtype, mode="r", shape=(length,))
+            else:
+                result[column] = np.fromfile(self._column_path(symbol, column), dtype=dtype, count=length)
+        return result
+
+    def read_frame(self, symbol, columns=None):
+        """
+        以 DataFrame 形式读取 K 线，时间列转换为 datetime。
+        """
+        import pandas as pd
+
+        data = self.read(symbol, columns, mmap=False)
+        frame = pd.DataFrame(data)
+        if "t" in frame:
+            frame["t"] = pd.to_datetime(frame["t"], unit="s")
+        return frame
+
+
+_STORES = {}
+_STORES_LOCK = threading.Lock()
+
+
+def bar_dataset(time_frame):
+    """
+    K 线周期对应的数据集名称，不同周期的 K 线分目录存放。
+    """
+    return BAR_DATASETS.get(time_frame, time_frame)
+
+
+def get_bar_store(dataset="daily"):
+    """
+    获取进程内共享的 K 线存储，根目录读取自 settings.json 的 "bar_store.path"。
+    """
+    try:
+        path = get_settings_service().get_settings().get("bar_store", {}).get("path", DEFAULT_BAR_STORE_PATH)
+    except FileNotFoundError:
+        path = DEFAULT_BAR_STORE_PATH
+    root = os.path.join(PROJECT_ROOT, path, dataset)
+    with _STORES_LOCK:
+        store = _STORES.get(root)
+        if store is None:
+            store = BarStore(root)
+            _STORES[root] = store
+        return store
@@ -0,0 +1,210 @@
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from config.settings import PROJECT_ROOT, get_settings_service
+from src.utils.trading_calendar import get_trading_calendar
+
+# 默认存储配置，可在 settings.json 的 "history_store" 节点中覆盖
+DEFAULT_HISTORY_STORE_CONFIG = {
+    "path": "data/history",       # 存储目录（相对项目根目录）
+    "min_refresh_seconds": 300,   # 同一股票两次向服务端同步的最小间隔（秒）
+    "settle_seconds": 900,        # 收盘后多久的数据视为最终数据（服务端入库有延迟）
+}
+
+
+def _record_date(record, key="t"):
+    # 时间字段可能是 "2024-11-29" 或 "2024-11-29 15:00:00"，按日期部分比较
+    return str(record[key])[:10]
+
+
+class HistoryStore:
+    """
+    按股票存储的本地历史数据。
+
+    每只股票一个 JSON 文件，记录已存储的最后日期和最近一次同步时间。
+    同步时按时间字段去重合并（补回的早期数据同样入库，当天未收盘的数据会被更新），
+    日期区间查询直接从本地读取。
+    """
+    def __init__(self, root, dataset="hsmy_lscj", key="t", min_refresh_seconds=300,
+                 calendar=None, settle_seconds=900):
+        """
+        Args:
+            root (str): 存储根目录。
+            dataset (str): 数据集名称，不同接口的数据分目录存放。
+            key (str): 记录的时间字段名。
+            min_refresh_seconds (float): 两次同步的最小间隔（秒）。
+            calendar (TradingCalendar): 交易日历；提供时休市期间不重复同步，None 表示不区分交易时段。
+            settle_seconds (float): 收盘后多久的同步结果视为当天最终数据。
+        """
+        self.directory = os.path.join(root, dataset)
+        self.key = key
+        self.min_refresh_seconds = min_refresh_seconds
+        self.calendar = calendar
+        self.settle_seconds = settle_seconds
+        self._cache = {}
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    def _lock(self, symbol):
+        with self._locks_lock:
+            return self._locks.setdefault(symbol, threading.RLock())
+
+    def path(self, symbol):
+        return os.path.join(self.directory, f"{symbol}.json")
+
+    def _load(self, symbol):
+        path = self.path(symbol)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return {"symbol": symbol, "last_date": None, "synced_at": 0, "records": []}
+        cached = self._cache.get(symbol)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        self._cache[symbol] = (mtime, payload)
+        return payload
+
+    def _save(self, symbol, payload):
+        os.makedirs(self.directory, exist_ok=True)
+        # 先写临时文件再替换，避免中断时留下不完整的文件
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False)
+            os.replace(temp_path, self.path(symbol))
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self._cache[symbol] = (os.stat(self.path(symbol)).st_mtime_ns, payload)
+
+    def last_date(self, symbol):
+        """
+        获取已存储的最后日期。
+        Returns:
+            str or None: 'YYYY-MM-DD'，未存储时为 None。
+        """
+        with self._lock(symbol):
+            return self._load(symbol)["last_date"]
+
+    def merge(self, symbol, records):
+        """
+        将记录合并入库：按时间字段去重（新记录覆盖旧记录）并排序。
+        Args:
+            symbol (str): 股票代码。
+            records (list): 记录列表。
+        Returns:
+            int: 新增或更新的记录数。
+        """
+        with self._lock(symbol):
+            payload = self._load(symbol)
+            by_key = {record[self.key]: record for record in payload["records"]}
+            changed = 0
+            for record in records:
+                if self.key in record and by_key.get(record[self.key]) != record:
+                    by_key[record[self.key]] = record
+                    changed += 1
+            merged = [by_key[key] for key in sorted(by_key)]
+            self._save(symbol, {
+                "symbol": symbol,
+                "last_date": _record_date(merged[-1], self.key) if merged else None,
+                "synced_at": time.time(),
+                "records": merged,
+            })
+            return changed
+
+    def needs_sync(self, symbol, end_date=None):
+        """
+        判断是否需要向服务端同步：本地已覆盖今天之前的截止日期，或距上次同步不足最小间隔时无需同步。
+        截止日期为今天时，即使已存储当天数据也按最小间隔重新同步（盘中数据仍在变化）；
+        提供交易日历时，上次同步晚于最近一次收盘（加 settle_seconds）且当前休市，则数据不会再变化，无需同步。
+        """
+        with self._lock(symbol):
+            payload = self._load(symbol)
+        now = datetime.now()
+        today = now.strftime("%Y-%m-%d")
+        end_date = end_date or today
+        if payload["last_date"] and payload["last_date"] >= end_date and end_date < today:
+            return False
+        if time.time() - payload["synced_at"] < self.min_refresh_seconds:
+            return False
+        if self.calendar is not None and not self.calendar.is_open(now):
+            return payload["synced_at"] < self.calendar.last_session_end(now).timestamp() + self.settle_seconds
+        return True
+
+    def sync(self, symbol, fetcher, end_date=None):
+        """
+        必要时调用 fetcher 获取数据并增量合并。
+        Args:
+            symbol (str): 股票代码。
+            fetcher (callable): 无参函数，返回记录列表。
+            end_date (str): 需要覆盖到的日期。
+        Returns:
+            int: 新增或更新的记录数，未同步时为 0。
+        """
+        with self._lock(symbol):
+            if not self.needs_sync(symbol, end_date):
+                return 0
+            changed = self.merge(symbol, fetcher())
+            logging.info(f"历史数据已同步: {symbol}, 更新 {changed} 条, 最后日期 {self.last_date(symbol)}")
+            return changed
+
+    def query(self, symbol, start_date=None, end_date=None):
+        """
+        查询本地存储的日期区间数据。
+        Args:
+            symbol (str): 股票代码。
+            start_date (str): 开始日期（含），'YYYY-MM-DD'。
+            end_date (str): 截止日期（含），'YYYY-MM-DD'。
+        Returns:
+            list: 按时间排序的记录列表。
+        """
+        with self._lock(symbol):
+            records = self._load(symbol)["records"]
+        return [
+            record for record in records
+            if (start_date is None or _record_date(record, self.key) >= start_date)
+            and (end_date is None or _record_date(record, self.key) <= end_date)
+        ]
+
+
+_STORES = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_history_store(dataset="hsmy_lscj"):
+    """
+    获取进程内共享的历史数据存储，目录与同步间隔读取自 settings.json 的 "history_store"，
+    按共享交易日历判断休市期间是否需要同步。
+    """
+    try:
+        store_settings = get_settings_service().get_settings().get("history_store", {})
+    except FileNotFoundError:
+        store_settings = {}
+    config = dict(DEFAULT_HISTORY_STORE_CONFIG)
+    config.update(store_settings)
+    root = os.path.join(PROJECT_ROOT, config["path"])
+    key = (root, dataset)
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = HistoryStore(root, dataset=dataset)
+            _STORES[key] = store
+        store.min_refresh_seconds = config["min_refresh_seconds"]
+        store.settle_seconds = config["settle_seconds"]
+        store.calendar = get_trading_calendar()
+        return store
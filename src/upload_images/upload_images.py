@@ -1,7 +1,5 @@
 import os
 import base64
-import requests
-import json
 import sys
 
 # 添加项目根目录到 sys.path
@@ -10,13 +8,12 @@ if __name__ == "__main__" and "src" not in sys.path:
     if project_root not in sys.path:
         sys.path.insert(0, project_root)
 
+from config.settings import get_settings
+from src.utils import http_client
+
 def load_config():
     """加载配置文件"""
-    config_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../config/settings.json"))
-    if not os.path.exists(config_path):
-        raise FileNotFoundError(f"配置文件未找到: {config_path}")
-    with open(config_path, "r") as f:
-        return json.load(f)
+    return get_settings()
 
 CONFIG = load_config()
 
@@ -29,7 +26,7 @@ def check_existing_file(github_api_url, headers):
     Returns:
         str: 文件的 SHA 值。如果文件不存在，则返回 None。
     """
-    response = requests.get(github_api_url, headers=headers)
+    response = http_client.get(github_api_url, headers=headers)
     if response.status_code == 200:
         return response.json().get("sha")
     elif response.status_code == 404:
@@ -41,9 +38,10 @@ def upload_image_to_github(image_path, upload_path):
     """
     上传图片到 GitHub 仓库，并返回图片的 Raw URL。
     """
-    github_token = CONFIG.get("github_config").get("github_token")
-    repo_owner = CONFIG.get("github_config").get("repo_owner")
-    repo_name = CONFIG.get("github_config").get("repo_name")
+    github_config = load_config().get("github_config")
+    github_token = github_config.get("github_token")
+    repo_owner = github_config.get("repo_owner")
+    repo_name = github_config.get("repo_name")
     github_api_url_template = "https://api.github.com/repos/{owner}/{repo}/contents/{path}"
     github_api_url = github_api_url_template.format(owner=repo_owner, repo=repo_name, path=upload_path)
 
@@ -66,7 +64,7 @@ def upload_image_to_github(image_path, upload_path):
         data["sha"] = sha  # 如果文件已存在，添加 sha 值
 
     # 发送请求到 GitHub API
-    response = requests.put(github_api_url, headers=headers, json=data)
+    response = http_client.put(github_api_url, headers=headers, json=data)
     if response.status_code not in [200, 201]:
         raise Exception(f"图片上传失败: {response.status_code} - {response.text}")
 
@@ -0,0 +1,148 @@
+import logging
+import os
+import sys
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from config.settings import get_settings_service
+
+# 默认连接池与超时配置，可在 settings.json 的 "http" 节点中覆盖，
+# "http.hosts" 下可按主机名单独覆盖（如 {"api.biyingapi.com": {"pool_maxsize": 50}}）
+DEFAULT_HTTP_CONFIG = {
+    "pool_connections": 4,   # 每个会话缓存的连接池数量
+    "pool_maxsize": 16,      # 每个连接池保持的最大长连接数
+    "max_retries": 0,        # 连接失败时的自动重试次数
+    "connect_timeout": 5,    # 建立连接超时（秒）
+    "read_timeout": 60,      # 读取响应超时（秒），null 表示不限
+}
+
+# 响应时间不可预期的主机默认不限读取超时（图片上传、大模型推理），可在 "http.hosts" 中覆盖；
+# 大模型主机取自 settings.json 的 api_config.api_url
+DEFAULT_HOST_CONFIG = {
+    "api.github.com": {"read_timeout": None},
+}
+LLM_HOST_CONFIG = {"read_timeout": None}
+
+# 主机根地址 -> (创建时的配置版本, 会话)
+_SESSIONS = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+def _load_settings():
+    # 返回 (配置, 配置版本)，配置文件缺失时使用默认值
+    service = get_settings_service()
+    try:
+        settings = service.get_settings()
+    except FileNotFoundError:
+        return {}, None
+    return settings, service.version
+
+
+def _resolve_config(settings, host):
+    http_settings = settings.get("http", {})
+    config = dict(DEFAULT_HTTP_CONFIG)
+    config.update({key: value for key, value in http_settings.items() if key != "hosts"})
+    if host:
+        config.update(DEFAULT_HOST_CONFIG.get(host, {}))
+        llm_url = settings.get("api_config", {}).get("api_url")
+        if llm_url and urlparse(llm_url).hostname == host:
+            config.update(LLM_HOST_CONFIG)
+        config.update(http_settings.get("hosts", {}).get(host, {}))
+    return config
+
+
+def get_http_config(host=None):
+    """
+    获取 HTTP 配置，合并默认值、全局配置、内置主机默认值与主机级配置。
+    Args:
+        host (str): 主机名，如 'api.biyingapi.com'。
+    Returns:
+        dict: HTTP 配置。
+    """
+    return _resolve_config(_load_settings()[0], host)
+
+
+def _session_key(url):
+    parsed = urlparse(url)
+    if not parsed.scheme or not parsed.netloc:
+        raise ValueError(f"无效的 URL: {url}")
+    return f"{parsed.scheme}://{parsed.netloc}", parsed.hostname
+
+
+def get_session(url):
+    """
+    获取目标主机对应的共享会话。同一主机的请求复用连接池中的长连接，避免重复 TCP/TLS 握手。
+    settings.json 变化后重新创建会话，使新的连接池与重试配置生效。
+    Args:
+        url (str): 请求 URL 或主机根地址。
+    Returns:
+        requests.Session: 共享会话。
+    """
+    key, host = _session_key(url)
+    settings, version = _load_settings()
+    with _SESSIONS_LOCK:
+        cached = _SESSIONS.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        if cached is not None:
+            # 旧会话可能仍有进行中的请求，不主动关闭，随引用释放
+            logging.debug(f"配置已变化，重新创建 HTTP 连接池: {key}")
+        config = _resolve_config(settings, host)
+        adapter = HTTPAdapter(
+            pool_connections=config["pool_connections"],
+            pool_maxsize=config["pool_maxsize"],
+            max_retries=config["max_retries"],
+        )
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _SESSIONS[key] = (version, session)
+        logging.debug(f"创建 HTTP 连接池: {key}, 配置: {config}")
+        return session
+
+
+def request(method, url, **kwargs):
+    """
+    通过共享连接池发送请求，未指定 timeout 时使用配置中的连接/读取超时。
+    Args:
+        method (str): HTTP 方法。
+        url (str): 完整 URL。
+        kwargs: 透传给 requests.Session.request 的参数。
+    Returns:
+        requests.Response: 响应对象。
+    """
+    if kwargs.get("timeout") is None:
+        config = get_http_config(urlparse(url).hostname)
+        kwargs["timeout"] = (config["connect_timeout"], config["read_timeout"])
+    return get_session(url).request(method, url, **kwargs)
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+def put(url, **kwargs):
+    return request("PUT", url, **kwargs)
+
+
+def close_all():
+    """
+    关闭所有共享会话及其连接池。
+    """
+    with _SESSIONS_LOCK:
+        for _, session in _SESSIONS.values():
+            session.close()
+        _SESSIONS.clear()
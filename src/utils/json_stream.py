@@ -0,0 +1,116 @@
+import codecs
+import json
+
+_WHITESPACE = " \t\r\n"
+
+
+def iter_text(chunks, encoding="utf-8"):
+    """
+    将字节块增量解码为文本块，多字节字符跨块时也能正确解码。
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    for chunk in chunks:
+        text = decoder.decode(chunk) if isinstance(chunk, (bytes, bytearray)) else chunk
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def iter_json_array(chunks, encoding="utf-8"):
+    """
+    增量解析顶层为数组的 JSON，逐个产出数组元素，无需先读完整个响应。
+    顶层不是数组时（如错误信息对象）在读完后整体解析并产出一次。
+    Args:
+        chunks (iterable): 字节块或文本块，如 response.iter_content()。
+        encoding (str): 字节块的编码。
+    Yields:
+        object: 数组元素。
+    Raises:
+        ValueError: JSON 格式错误或数据不完整。
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    state = "start"   # start -> first/value <-> separator -> done；顶层非数组时为 single
+
+    def parse(final):
+        # 从 buffer 中解析尽可能多的完整元素，返回 (元素列表, 新位置, 新状态)
+        items = []
+        index, current = pos, state
+        while True:
+            while index < len(buffer) and buffer[index] in _WHITESPACE:
+                index += 1
+            if index >= len(buffer) or current in ("done", "single"):
+                return items, index, current
+            char = buffer[index]
+            if current == "start":
+                if char != "[":
+                    return items, index, "single"
+                index += 1
+                current = "first"
+            elif current == "separator":
+                if char == ",":
+                    index += 1
+                    current = "value"
+                elif char == "]":
+                    index += 1
+                    current = "done"
+                else:
+                    raise ValueError(f"JSON 数组格式错误，位置附近: {buffer[index:index + 20]!r}")
+            elif char == "]" and current == "first":
+                index += 1
+                current = "done"
+            else:
+                try:
+                    item, end = decoder.raw_decode(buffer, index)
+                except json.JSONDecodeError:
+                    if final:
+                        raise ValueError("JSON 数据不完整或格式错误")
+                    # 元素尚未接收完整，等待下一块
+                    return items, index, current
+                # 数字等标量可能在块末尾被截断，后面紧跟分隔符时才算完整
+                if not final and not isinstance(item, (dict, list)) and (
+                        end >= len(buffer) or buffer[end] not in _WHITESPACE + ",]"):
+                    return items, index, current
+                items.append(item)
+                index = end
+                current = "separator"
+
+    for text in iter_text(chunks, encoding):
+        buffer = buffer[pos:] + text
+        pos = 0
+        items, pos, state = parse(final=False)
+        yield from items
+
+    items, pos, state = parse(final=True)
+    yield from items
+    if state == "single":
+        yield json.loads(buffer[pos:])
+    elif state == "start":
+        return
+    elif state != "done" or buffer[pos:].strip():
+        raise ValueError("JSON 数据不完整或格式错误")
+
+
+def iter_column_chunks(rows, chunk_size):
+    """
+    将逐行数据按固定行数打包为列式块 {字段名: [值, ...]}，缺失字段以 None 填充。
+    """
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= chunk_size:
+            yield _to_columns(batch)
+            batch = []
+    if batch:
+        yield _to_columns(batch)
+
+
+def _to_columns(batch):
+    keys = {}
+    for row in batch:
+        for key in row:
+            keys.setdefault(key, None)
+    return {key: [row.get(key) for row in batch] for key in keys}
@@ -0,0 +1,277 @@
+import copy
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import date
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from config.settings import get_settings_service
+
+# 默认限流配置，可在 settings.json 的 "byapi.rate_limit" 节点中覆盖，
+# "byapi.rate_limit.endpoints" 下按数据字典的接口主键（API Key Combined）单独限流，
+# 如 {"lssj_historical_intraday_trading": {"requests_per_minute": 60}}
+DEFAULT_RATE_LIMIT_CONFIG = {
+    "requests_per_minute": 300,  # 许可证允许的每分钟请求数
+    "burst": 10,                 # 令牌桶容量，允许的瞬时突发请求数
+    "daily_quota": None,         # 每日请求配额，None 表示不限
+    "max_retries": 2,            # 收到 429 后的重试次数
+    "retry_after": 5,            # 服务端未给出 Retry-After 时的退避时间（秒）
+}
+
+LICENCE_KEY = "byapi"
+
+
+class RateLimitExceeded(RuntimeError):
+    """
+    超出每日请求配额时抛出。
+    """
+
+
+class TokenBucket:
+    """
+    线程安全的令牌桶。令牌按固定速率补充，取不到令牌时排队等待而不是失败。
+    """
+    def __init__(self, rate, capacity, daily_quota=None, clock=time.monotonic):
+        """
+        Args:
+            rate (float): 每秒补充的令牌数。
+            capacity (float): 桶容量。
+            daily_quota (int): 每日配额，None 表示不限。
+            clock (callable): 单调时钟，便于测试替换。
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.daily_quota = daily_quota
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated_at = clock()
+        self._blocked_until = 0.0
+        self._condition = threading.Condition()
+        self._quota_day = date.today()
+        self.stats = {"granted": 0, "waited": 0, "wait_time": 0.0, "throttled": 0, "used_today": 0}
+
+    def _refill(self, now):
+        elapsed = max(0.0, now - self._updated_at)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated_at = now
+
+    def _check_quota(self):
+        today = date.today()
+        if today != self._quota_day:
+            self._quota_day = today
+            self.stats["used_today"] = 0
+        if self.daily_quota is not None and self.stats["used_today"] >= self.daily_quota:
+            raise RateLimitExceeded(f"已用完每日请求配额: {self.daily_quota}")
+
+    def reserve(self):
+        """
+        预约一个令牌，返回需要等待的秒数（不阻塞）。
+        令牌允许预支为负数，后来的请求依次排在队尾，保证先到先得。
+        Returns:
+            float: 等待时间（秒）。
+        """
+        with self._condition:
+            self._check_quota()
+            now = self._clock()
+            self._refill(now)
+            self._tokens -= 1
+            wait = max(0.0, -self._tokens / self.rate, self._blocked_until - now)
+            self.stats["granted"] += 1
+            self.stats["used_today"] += 1
+            if wait > 0:
+                self.stats["waited"] += 1
+                self.stats["wait_time"] += wait
+            return wait
+
+    def refund(self):
+        """
+        归还 reserve 预约的令牌（请求最终没有发出时调用）。
+        """
+        with self._condition:
+            self._tokens = min(self.capacity, self._tokens + 1)
+            self.stats["granted"] -= 1
+            self.stats["used_today"] = max(0, self.stats["used_today"] - 1)
+
+    def penalize(self, seconds):
+        """
+        服务端返回限流时清空令牌并暂停发放，避免继续触发限流。
+        Args:
+            seconds (float): 暂停时间（秒）。
+        """
+        with self._condition:
+            now = self._clock()
+            self._refill(now)
+            self._tokens = min(self._tokens, 0.0)
+            self._blocked_until = max(self._blocked_until, now + seconds)
+            self.stats["throttled"] += 1
+
+
+class RateLimiter:
+    """
+    按 API Key / 接口分组的限流器，进程内所有线程共享。
+    每次请求同时消耗许可证总桶和（若配置了）接口桶的令牌。
+    接口键统一为数据字典的接口主键（API Key Combined），按 URL 路径调用时先用 endpoint_key 转换。
+    """
+    def __init__(self, config=None):
+        self.config = dict(DEFAULT_RATE_LIMIT_CONFIG)
+        self.config.update({key: value for key, value in (config or {}).items() if key != "endpoints"})
+        self.endpoint_config = {
+            endpoint_key(key): value for key, value in (config or {}).get("endpoints", {}).items()
+        }
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket_config(self, key):
+        if key == LICENCE_KEY:
+            return self.config
+        return self.endpoint_config.get(key)
+
+    def get_bucket(self, key):
+        """
+        获取指定键的令牌桶，未配置限流的接口返回 None。
+        Args:
+            key (str): 许可证键或接口键。
+        Returns:
+            TokenBucket or None: 令牌桶。
+        """
+        with self._lock:
+            if key in self._buckets:
+                return self._buckets[key]
+            config = self._bucket_config(key)
+            bucket = None
+            if config and config.get("requests_per_minute"):
+                bucket = TokenBucket(
+                    rate=config["requests_per_minute"] / 60.0,
+                    capacity=config.get("burst", self.config["burst"]),
+                    daily_quota=config.get("daily_quota"),
+                )
+            self._buckets[key] = bucket
+            return bucket
+
+    def _buckets_for(self, endpoint):
+        keys = [LICENCE_KEY] if endpoint is None else [LICENCE_KEY, endpoint]
+        return [bucket for bucket in map(self.get_bucket, keys) if bucket is not None]
+
+    def acquire(self, endpoint=None):
+        """
+        获取发起一次请求的许可，令牌不足时阻塞排队。
+        Args:
+            endpoint (str): 接口键，None 表示只受许可证总速率限制。
+        Returns:
+            float: 实际等待时间（秒）。
+        """
+        reserved = []
+        try:
+            for bucket in self._buckets_for(endpoint):
+                reserved.append((bucket, bucket.reserve()))
+        except RateLimitExceeded:
+            # 任一令牌桶配额用完时请求不会发出，归还已预约的令牌
+            for bucket, _ in reserved:
+                bucket.refund()
+            raise
+        wait = max([bucket_wait for _, bucket_wait in reserved], default=0.0)
+        if wait > 0:
+            logging.debug(f"限流排队: {endpoint or LICENCE_KEY}, 等待 {wait:.2f}s")
+            time.sleep(wait)
+        return wait
+
+    def penalize(self, endpoint, seconds):
+        """
+        收到 429 后暂停该许可证及接口的令牌发放。
+        """
+        for bucket in self._buckets_for(endpoint):
+            bucket.penalize(seconds)
+
+    def call(self, endpoint, func, *args, **kwargs):
+        """
+        在限流下执行请求函数；收到 429 时按 Retry-After 退避后重试。
+        Args:
+            endpoint (str): 接口键。
+            func (callable): 返回 requests.Response 的请求函数。
+        Returns:
+            requests.Response: 响应对象。
+        """
+        for attempt in range(self.config["max_retries"] + 1):
+            self.acquire(endpoint)
+            response = func(*args, **kwargs)
+            if getattr(response, "status_code", None) != 429 or attempt == self.config["max_retries"]:
+                return response
+            retry_after = _parse_retry_after(response, self.config["retry_after"])
+            # 释放 429 响应占用的连接，重试时可复用
+            response.close()
+            logging.warning(f"接口被限流: {endpoint or LICENCE_KEY}, {retry_after}s 后重试")
+            self.penalize(endpoint, retry_after)
+        return response
+
+    def quota_report(self):
+        """
+        汇总各令牌桶的配额使用情况。
+        Returns:
+            dict: {键: 统计信息}。
+        """
+        with self._lock:
+            buckets = {key: bucket for key, bucket in self._buckets.items() if bucket is not None}
+        report = {}
+        for key, bucket in buckets.items():
+            with bucket._condition:
+                report[key] = dict(bucket.stats, daily_quota=bucket.daily_quota)
+        return report
+
+
+def endpoint_key(endpoint):
+    """
+    将接口标识统一为数据字典的接口主键（API Key Combined）。
+    已是主键时原样返回；URL 路径（如 'hsmy/lscj'）在数据字典中查找对应接口，
+    数据字典不可用或未收录时按路径段以下划线连接（'hsmy_lscj'）。
+    Args:
+        endpoint (str): 接口主键或 URL 路径。
+    Returns:
+        str: 接口主键。
+    """
+    if endpoint is None or "/" not in endpoint:
+        return endpoint
+    path = endpoint.strip("/")
+    try:
+        # 延迟导入，避免与 by_api_manager 循环依赖
+        from src.data_fetcher.by_api_manager import get_api_manager
+
+        found = get_api_manager().find_endpoint(path)
+    except (FileNotFoundError, ValueError, KeyError) as e:
+        logging.debug(f"API 数据字典不可用，按路径生成接口键: {e}")
+        found = None
+    return found.key if found is not None else path.replace("/", "_")
+
+
+def _parse_retry_after(response, default):
+    try:
+        return float(response.headers.get("Retry-After", default))
+    except (TypeError, ValueError, AttributeError):
+        return default
+
+
+_LIMITER_CACHE = {"config": None, "limiter": None}
+_LIMITER_LOCK = threading.Lock()
+
+
+def get_rate_limiter():
+    """
+    获取进程内共享的限流器；settings.json 中的限流配置变化时重建。
+    Returns:
+        RateLimiter: 限流器。
+    """
+    try:
+        config = get_settings_service().get_settings().get("byapi", {}).get("rate_limit", {})
+    except FileNotFoundError:
+        config = {}
+    with _LIMITER_LOCK:
+        if _LIMITER_CACHE["limiter"] is None or _LIMITER_CACHE["config"] != config:
+            _LIMITER_CACHE["config"] = copy.deepcopy(config)
+            _LIMITER_CACHE["limiter"] = RateLimiter(config)
+        return _LIMITER_CACHE["limiter"]
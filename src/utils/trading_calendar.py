@@ -0,0 +1,176 @@
+import json
+import logging
+import os
+import sys
+import threading
+from datetime import date, datetime, time, timedelta
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from config.settings import PROJECT_ROOT, get_settings_service
+
+# A 股连续竞价时段（上午、下午，中间为午间休市）
+A_SHARE_SESSIONS = ((time(9, 30), time(11, 30)), (time(13, 0), time(15, 0)))
+
+DEFAULT_HOLIDAYS_PATH = "config/trading_holidays.json"
+
+
+def _to_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value)[:10], "%Y-%m-%d").date()
+
+
+class TradingCalendar:
+    """
+    A 股交易日历：交易时段、午间休市与节假日（从本地文件加载）。
+
+    :param holidays: iterable, 休市的工作日（'YYYY-MM-DD' 或 date）
+    :param sessions: tuple, ((开始, 结束), ...) 交易时段
+    """
+    def __init__(self, holidays=(), sessions=A_SHARE_SESSIONS):
+        self.holidays = {_to_date(day) for day in holidays}
+        self.sessions = tuple(sessions)
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        从 JSON 文件加载休市日，文件格式为 {"holidays": [...]} 或日期列表；文件不存在时只按周末休市。
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except FileNotFoundError:
+            logging.warning(f"休市日文件未找到，仅按周末判断: {path}")
+            return cls()
+        holidays = payload.get("holidays", []) if isinstance(payload, dict) else payload
+        return cls(holidays)
+
+    def is_trading_day(self, day):
+        day = _to_date(day)
+        return day.weekday() < 5 and day not in self.holidays
+
+    def is_open(self, now=None):
+        """
+        判断当前是否处于交易时段（不含午间休市）。
+        """
+        now = now or datetime.now()
+        if not self.is_trading_day(now):
+            return False
+        current = now.time()
+        return any(start <= current < end for start, end in self.sessions)
+
+    def session_end(self, now=None):
+        """
+        返回当前交易时段的结束时间，不在交易时段时返回 None。
+        """
+        now = now or datetime.now()
+        if not self.is_trading_day(now):
+            return None
+        for start, end in self.sessions:
+            if start <= now.time() < end:
+                return datetime.combine(now.date(), end)
+        return None
+
+    def next_open(self, now=None):
+        """
+        返回 now 之后最近一个交易时段的开始时间（当前处于交易时段时返回下一个时段的开始）。
+        """
+        now = now or datetime.now()
+        day = now.date()
+        # 最长假期不超过一个月
+        for _ in range(40):
+            if self.is_trading_day(day):
+                for start, _ in self.sessions:
+                    candidate = datetime.combine(day, start)
+                    if candidate > now:
+                        return candidate
+            day += timedelta(days=1)
+        raise ValueError(f"未找到 {now} 之后的交易时段，请检查休市日配置")
+
+    def last_session_end(self, now=None):
+        """
+        返回 now 之前（含）最近一个已结束交易时段的结束时间（处于交易时段时返回上一个时段的结束）。
+        """
+        now = now or datetime.now()
+        day = now.date()
+        # 最长假期不超过一个月
+        for _ in range(40):
+            if self.is_trading_day(day):
+                for _, end in reversed(self.sessions):
+                    candidate = datetime.combine(day, end)
+                    if candidate <= now:
+                        return candidate
+            day -= timedelta(days=1)
+        raise ValueError(f"未找到 {now} 之前的交易时段，请检查休市日配置")
+
+    def seconds_until_open(self, now=None):
+        """
+        距离下一次开盘的秒数，处于交易时段时为 0。
+        """
+        now = now or datetime.now()
+        if self.is_open(now):
+            return 0.0
+        return (self.next_open(now) - now).total_seconds()
+
+    def trading_days(self, start, end):
+        """
+        返回 [start, end] 内的交易日列表。
+        """
+        day, end = _to_date(start), _to_date(end)
+        days = []
+        while day <= end:
+            if self.is_trading_day(day):
+                days.append(day)
+            day += timedelta(days=1)
+        return days
+
+    def last_trading_days(self, count, end=None):
+        """
+        返回截至 end（含）的最近 count 个交易日，按时间升序。
+        """
+        day = _to_date(end or datetime.now())
+        days = []
+        while len(days) < count:
+            if self.is_trading_day(day):
+                days.append(day)
+            day -= timedelta(days=1)
+        return days[::-1]
+
+    def recent_range(self, count, end=None):
+        """
+        最近 count 个交易日的日期区间。
+        :return: tuple, (开始日期, 截止日期)，格式 'YYYY-MM-DD'
+        """
+        days = self.last_trading_days(count, end)
+        return days[0].strftime("%Y-%m-%d"), days[-1].strftime("%Y-%m-%d")
+
+
+_CALENDAR = {"path": None, "mtime": None, "calendar": None}
+_CALENDAR_LOCK = threading.Lock()
+
+
+def get_trading_calendar():
+    """
+    获取进程内共享的交易日历，休市日文件路径读取自 settings.json 的 "trading_calendar.holidays_path"，
+    文件修改后自动重新加载。
+    """
+    try:
+        calendar_settings = get_settings_service().get_settings().get("trading_calendar", {})
+    except FileNotFoundError:
+        calendar_settings = {}
+    path = os.path.join(PROJECT_ROOT, calendar_settings.get("holidays_path", DEFAULT_HOLIDAYS_PATH))
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        mtime = None
+    with _CALENDAR_LOCK:
+        if _CALENDAR["calendar"] is None or _CALENDAR["path"] != path or _CALENDAR["mtime"] != mtime:
+            _CALENDAR.update(path=path, mtime=mtime, calendar=TradingCalendar.from_file(path))
+        return _CALENDAR["calendar"]
@@ -0,0 +1,4 @@
+from .executor import Stage, WorkflowExecutor, WorkflowResult
+from .job_queue import JobQueue
+
+__all__ = ["Stage", "WorkflowExecutor", "WorkflowResult", "JobQueue"]
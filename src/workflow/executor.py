@@ -0,0 +1,132 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class Stage:
+    """
+    工作流中的单个阶段。
+    Args:
+        name (str): 阶段名称，同一工作流内唯一。
+        func (callable): 阶段函数，接收依赖阶段结果组成的 dict，返回本阶段结果。
+        depends_on (tuple): 依赖的阶段名称。
+        optional (bool): 为 True 时本阶段失败不会跳过下游阶段，下游收到的结果为 None。
+    """
+    def __init__(self, name, func, depends_on=(), optional=False):
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+        self.optional = optional
+
+
+class WorkflowResult:
+    """
+    工作流执行结果，包含各阶段的返回值、异常、耗时以及被跳过的阶段。
+    """
+    def __init__(self):
+        self.results = {}
+        self.errors = {}
+        self.timings = {}
+        self.skipped = []
+        self.total_time = 0.0
+
+    @property
+    def success(self):
+        return not self.errors and not self.skipped
+
+    def format_timings(self):
+        """
+        生成各阶段耗时报告。
+        Returns:
+            str: 多行文本，每行一个阶段。
+        """
+        lines = [f"工作流总耗时: {self.total_time:.2f}s"]
+        for name, (start, end) in sorted(self.timings.items(), key=lambda item: item[1][0]):
+            status = "失败" if name in self.errors else "完成"
+            lines.append(f"  - {name}: {end - start:.2f}s (开始于 +{start:.2f}s, {status})")
+        for name in self.skipped:
+            lines.append(f"  - {name}: 已跳过（上游阶段失败）")
+        return "\n".join(lines)
+
+
+class WorkflowExecutor:
+    """
+    基于依赖关系（DAG）的工作流执行器。
+
+    所有依赖已完成的阶段会立即提交到线程池并发执行，
+    因此互不依赖的网络调用（如上传、OCR、历史数据获取）可以重叠进行。
+    """
+    def __init__(self, max_workers=4):
+        self.max_workers = max_workers
+        self.stages = {}
+
+    def add_stage(self, name, func, depends_on=(), optional=False):
+        """
+        添加阶段。依赖的阶段必须先于本阶段添加，以保证图中无环。
+        Returns:
+            WorkflowExecutor: 自身，便于链式调用。
+        """
+        if name in self.stages:
+            raise ValueError(f"阶段 '{name}' 已存在")
+        missing = [dep for dep in depends_on if dep not in self.stages]
+        if missing:
+            raise ValueError(f"阶段 '{name}' 依赖的阶段不存在: {missing}")
+        self.stages[name] = Stage(name, func, depends_on, optional)
+        return self
+
+    def run(self):
+        """
+        执行工作流，直到所有阶段完成、失败或被跳过。
+        Returns:
+            WorkflowResult: 执行结果。
+        """
+        result = WorkflowResult()
+        pending = dict(self.stages)
+        running = {}
+        started_at = time.perf_counter()
+
+        def is_blocked(stage):
+            # 必需的上游阶段失败或被跳过时，本阶段不再执行
+            for dep in stage.depends_on:
+                if dep in result.skipped:
+                    return True
+                if dep in result.errors and not self.stages[dep].optional:
+                    return True
+            return False
+
+        def is_ready(stage):
+            return all(dep in result.results or dep in result.errors for dep in stage.depends_on)
+
+        def run_stage(stage, deps):
+            start = time.perf_counter() - started_at
+            try:
+                return stage.func(deps)
+            finally:
+                result.timings[stage.name] = (start, time.perf_counter() - started_at)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                # 跳过被阻塞的阶段，提交所有已就绪的阶段
+                for name, stage in list(pending.items()):
+                    if is_blocked(stage):
+                        result.skipped.append(name)
+                        del pending[name]
+                    elif is_ready(stage):
+                        deps = {dep: result.results.get(dep) for dep in stage.depends_on}
+                        running[pool.submit(run_stage, stage, deps)] = name
+                        del pending[name]
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        result.results[name] = future.result()
+                    except Exception as e:
+                        logging.error(f"阶段 {name} 执行失败: {e}")
+                        result.errors[name] = e
+
+        result.total_time = time.perf_counter() - started_at
+        return result
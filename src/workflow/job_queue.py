@@ -0,0 +1,133 @@
+import logging
+import queue
+import threading
+import time
+
+# 工作线程退出标记
+_STOP = object()
+
+
+class JobQueue:
+    """
+    快捷键任务队列：在固定数量的工作线程中执行任务，调用方（如 pynput 回调）只负责投递，不会被阻塞。
+
+    - 防抖：距上一次被接受的触发不足 debounce_seconds 的触发直接忽略（按住组合键时的键盘重复）。
+    - 合并：待执行任务数已达到 queue_size 时，新的触发合并到已排队的任务中，不再重复排队。
+    - 并发上限：最多 max_concurrency 个任务同时执行。
+
+    Args:
+        action (callable): 要执行的任务函数，无参数。
+        max_concurrency (int): 工作线程数量，即同时执行的任务上限。
+        queue_size (int): 排队等待执行的任务上限。
+        debounce_seconds (float): 防抖时间窗口（秒）。
+        name (str): 工作线程名称前缀。
+    """
+    def __init__(self, action, max_concurrency=1, queue_size=1, debounce_seconds=1.0, name="job"):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency 必须大于 0")
+        self.action = action
+        self.queue_size = max(0, queue_size)
+        self.debounce_seconds = debounce_seconds
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._closed = False
+        self._last_accepted = None
+        self.stats = {
+            "triggered": 0,
+            "accepted": 0,
+            "debounced": 0,
+            "coalesced": 0,
+            "completed": 0,
+            "failed": 0,
+            "discarded": 0,
+        }
+
+        self._workers = [
+            threading.Thread(target=self._worker, name=f"{name}-worker-{i}", daemon=True)
+            for i in range(max_concurrency)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    @property
+    def in_flight(self):
+        """
+        正在执行的任务数。
+        """
+        with self._lock:
+            return self._running
+
+    def submit(self):
+        """
+        投递一次触发，立即返回。
+        Returns:
+            bool: 是否产生了新的排队任务（被防抖或合并时返回 False）。
+        """
+        now = time.monotonic()
+        with self._lock:
+            self.stats["triggered"] += 1
+            if self._closed:
+                return False
+            if self._last_accepted is not None and now - self._last_accepted < self.debounce_seconds:
+                self.stats["debounced"] += 1
+                return False
+            self._last_accepted = now
+
+            # 没有空闲线程且排队已满时，与已排队的任务合并
+            idle_workers = len(self._workers) - self._running - self._pending
+            if idle_workers <= 0 and self._pending >= self.queue_size:
+                self.stats["coalesced"] += 1
+                return False
+
+            self._pending += 1
+            self.stats["accepted"] += 1
+        self._queue.put(None)
+        return True
+
+    def _worker(self):
+        while True:
+            job = self._queue.get()
+            if job is _STOP:
+                return
+            with self._lock:
+                if self._closed:
+                    # 关闭后不再启动排队中的任务
+                    self._pending -= 1
+                    self.stats["discarded"] += 1
+                    continue
+                self._pending -= 1
+                self._running += 1
+            try:
+                self.action()
+                with self._lock:
+                    self.stats["completed"] += 1
+            except Exception as e:
+                logging.error(f"任务执行失败: {e}")
+                with self._lock:
+                    self.stats["failed"] += 1
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+    def shutdown(self, timeout=None):
+        """
+        停止接收新任务，丢弃尚未开始的任务，并等待执行中的任务结束。
+        Args:
+            timeout (float): 最长等待时间（秒），None 表示一直等待。
+        Returns:
+            bool: 所有工作线程是否已在超时前结束。
+        """
+        with self._lock:
+            self._closed = True
+        for _ in self._workers:
+            self._queue.put(_STOP)
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for worker in self._workers:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            worker.join(remaining)
+        logging.info(f"任务队列已关闭，统计: {self.stats}")
+        return not any(worker.is_alive() for worker in self._workers)
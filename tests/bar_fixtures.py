@@ -0,0 +1,45 @@
+import numpy as np
+
+
+def random_walk_bars(length=600, seed=0, symbols=None):
+    """
+    随机游走的 K 线列数据 {"c", "h", "l", "v"}，同一 seed 结果固定。
+    指定 symbols 时每列为 (symbols, length) 的矩阵。
+    """
+    rng = np.random.default_rng(seed)
+    shape = length if symbols is None else (symbols, length)
+    close = 100 + np.cumsum(rng.normal(0, 1, shape), axis=-1)
+    return {
+        "c": close,
+        "h": close + rng.random(shape),
+        "l": close - rng.random(shape),
+        "v": rng.integers(100, 10000, shape).astype(float),
+    }
+
+
+def bar_records(columns, start=0, stop=None):
+    """
+    将列数据转换为逐根 K 线记录（用于逐条写入或增量更新）。
+    """
+    names = list(columns)
+    length = len(columns[names[0]])
+    return [{name: float(columns[name][i]) for name in names} for i in range(start, stop or length)]
+
+
+def calendar_days(start, count):
+    """
+    从 start 开始连续 count 个自然日，'YYYY-MM-DD' 字符串。
+    """
+    return [str(day) for day in np.datetime64(start) + np.arange(count)]
+
+
+def daily_records(dates, close=10.0, volume=1000.0):
+    """
+    指定日期的日线记录，close 为标量或与 dates 等长的序列。
+    """
+    closes = np.broadcast_to(np.asarray(close, dtype=float), (len(dates),))
+    return [
+        {"d": date, "o": price - 0.5, "h": price + 1.0, "l": price - 1.0, "c": float(price),
+         "v": volume, "e": price * volume}
+        for date, price in zip(dates, closes)
+    ]
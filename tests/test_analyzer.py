@@ -1,4 +1,5 @@
 import unittest
+import numpy as np
 from src.analyzer.analyze import StockAnalyzer
 
 class TestStockAnalyzer(unittest.TestCase):
@@ -26,5 +27,17 @@ class TestStockAnalyzer(unittest.TestCase):
         self.assertIn("macd", analysis)
         self.assertIn("short_term_trend", analysis)
 
+    def test_analyze_batch(self):
+        closes = [row["close"] for row in self.historical_data]
+        matrix = np.array([closes, closes[::-1], [np.nan] * 5, [np.nan, np.nan] + closes[:3]])
+        result = self.analyzer.analyze_batch(["000001", "000002", "000003", "000004"], {"close": matrix})
+        self.assertEqual(result["bars"].tolist(), [5, 5, 0, 3])
+        self.assertEqual(list(result["short_term_trend"]), ["Bullish", "Bearish", None, "Bullish"])
+        single = self.analyzer.analyze_stock({"price": 108}, self.historical_data)
+        self.assertAlmostEqual(result["indicators"]["MACD"][0], single["macd"]["MACD"])
+        self.assertEqual(result["current_price"][3], 104)
+        with self.assertRaises(ValueError):
+            self.analyzer.analyze_batch(["000001"], {"close": matrix})
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
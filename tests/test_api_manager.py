@@ -1,7 +1,11 @@
 import os
 import sys
+import shutil
+import tempfile
 import unittest
 import json
+from datetime import datetime
+from unittest.mock import patch, MagicMock
 
 # 添加项目根目录到 sys.path
 if __name__ == "__main__" and "src" not in sys.path:
@@ -9,7 +13,9 @@ if __name__ == "__main__" and "src" not in sys.path:
     if project_root not in sys.path:
         sys.path.insert(0, project_root)
 
-from src.data_fetcher.by_api_manager import ByApiManager  # 确保路径正确
+from src.data_fetcher.by_api_manager import ByApiManager, ApiEndpoint, request_period  # 确保路径正确
+from src.data_fetcher.response_cache import ResponseCache
+from src.utils.trading_calendar import TradingCalendar
 
 class TestByApiManager(unittest.TestCase):
     def setUp(self):
@@ -65,5 +71,199 @@ class TestByApiManager(unittest.TestCase):
         self.assertGreater(len(fields), 0)
         self.assertEqual(fields[0]["API Key Combined"], api_key_combined)
 
+class TestByApiManagerIndex(unittest.TestCase):
+    def setUp(self):
+        """
+        使用临时数据字典初始化，不依赖真实配置与网络
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        api_data_path = os.path.join(self.temp_dir, "api_data_dictionary.json")
+        fields_data_path = os.path.join(self.temp_dir, "fields_data_dictionary.json")
+        with open(api_data_path, "w", encoding="utf-8") as f:
+            json.dump([
+                {
+                    "API Key Combined": "lssj_historical_intraday_trading",
+                    "url_template": "/hszbl/fsjy/{stock_code}/{time_frame}/{api_key}",
+                    "API Params": "{\"stock_code\": \"股票代码\", \"time_frame\": \"分时级别\", \"api_key\": \"用户授权密钥\"}"
+                },
+                {
+                    "API Key Combined": "hslt_list",
+                    "url_template": "hslt/list/{api_key}",
+                    "API Params": None
+                },
+                {
+                    "API Key Combined": "hsmy_lscj",
+                    "url_template": "/hsmy/lscj/{stock_code}/{api_key}",
+                    "API Params": "{\"stock_code\": \"股票代码\", \"st\": \"开始日期\", \"et\": \"结束日期\", \"api_key\": \"用户授权密钥\"}"
+                }
+            ], f)
+        with open(fields_data_path, "w", encoding="utf-8") as f:
+            json.dump([
+                {"API Key Combined": "hslt_list", "field_name": "dm", "field_description": "股票代码"},
+                {"API Key Combined": "hslt_list", "field_name": "mc", "field_description": "股票名称"},
+            ], f)
+        self.api_manager = ByApiManager({
+            "byapi": {
+                "api_url": "http://api.biyingapi.com/",
+                "api_key": "TEST-KEY",
+                "api_data_json_path": api_data_path,
+                "fields_data_json_path": fields_data_path,
+            }
+        })
+        # 默认不使用磁盘上的共享响应缓存
+        cache_patcher = patch("src.data_fetcher.by_api_manager.get_response_cache", return_value=None)
+        self.get_response_cache = cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_build_url(self):
+        """
+        测试使用预编译模板生成 URL
+        """
+        url = self.api_manager.build_url(
+            "lssj_historical_intraday_trading", {"stock_code": "300624", "time_frame": "dn"}
+        )
+        self.assertEqual(url, "http://api.biyingapi.com/hszbl/fsjy/300624/dn/TEST-KEY")
+        self.assertEqual(self.api_manager.build_url("hslt_list"), "http://api.biyingapi.com/hslt/list/TEST-KEY")
+
+    def test_missing_params(self):
+        """
+        测试缺少必需参数与未知 API
+        """
+        with self.assertRaises(ValueError) as context:
+            self.api_manager.build_url("lssj_historical_intraday_trading", {"stock_code": "300624"})
+        self.assertIn("time_frame", str(context.exception))
+        with self.assertRaises(ValueError) as context:
+            self.api_manager.build_url("invalid_key")
+        self.assertIn("API 'invalid_key' 未找到", str(context.exception))
+
+    def test_render_matches_str_format(self):
+        """
+        测试预编译模板与 str.format 结果一致
+        """
+        endpoint = ApiEndpoint({"API Key Combined": "x", "url_template": "/a/{code}/{n:03d}/{api_key}"})
+        params = {"code": "000001", "n": 7, "api_key": "K"}
+        self.assertEqual(endpoint.render_path(params), endpoint.url_template.format(**params))
+        self.assertEqual(endpoint.placeholders, ("code", "n", "api_key"))
+
+    def test_fields_index(self):
+        """
+        测试字段信息按 API 建立索引
+        """
+        fields = self.api_manager.get_fields_by_api_key("hslt_list")
+        self.assertEqual([field["field_name"] for field in fields], ["dm", "mc"])
+        self.assertEqual(self.api_manager.get_fields_by_api_key("unknown"), [])
+
+    @patch("src.data_fetcher.by_api_manager.http_client.get")
+    def test_fetch_api_data(self, mock_get):
+        """
+        测试请求使用拼接后的 URL
+        """
+        mock_response = MagicMock()
+        mock_response.json.return_value = [{"dm": "000001"}]
+        mock_get.return_value = mock_response
+        result = self.api_manager.fetch_api_data("hslt_list")
+        self.assertEqual(result, [{"dm": "000001"}])
+        self.assertEqual(mock_get.call_args[0][0], "http://api.biyingapi.com/hslt/list/TEST-KEY")
+
+    @patch("src.data_fetcher.by_api_manager.http_client.get")
+    def test_fetch_api_data_uses_response_cache(self, mock_get):
+        """
+        测试命中响应缓存时不再发起请求，并按请求中的周期参数缓存
+        """
+        # 2024-11-29 为周五，盘中
+        calendar = TradingCalendar()
+        cache = ResponseCache(
+            os.path.join(self.temp_dir, "cache"), ttls={"lssj_": 300},
+            clock=lambda: datetime(2024, 11, 29, 10, 0), calendar=calendar,
+        )
+        self.get_response_cache.return_value = cache
+        mock_response = MagicMock()
+        mock_response.json.return_value = [{"d": "2024-11-29", "c": 1}]
+        mock_get.return_value = mock_response
+        params = {"stock_code": "300624", "time_frame": "dn"}
+        for _ in range(2):
+            result = self.api_manager.fetch_api_data("lssj_historical_intraday_trading", params)
+            self.assertEqual(result, [{"d": "2024-11-29", "c": 1}])
+        self.assertEqual(mock_get.call_count, 1)
+        # 跳过缓存时重新请求
+        self.api_manager.fetch_api_data("lssj_historical_intraday_trading", params, use_cache=False)
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(request_period(params, {}), "dn")
+        self.assertIsNone(request_period(None, {}))
+
+    @patch("src.data_fetcher.by_api_manager.http_client.get")
+    def test_fetch_range_server_side(self, mock_get):
+        """
+        测试接口声明了日期参数时由服务端过滤
+        """
+        mock_response = MagicMock()
+        mock_response.json.return_value = [{"t": "2024-11-20", "c": 1}, {"t": "2024-11-28", "c": 2}]
+        mock_get.return_value = mock_response
+        result = self.api_manager.fetch_range("hsmy_lscj", {"stock_code": "300624"}, "2024-11-25", "2024-11-29")
+        # 服务端已按区间返回，不再在客户端二次过滤
+        self.assertEqual(len(result), 2)
+        self.assertEqual(mock_get.call_args[1]["params"], {"st": "20241125", "et": "20241129"})
+        self.assertEqual(self.api_manager.find_endpoint("hsmy/lscj").key, "hsmy_lscj")
+
+    @patch("src.data_fetcher.by_api_manager.http_client.get")
+    def test_fetch_range_client_side_fallback(self, mock_get):
+        """
+        测试接口未声明日期参数时在客户端过滤，周期参数填入 URL 模板
+        """
+        mock_response = MagicMock()
+        mock_response.json.return_value = [
+            {"d": "2024-11-20", "c": 1}, {"d": "2024-11-26", "c": 2}, {"d": "2024-11-30", "c": 3}
+        ]
+        mock_get.return_value = mock_response
+        result = self.api_manager.fetch_range(
+            "lssj_historical_intraday_trading", {"stock_code": "300624"}, "2024-11-25", "2024-11-29", period="dn"
+        )
+        self.assertEqual(result, [{"d": "2024-11-26", "c": 2}])
+        self.assertEqual(mock_get.call_args[0][0], "http://api.biyingapi.com/hszbl/fsjy/300624/dn/TEST-KEY")
+        self.assertEqual(mock_get.call_args[1]["params"], {})
+
+    @patch("src.data_fetcher.by_api_manager.http_client.get")
+    def test_stream_api_data(self, mock_get):
+        """
+        测试流式请求逐行及按列式块产出
+        """
+        mock_response = MagicMock(status_code=200, encoding="utf-8")
+        mock_response.iter_content.side_effect = lambda chunk_size: iter([b'[{"dm": "000001"}, ', b'{"dm": "600519"}]'])
+        mock_get.return_value = mock_response
+        rows = list(self.api_manager.stream_api_data("hslt_list"))
+        self.assertEqual(rows, [{"dm": "000001"}, {"dm": "600519"}])
+        self.assertTrue(mock_get.call_args[1]["stream"])
+        chunks = list(self.api_manager.stream_api_data("hslt_list", chunk_size=10))
+        self.assertEqual(chunks, [{"dm": ["000001", "600519"]}])
+        mock_response.close.assert_called()
+
+
+    def test_find_endpoint_prefix_index(self):
+        """
+        测试按完整路径段前缀查找接口
+        """
+        self.assertEqual(self.api_manager.find_endpoint("/hszbl/fsjy/").key, "lssj_historical_intraday_trading")
+        self.assertEqual(self.api_manager.find_endpoint("hsmy").key, "hsmy_lscj")
+        self.assertIsNone(self.api_manager.find_endpoint("hsm"))
+        self.assertIsNone(self.api_manager.find_endpoint("unknown/path"))
+
+    @patch("src.data_fetcher.by_api_manager.http_client.get")
+    def test_fetch_api_data_masks_api_key_in_log(self, mock_get):
+        """
+        测试调试日志中的 URL 不包含 api_key
+        """
+        mock_response = MagicMock()
+        mock_response.json.return_value = []
+        mock_get.return_value = mock_response
+        with self.assertLogs(level="DEBUG") as logs:
+            self.api_manager.fetch_api_data("hslt_list")
+        output = "\n".join(logs.output)
+        self.assertIn("hslt/list/***", output)
+        self.assertNotIn("TEST-KEY", output)
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
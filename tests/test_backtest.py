@@ -0,0 +1,172 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from src.analyzer.analyze import StockAnalyzer
+from src.analyzer.backtest import (
+    DEFAULT_BACKTEST_CONFIG,
+    backtest_positions,
+    backtest_rule,
+    backtest_universe,
+    expand_grid,
+    forward_fill,
+    format_grid_results,
+    run_grid,
+)
+from src.storage.bar_reader import BarReader
+from src.storage.bar_store import BarStore
+from tests.bar_fixtures import calendar_days, daily_records, random_walk_bars
+
+
+def make_prices(symbols=6, length=200, seed=0):
+    close = random_walk_bars(length, seed, symbols=symbols)["c"]
+    close[1, :50] = np.nan      # 上市较晚
+    close[2, 100:105] = np.nan  # 停牌
+    return close
+
+
+class TestBacktestPositions(unittest.TestCase):
+    def test_forward_fill(self):
+        """
+        测试停牌向前填充，未上市保持 NaN
+        """
+        filled = forward_fill([[np.nan, 1.0, np.nan, 3.0], [np.nan, np.nan, np.nan, np.nan]])
+        np.testing.assert_array_equal(filled[0], [np.nan, 1.0, 1.0, 3.0])
+        self.assertTrue(np.isnan(filled[1]).all())
+
+    def test_known_returns(self):
+        """
+        测试手工构造的收益、命中率、回撤与交易次数
+        """
+        close = np.array([[10.0, 11.0, 9.9, 9.9, 10.89]])
+        positions = np.array([[True, True, False, True, True]])
+        result = backtest_positions(close, positions)
+        per_symbol = result["per_symbol"]
+        # 持有 +10%、-10%，空仓 0%，再持有 +10%
+        self.assertAlmostEqual(per_symbol["total_return"][0], 1.1 * 0.9 * 1.1 - 1)
+        self.assertAlmostEqual(per_symbol["benchmark_return"][0], 0.089)
+        self.assertAlmostEqual(per_symbol["max_drawdown"][0], -0.1)
+        self.assertEqual(per_symbol["trades"][0], 2)
+        # 看多 3 次命中 2 次；空仓那天持平不算命中
+        self.assertAlmostEqual(per_symbol["long_hit_rate"][0], 2 / 3)
+        self.assertAlmostEqual(per_symbol["hit_rate"][0], 2 / 4)
+        self.assertAlmostEqual(per_symbol["exposure"][0], 3 / 4)
+
+        with_cost = backtest_positions(close, positions, cost=0.01)["per_symbol"]["total_return"][0]
+        self.assertLess(with_cost, per_symbol["total_return"][0])
+
+    def test_suspension_inside_position(self):
+        """
+        测试持仓期间停牌不计入额外的开平仓与交易成本，复牌收益计入原持仓
+        """
+        close = np.array([[10.0, 11.0, np.nan, np.nan, 12.1, 13.31]])
+        # 停牌期间规则算出的信号不可成交，应沿用停牌前的持仓
+        positions = np.array([[True, True, False, False, True, True]])
+        per_symbol = backtest_positions(close, positions, cost=0.01)["per_symbol"]
+        self.assertEqual(per_symbol["trades"][0], 1)
+        self.assertEqual(per_symbol["bars"][0], 3)
+        self.assertAlmostEqual(per_symbol["total_return"][0], (1.1 - 0.01) * 1.1 * 1.1 - 1)
+        self.assertAlmostEqual(per_symbol["exposure"][0], 1.0)
+
+        # 停牌前平仓，停牌期间保持空仓，复牌后再开仓
+        positions = np.array([[True, False, True, True, True, True]])
+        per_symbol = backtest_positions(close, positions, cost=0.01)["per_symbol"]
+        self.assertEqual(per_symbol["trades"][0], 2)
+        self.assertAlmostEqual(per_symbol["total_return"][0], (1.1 - 0.01) * 0.99 * (1.1 - 0.01) - 1)
+
+    def test_always_long_matches_benchmark(self):
+        """
+        测试始终持有时收益等于买入持有，停牌与未上市区间不计入
+        """
+        close = make_prices()
+        result = backtest_positions(close, np.ones(close.shape, dtype=bool))
+        per_symbol = result["per_symbol"]
+        np.testing.assert_allclose(per_symbol["total_return"], per_symbol["benchmark_return"])
+        expected = close[2, -1] / close[2, 0] - 1
+        self.assertAlmostEqual(per_symbol["total_return"][2], expected)
+        self.assertEqual(per_symbol["bars"].tolist()[:3], [199, 149, 194])
+        self.assertEqual(result["summary"]["symbols"], 6)
+        self.assertEqual(result["summary"]["periods"], 199)
+
+    def test_requires_two_days(self):
+        with self.assertRaises(ValueError):
+            backtest_positions(np.ones((2, 1)), np.ones((2, 1), dtype=bool))
+
+
+class TestBacktestRules(unittest.TestCase):
+    def setUp(self):
+        self.close = make_prices()
+
+    def test_macd_trend_matches_short_term_trend(self):
+        """
+        测试默认规则与 StockAnalyzer 的 short_term_trend 一致
+        """
+        from src.analyzer.backtest import macd_trend
+
+        positions = macd_trend(forward_fill(self.close))
+        batch = StockAnalyzer().analyze_batch(range(6), {"close": forward_fill(self.close)})
+        self.assertEqual(positions[:, -1].tolist(), [trend == "Bullish" for trend in batch["short_term_trend"]])
+
+    def test_unknown_rule(self):
+        with self.assertRaises(ValueError):
+            backtest_rule(self.close, "unknown")
+        with self.assertRaises(ValueError):
+            run_grid(self.close, "unknown", {})
+
+    def test_grid_parallel_matches_sequential(self):
+        """
+        测试多进程网格搜索与顺序执行结果一致，并过滤无效参数组合
+        """
+        grid = {"fast": [5, 12, 30], "slow": [26], "signal": [9]}
+        self.assertEqual(len(expand_grid(grid)), 3)
+        sequential = run_grid(self.close, "macd_trend", grid, cost=0.001, max_workers=1)
+        parallel = run_grid(self.close, "macd_trend", grid, cost=0.001, max_workers=2)
+        self.assertEqual(len(sequential), 2)
+        self.assertEqual([item["params"] for item in sequential], [item["params"] for item in parallel])
+        for left, right in zip(sequential, parallel):
+            self.assertAlmostEqual(left["total_return"], right["total_return"])
+        self.assertGreaterEqual(sequential[0]["total_return"], sequential[1]["total_return"])
+        self.assertEqual(len(format_grid_results(sequential).splitlines()), 3)
+
+    def test_ma_trend(self):
+        result = backtest_rule(self.close, "ma_trend", {"window": 10})
+        self.assertEqual(result["per_symbol"]["total_return"].shape, (6,))
+
+
+class TestBacktestUniverse(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        store = BarStore(self.root)
+        close = make_prices(symbols=3, length=80)
+        dates = calendar_days("2024-01-01", 80)
+        for row, symbol in enumerate(["000001", "000002", "000003"]):
+            store.append(symbol, [bar for bar in daily_records(dates, close[row]) if not np.isnan(bar["c"])])
+        self.reader = BarReader(store)
+
+    def tearDown(self):
+        self.reader.close()
+        shutil.rmtree(self.root)
+
+    def test_backtest_from_bar_store(self):
+        """
+        测试从本地 K 线存储读取按日期对齐的数据并回测
+        """
+        config = dict(DEFAULT_BACKTEST_CONFIG, grid={"fast": [12], "slow": [26], "signal": [9]}, max_workers=1)
+        results = backtest_universe(reader=self.reader, config=config)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["symbols"], 3)
+        self.assertEqual(results[0]["periods"], 79)
+
+
+if __name__ == "__main__":
+    unittest.main()
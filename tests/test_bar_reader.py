@@ -0,0 +1,143 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from src.storage.bar_reader import BarReader, to_seconds
+from src.storage.bar_store import BarStore
+from tests.bar_fixtures import calendar_days, daily_records
+
+
+class TestBarReader(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.store = BarStore(self.root)
+        self.store.append("000001", daily_records(calendar_days("2024-11-01", 20), 10.0 + np.arange(20)))
+        self.store.append("600519", daily_records(calendar_days("2024-11-10", 5), 100.0 + np.arange(5)))
+        self.reader = BarReader(self.store)
+
+    def tearDown(self):
+        self.reader.close()
+        shutil.rmtree(self.root)
+
+    def test_open_returns_zero_copy_views(self):
+        """
+        测试返回的列是内存映射视图
+        """
+        view = self.reader.open("000001")
+        self.assertEqual(len(view), 20)
+        self.assertIsInstance(view["c"], np.memmap)
+        sliced = view.slice("2024-11-05", "2024-11-07")
+        self.assertTrue(np.shares_memory(sliced["c"], view["c"]))
+        np.testing.assert_array_equal(sliced["c"], [14.0, 15.0, 16.0])
+
+    def test_read_range_inclusive_end_date(self):
+        """
+        测试截止日期包含当天
+        """
+        view = self.reader.read_range("000001", "2024-11-19", "2024-11-20", columns=["c"])
+        self.assertEqual(list(view.columns), ["t", "c"])
+        self.assertEqual(len(view), 2)
+        self.assertEqual(to_seconds("2024-11-20", end=True) - to_seconds("2024-11-20"), 86399)
+
+    def test_read_matrix_right_aligned(self):
+        """
+        测试多只股票组成靠右对齐的矩阵，历史不足的行前面补 NaN
+        """
+        symbols, matrix, counts = self.reader.read_matrix(["600519", "000001", "999999"], length=8, end="2024-11-12")
+        self.assertEqual(symbols, ["600519", "000001"])
+        self.assertEqual(counts.tolist(), [3, 8])
+        self.assertEqual(matrix["c"].shape, (2, 8))
+        self.assertTrue(np.isnan(matrix["c"][0, :5]).all())
+        np.testing.assert_array_equal(matrix["c"][0, 5:], [100.0, 101.0, 102.0])
+        self.assertEqual(matrix["c"][1, -1], 21.0)
+
+    def test_read_panel_aligned_by_date(self):
+        """
+        测试按日期并集对齐，缺失日期为 NaN
+        """
+        symbols, dates, panel = self.reader.read_panel(["000001", "600519"], "2024-11-09", "2024-11-16")
+        self.assertEqual(symbols, ["000001", "600519"])
+        self.assertEqual(len(dates), 8)
+        self.assertEqual(dates[0], to_seconds("2024-11-09"))
+        np.testing.assert_array_equal(panel["c"][0], np.arange(18.0, 26.0))
+        np.testing.assert_array_equal(panel["c"][1], [np.nan, 100.0, 101.0, 102.0, 103.0, 104.0, np.nan, np.nan])
+
+    def test_reopen_after_append(self):
+        """
+        测试追加数据后重新映射
+        """
+        self.assertEqual(len(self.reader.open("600519")), 5)
+        self.store.append("600519", daily_records(calendar_days("2024-11-15", 2)))
+        self.assertEqual(len(self.reader.open("600519")), 7)
+
+    def test_scan_symbols(self):
+        """
+        测试逐只股票遍历
+        """
+        result = {symbol: len(view) for symbol, view in self.reader.scan(start="2024-11-12", end="2024-11-13")}
+        self.assertEqual(result, {"000001": 2, "600519": 2})
+        missing = list(self.reader.scan(["999999"]))
+        self.assertEqual(missing, [])
+
+    def test_long_names_for_analyzer(self):
+        """
+        测试转换为长字段名后可直接构建 DataFrame
+        """
+        columns = self.reader.open("000001").tail(5).to_columns(long_names=True)
+        self.assertIn("close", columns)
+        self.assertEqual(len(columns["close"]), 5)
+
+
+@unittest.skipIf(resource is None, "需要 resource 模块")
+class TestBarReaderFileLimit(unittest.TestCase):
+    """
+    读取的股票数远多于进程可打开的文件数时，不应因同时保留映射而耗尽文件描述符。
+    """
+    SYMBOLS = 120
+    FILE_LIMIT = 160
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        store = BarStore(self.root)
+        self.symbols = [f"{index:06d}" for index in range(self.SYMBOLS)]
+        for symbol in self.symbols:
+            store.append(symbol, daily_records(calendar_days("2024-11-01", 10)))
+        self.reader = BarReader(store)
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(self.FILE_LIMIT, hard), hard))
+        self.addCleanup(resource.setrlimit, resource.RLIMIT_NOFILE, (soft, hard))
+
+    def tearDown(self):
+        self.reader.close()
+        shutil.rmtree(self.root)
+
+    def test_read_matrix_many_symbols(self):
+        names, matrix, counts = self.reader.read_matrix(length=5)
+        self.assertEqual(len(names), self.SYMBOLS)
+        self.assertEqual(matrix["c"].shape, (self.SYMBOLS, 5))
+        self.assertTrue((counts == 5).all())
+
+    def test_read_panel_many_symbols(self):
+        names, dates, panel = self.reader.read_panel(columns=("c", "v"))
+        self.assertEqual(len(names), self.SYMBOLS)
+        self.assertEqual(len(dates), 10)
+        self.assertFalse(np.isnan(panel["c"]).any())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from src.storage.bar_store import BarStore, to_epoch_seconds
+from tests.bar_fixtures import daily_records
+
+
+class TestBarStore(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.store = BarStore(self.root)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_append_and_read(self):
+        """
+        测试写入后按列读取，类型与结构稳定
+        """
+        rows = self.store.append("000001", daily_records(["2024-11-27", "2024-11-28"]))
+        self.assertEqual(rows, 2)
+        data = self.store.read("000001")
+        self.assertEqual(data["t"].dtype, np.dtype("<i8"))
+        self.assertEqual(data["v"].dtype, np.dtype("<f8"))
+        np.testing.assert_array_equal(data["t"], to_epoch_seconds(["2024-11-27", "2024-11-28"]))
+        self.assertIsInstance(data["c"], np.memmap)
+        self.assertEqual(self.store.symbols(), ["000001"])
+
+    def test_append_tail_overwrites_last_bar(self):
+        """
+        测试追加时忽略旧数据、覆盖最后一根并追加新数据
+        """
+        self.store.append("000001", daily_records(["2024-11-26", "2024-11-27", "2024-11-28"]))
+        rows = self.store.append("000001", daily_records(["2024-11-27", "2024-11-28", "2024-11-29"], close=12.0))
+        self.assertEqual(rows, 2)
+        data = self.store.read("000001", ["t", "c"], mmap=False)
+        self.assertEqual(len(data["t"]), 4)
+        np.testing.assert_array_equal(data["c"], [10.0, 10.0, 12.0, 12.0])
+
+    def test_unsorted_duplicates_and_aliases(self):
+        """
+        测试乱序、重复时间戳和长字段名
+        """
+        bars = [
+            {"timestamp": "2024-11-28 10:00:00", "open": 1, "high": 2, "low": 0.5, "close": 1.5, "volume": 10},
+            {"timestamp": "2024-11-28 09:30:00", "open": 1, "high": 2, "low": 0.5, "close": 1.2, "volume": 10},
+            {"timestamp": "2024-11-28 10:00:00", "open": 1, "high": 2, "low": 0.5, "close": 1.8, "volume": 10},
+        ]
+        self.store.append("000001", bars)
+        data = self.store.read("000001")
+        np.testing.assert_array_equal(data["c"], [1.2, 1.8])
+        self.assertTrue(np.isnan(data["e"]).all())
+
+    def test_rows_without_time_are_rejected(self):
+        """
+        测试缺少时间字段的记录被剔除，其余记录照常写入
+        """
+        bars = daily_records(["2024-11-27", "2024-11-28"])
+        bars.insert(1, {"o": 1.0, "h": 2.0, "l": 0.5, "c": 1.5, "v": 10})
+        bars.append(dict(bars[0], d=None))
+        self.assertEqual(self.store.append("000001", bars), 2)
+        self.assertEqual(self.store.length("000001"), 2)
+        self.assertEqual(self.store.append("000002", [{"c": 1.0}]), 0)
+        with self.assertRaises(ValueError):
+            self.store.append("000003", {"c": [1.0]})
+
+    def test_write_replaces_and_frame(self):
+        """
+        测试覆盖写入与 DataFrame 读取
+        """
+        self.store.append("000001", daily_records(["2024-11-26", "2024-11-27"]))
+        self.store.write("000001", daily_records(["2024-11-01"]))
+        self.assertEqual(self.store.length("000001"), 1)
+        frame = self.store.read_frame("000001")
+        self.assertEqual(len(frame), 1)
+        self.assertEqual(str(frame["t"].iloc[0].date()), "2024-11-01")
+
+    def test_missing_symbol(self):
+        """
+        测试读取不存在的股票
+        """
+        with self.assertRaises(KeyError):
+            self.store.read("600519")
+        self.assertEqual(self.store.length("600519"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
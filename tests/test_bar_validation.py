@@ -0,0 +1,139 @@
+import os
+import sys
+import unittest
+import warnings
+
+import numpy as np
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from src.data_fetcher.bar_validation import AV_BAR_FIELDS, clean_records, validate_bar_columns, validate_bars
+
+
+class TestBarValidation(unittest.TestCase):
+    def test_columnar_batch(self):
+        """
+        测试列式批次的类型转换、范围检查与去重
+        """
+        batch = {
+            "t": ["d1", "d2", "d3", "d4", "d1", "d5"],
+            "o": ["1", "x", 1, 1, 1, 1],
+            "c": [1, 1, 1, 1, 1, 1],
+            "h": [2, 2, 0.5, 2, 2, 2],
+            "l": [1, 1, 1, 1, 1, 1],
+            "v": ["10", 10, 10, -1, 10, 7.9],
+        }
+        clean, summary = validate_bars(batch)
+        self.assertEqual(clean["t"].tolist(), ["d1", "d5"])
+        self.assertEqual(clean["o"].dtype, np.float64)
+        self.assertEqual(clean["v"].tolist(), [10, 7])
+        self.assertEqual(summary["total"], 6)
+        self.assertEqual(summary["valid"], 2)
+        self.assertEqual(summary["rejected"], {
+            "invalid_type": 1, "high_below_low": 1, "negative_volume": 1, "duplicate_timestamp": 1,
+        })
+        self.assertEqual(summary["examples"]["duplicate_timestamp"], [4])
+
+    def test_duplicate_keeps_first_valid_occurrence(self):
+        """
+        测试无效行不占用时间戳，后续同时间戳的有效行被保留
+        """
+        records = [
+            {"t": "d1", "o": "bad", "c": 1, "h": 2, "l": 1, "v": 1},
+            {"t": "d1", "o": 1, "c": 1, "h": 2, "l": 1, "v": 1},
+        ]
+        cleaned, summary = clean_records(records)
+        self.assertEqual(len(cleaned), 1)
+        self.assertIs(cleaned[0], records[1])
+        self.assertEqual(summary["rejected"], {"invalid_type": 1})
+
+    def test_records_missing_fields_and_extra_keys(self):
+        """
+        测试缺失字段被拒绝，其余字段原样保留
+        """
+        records = [
+            {"timestamp": "a", "open": "150.5", "close": "152.5", "high": "153", "low": "150", "volume": "1000", "x": 1},
+            {"timestamp": "b", "open": "150.5", "close": "152.5", "high": "153", "low": "150"},
+        ]
+        cleaned, summary = clean_records(records, AV_BAR_FIELDS)
+        self.assertEqual(cleaned, [
+            {"timestamp": "a", "open": 150.5, "close": 152.5, "high": 153.0, "low": 150.0, "volume": 1000, "x": 1}
+        ])
+        self.assertIsInstance(cleaned[0]["volume"], int)
+        self.assertEqual(summary["rejected"], {"missing_field": 1})
+
+    def test_volume_follows_int_semantics(self):
+        """
+        测试成交量按 int() 语义转换：数值截断取整，非整数字符串视为类型错误；None 视为缺失
+        """
+        records = [
+            {"t": "d1", "o": 1, "c": 1, "h": 2, "l": 1, "v": "12.5"},
+            {"t": "d2", "o": 1, "c": 1, "h": 2, "l": 1, "v": 12.5},
+            {"t": "d3", "o": 1, "c": 1, "h": 2, "l": 1, "v": " 12 "},
+            {"t": "d4", "o": None, "c": 1, "h": 2, "l": 1, "v": 1},
+            {"t": "d5", "o": 1, "c": 1, "h": "inf", "l": 1, "v": 1},
+        ]
+        clean, summary = validate_bars(records)
+        self.assertEqual(clean["t"].tolist(), ["d2", "d3"])
+        self.assertEqual(clean["v"].tolist(), [12, 12])
+        self.assertEqual(summary["rejected"], {"missing_field": 1, "invalid_type": 2})
+        self.assertEqual(summary["examples"]["invalid_type"], [0, 4])
+
+    def test_volume_out_of_int64_range(self):
+        """
+        测试超出 int64 范围的成交量视为类型错误，不会溢出为负数或产生警告
+        """
+        records = [
+            {"t": "d1", "o": 1, "c": 1, "h": 2, "l": 1, "v": 10 ** 30},
+            {"t": "d2", "o": 1, "c": 1, "h": 2, "l": 1, "v": str(2 ** 63)},
+            {"t": "d3", "o": 1, "c": 1, "h": 2, "l": 1, "v": 2 ** 62},
+        ]
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            clean, summary = validate_bars(records)
+            columns = {"t": np.array(["d1", "d2"]), "o": np.ones(2), "c": np.ones(2), "h": np.ones(2),
+                       "l": np.ones(2), "v": np.array([1e30, 5.0])}
+            mask, converted, column_summary = validate_bar_columns(columns)
+        self.assertEqual(clean["t"].tolist(), ["d3"])
+        self.assertEqual(clean["v"].tolist(), [2 ** 62])
+        self.assertEqual(summary["rejected"], {"invalid_type": 2})
+        self.assertEqual(mask.tolist(), [False, True])
+        self.assertEqual(column_summary["rejected"], {"invalid_type": 1})
+
+    def test_validate_bars_does_not_mutate_records(self):
+        """
+        测试列式校验不修改输入记录，并按需保留其他字段
+        """
+        records = [{"t": "d1", "o": "1", "c": "1", "h": "2", "l": "1", "v": "3", "e": 4.5}]
+        clean, summary = validate_bars(records, keep=("e",))
+        self.assertEqual(records[0]["o"], "1")
+        self.assertEqual(clean["o"].tolist(), [1.0])
+        self.assertEqual(clean["e"].tolist(), [4.5])
+        self.assertEqual(summary["valid"], 1)
+
+    def test_bad_value_only_affects_its_row(self):
+        """
+        测试大批次中个别无法转换的值只拒绝所在行
+        """
+        records = [{"t": index, "o": "1.5", "c": "1.5", "h": "2", "l": "1", "v": "3"} for index in range(20000)]
+        records[10000]["o"] = "bad"
+        clean, summary = validate_bars(records)
+        self.assertEqual(summary["valid"], 19999)
+        self.assertEqual(summary["examples"]["invalid_type"], [10000])
+        self.assertTrue((clean["o"] == 1.5).all())
+
+    def test_empty_batch(self):
+        """
+        测试空批次
+        """
+        cleaned, summary = clean_records([])
+        self.assertEqual(cleaned, [])
+        self.assertEqual(summary["valid"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from src.data_fetcher.batch_downloader import BatchDownloader, download_history_batch
+from src.storage.bar_store import bar_dataset
+
+
+class TestBatchDownloader(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.checkpoint_path = os.path.join(self.temp_dir, "checkpoint.json")
+        self.stored = {}
+        self.lock = threading.Lock()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def writer(self, symbol, data):
+        with self.lock:
+            self.stored[symbol] = data
+
+    def test_concurrent_download(self):
+        """
+        测试并发下载并写入全部股票
+        """
+        active = []
+        peak = []
+
+        def fetcher(symbol):
+            with self.lock:
+                active.append(symbol)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with self.lock:
+                active.remove(symbol)
+            return [symbol]
+
+        symbols = [f"{i:06d}" for i in range(40)]
+        downloader = BatchDownloader(fetcher, self.writer, self.checkpoint_path, max_workers=4, checkpoint_every=10)
+        summary = downloader.run(symbols)
+        self.assertEqual(summary["completed"], 40)
+        self.assertEqual(summary["failed"], 0)
+        self.assertEqual(set(self.stored), set(symbols))
+        self.assertLessEqual(max(peak), 4)
+        self.assertGreater(max(peak), 1)
+
+    def test_resume_from_checkpoint(self):
+        """
+        测试中断后从进度文件继续，只重试失败和未完成的股票
+        """
+        def failing_fetcher(symbol):
+            if symbol == "000002":
+                raise RuntimeError("boom")
+            return [symbol]
+
+        downloader = BatchDownloader(failing_fetcher, self.writer, self.checkpoint_path, max_workers=2)
+        summary = downloader.run(["000001", "000002", "000003"])
+        self.assertEqual((summary["completed"], summary["failed"]), (2, 1))
+        with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        self.assertEqual(payload["completed"], ["000001", "000003"])
+        self.assertIn("000002", payload["failed"])
+
+        fetched = []
+
+        def fetcher(symbol):
+            fetched.append(symbol)
+            return [symbol]
+
+        resumed = BatchDownloader(fetcher, self.writer, self.checkpoint_path, max_workers=2)
+        summary = resumed.run(["000001", "000002", "000003", "000004"])
+        self.assertEqual(sorted(fetched), ["000002", "000004"])
+        self.assertEqual(summary["skipped"], 2)
+        self.assertEqual(resumed.checkpoint.failed, {})
+
+    def test_skip_failed_when_not_retrying(self):
+        """
+        测试不重试上次失败的股票
+        """
+        with open(self.checkpoint_path, "w", encoding="utf-8") as f:
+            json.dump({"completed": [], "failed": {"000001": "boom"}}, f)
+        downloader = BatchDownloader(lambda symbol: [], self.writer, self.checkpoint_path)
+        summary = downloader.run(["000001", "000002"], retry_failed=False)
+        self.assertEqual(summary["completed"], 1)
+        self.assertEqual(list(self.stored), ["000002"])
+
+    def test_dataset_follows_time_frame(self):
+        """
+        测试数据集按周期推导，周期与数据集不一致时拒绝下载
+        """
+        self.assertEqual(bar_dataset("dn"), "daily")
+        self.assertEqual(bar_dataset("5m"), "5m")
+        with self.assertRaises(ValueError):
+            download_history_batch(["000001"], time_frame="5m", dataset="daily",
+                                   checkpoint_path=self.checkpoint_path)
+        with self.assertRaises(ValueError):
+            download_history_batch(["000001"], time_frame="dn", dataset="5m",
+                                   checkpoint_path=self.checkpoint_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -59,7 +59,7 @@ class TestFetchApiData(unittest.TestCase):
         if os.path.exists(self.test_config_dir):
             os.rmdir(self.test_config_dir)
 
-    @patch("src.data_fetcher.fetch_api_data.requests.get")
+    @patch("src.data_fetcher.fetch_api_data.http_client.get")
     def test_fetch_api_data_success(self, mock_get):
         """
         测试 fetch_api_data 正常情况
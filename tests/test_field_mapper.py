@@ -0,0 +1,76 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from src.data_fetcher.field_mapper import FieldMapper
+
+
+class TestFieldMapper(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.dictionary_path = os.path.join(self.temp_dir, "api_fields_dictionary.json")
+        with open(self.dictionary_path, "w", encoding="utf-8") as f:
+            json.dump([
+                {
+                    "API Key Combined": "ssjy_intraday_transactions",
+                    "fields": [
+                        {"field_name": "d", "field_description": "数据归属日期"},
+                        {"field_name": "v", "field_description": "成交量（股）"},
+                        {"field_name": "p", "field_description": "成交价"},
+                    ]
+                }
+            ], f, ensure_ascii=False)
+        self.mapper = FieldMapper(self.dictionary_path)
+        self.rows = [{"d": "2024-11-29", "v": 100, "p": 63.4, "extra": 1} for _ in range(3)]
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_map_records(self):
+        """
+        测试列表与字典数据的字段替换
+        """
+        mapped = self.mapper.map_records("ssjy_intraday_transactions", self.rows)
+        self.assertEqual(mapped[0], {"数据归属日期": "2024-11-29", "成交量（股）": 100, "成交价": 63.4, "extra": 1})
+        self.assertEqual(len(mapped), 3)
+        single = self.mapper.map_records("ssjy_intraday_transactions", {"p": 1.0})
+        self.assertEqual(single, {"成交价": 1.0})
+
+    def test_dictionary_loaded_once(self):
+        """
+        测试字段字典只读取一次
+        """
+        with patch("src.data_fetcher.field_mapper.json.load", wraps=json.load) as mock_load:
+            for _ in range(5):
+                self.mapper.map_records("ssjy_intraday_transactions", self.rows)
+        self.assertEqual(mock_load.call_count, 1)
+
+    def test_unknown_api(self):
+        """
+        测试未知 API
+        """
+        with self.assertRaises(ValueError):
+            self.mapper.get_mapping("unknown")
+
+    def test_bulk_rename(self):
+        """
+        测试 DataFrame 与列式数据的批量重命名
+        """
+        df = self.mapper.to_frame("ssjy_intraday_transactions", self.rows)
+        self.assertEqual(list(df.columns), ["数据归属日期", "成交量（股）", "成交价", "extra"])
+        columns = self.mapper.map_columns("ssjy_intraday_transactions", {"v": [1, 2], "p": [3.0, 4.0]})
+        self.assertEqual(columns, {"成交量（股）": [1, 2], "成交价": [3.0, 4.0]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from src.storage.history_store import HistoryStore
+from src.utils.trading_calendar import TradingCalendar
+
+
+def make_record(t, c=10.0):
+    return {"t": t, "o": 9.0, "c": c, "h": 11.0, "l": 8.0, "v": 100}
+
+
+class TestHistoryStore(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.store = HistoryStore(self.root, min_refresh_seconds=300)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_merge_dedupes_and_sorts(self):
+        """
+        测试合并时去重、排序并记录最后日期
+        """
+        self.store.merge("000001", [make_record("2024-11-28"), make_record("2024-11-27")])
+        changed = self.store.merge("000001", [make_record("2024-11-28", c=12.0), make_record("2024-11-29")])
+        self.assertEqual(changed, 2)
+        records = self.store.query("000001")
+        self.assertEqual([r["t"] for r in records], ["2024-11-27", "2024-11-28", "2024-11-29"])
+        self.assertEqual(records[1]["c"], 12.0)
+        self.assertEqual(self.store.last_date("000001"), "2024-11-29")
+
+    def test_merge_keeps_backfilled_records(self):
+        """
+        测试早于最后日期的补录数据按时间去重后同样入库
+        """
+        self.store.merge("000001", [make_record("2024-11-28")])
+        changed = self.store.merge("000001", [make_record("2024-11-01"), make_record("2024-11-28")])
+        self.assertEqual(changed, 1)
+        self.assertEqual([r["t"] for r in self.store.query("000001")], ["2024-11-01", "2024-11-28"])
+        self.assertEqual(self.store.last_date("000001"), "2024-11-28")
+
+    def test_query_range_with_time_suffix(self):
+        """
+        测试日期区间查询，时间字段带时分秒时按日期比较
+        """
+        self.store.merge("000001", [make_record(f"2024-11-{day:02d} 15:00:00") for day in range(20, 30)])
+        records = self.store.query("000001", "2024-11-25", "2024-11-27")
+        self.assertEqual(len(records), 3)
+
+    def test_sync_skips_when_recent_or_covered(self):
+        """
+        测试刚同步过或本地已覆盖截止日期时不再请求
+        """
+        calls = []
+
+        def fetcher():
+            calls.append(1)
+            return [make_record("2024-11-28")]
+
+        self.assertEqual(self.store.sync("000001", fetcher, "2024-11-29"), 1)
+        self.assertEqual(self.store.sync("000001", fetcher, "2024-11-29"), 0)
+        self.assertEqual(self.store.sync("000001", fetcher, "2024-11-28"), 0)
+        self.assertEqual(len(calls), 1)
+
+        self.store.min_refresh_seconds = 0
+        self.store.sync("000001", fetcher, "2024-11-29")
+        self.assertEqual(len(calls), 2)
+
+    def test_sync_refreshes_today(self):
+        """
+        测试已存储当天数据时仍按最小间隔重新同步，更新盘中数据
+        """
+        today = datetime.now().strftime("%Y-%m-%d")
+        closes = iter([10.0, 10.5])
+        fetcher = lambda: [make_record(today, c=next(closes))]
+
+        self.assertEqual(self.store.sync("000001", fetcher), 1)
+        self.assertFalse(self.store.needs_sync("000001"))
+        self.store.min_refresh_seconds = 0
+        self.assertTrue(self.store.needs_sync("000001", today))
+        self.assertEqual(self.store.sync("000001", fetcher), 1)
+        self.assertEqual(self.store.query("000001")[-1]["c"], 10.5)
+
+    def test_sync_skips_today_when_market_closed(self):
+        """
+        测试休市期间（今天为休市日）收盘后已同步过的当天数据不再重复下载
+        """
+        today = datetime.now().strftime("%Y-%m-%d")
+        calls = []
+
+        def fetcher():
+            calls.append(1)
+            return [make_record(today)]
+
+        self.store.min_refresh_seconds = 0
+        self.store.calendar = TradingCalendar([today])
+        self.assertTrue(self.store.needs_sync("000001", today))
+        self.store.sync("000001", fetcher, today)
+        self.assertFalse(self.store.needs_sync("000001", today))
+        self.assertEqual(self.store.sync("000001", fetcher, today), 0)
+        self.assertEqual(len(calls), 1)
+
+        # 不区分交易时段时仍按最小间隔重新同步
+        self.store.calendar = None
+        self.assertTrue(self.store.needs_sync("000001", today))
+
+    def test_persisted_across_instances(self):
+        """
+        测试数据持久化到磁盘
+        """
+        self.store.merge("000001", [make_record("2024-11-28")])
+        other = HistoryStore(self.root)
+        self.assertEqual(other.last_date("000001"), "2024-11-28")
+        self.assertIsNone(other.last_date("600519"))
+        self.assertEqual(other.query("600519"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch, MagicMock
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from src.utils import http_client
+
+
+class TestHttpClient(unittest.TestCase):
+    def setUp(self):
+        http_client.close_all()
+        self.settings = {
+            "http": {
+                "pool_maxsize": 8,
+                "read_timeout": 30,
+                "hosts": {"api.biyingapi.com": {"pool_maxsize": 32}},
+            }
+        }
+        patcher = patch("src.utils.http_client.get_settings_service")
+        self.mock_service = patcher.start()
+        self.mock_service.return_value.get_settings.return_value = self.settings
+        self.mock_service.return_value.version = 1
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        http_client.close_all()
+
+    def test_session_shared_per_host(self):
+        """
+        测试同一主机复用会话，不同主机使用独立会话
+        """
+        first = http_client.get_session("http://api.biyingapi.com/hsrl/ssjy/000001/KEY")
+        second = http_client.get_session("http://api.biyingapi.com/hslt/list/KEY")
+        other = http_client.get_session("https://api.github.com/repos")
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+
+    def test_pool_size_from_settings(self):
+        """
+        测试连接池大小读取全局与主机级配置
+        """
+        biying = http_client.get_session("http://api.biyingapi.com/")
+        github = http_client.get_session("https://api.github.com/")
+        self.assertEqual(biying.get_adapter("http://api.biyingapi.com/")._pool_maxsize, 32)
+        self.assertEqual(github.get_adapter("https://api.github.com/")._pool_maxsize, 8)
+
+    def test_default_timeout(self):
+        """
+        测试未指定 timeout 时使用配置的超时
+        """
+        session = http_client.get_session("http://api.biyingapi.com/")
+        with patch.object(session, "request", return_value=MagicMock()) as mock_request:
+            http_client.get("http://api.biyingapi.com/hslt/list/KEY", params={"a": 1})
+            self.assertEqual(mock_request.call_args.kwargs["timeout"], (5, 30))
+            http_client.post("http://api.biyingapi.com/x", timeout=3)
+            self.assertEqual(mock_request.call_args.kwargs["timeout"], 3)
+
+    def test_long_running_hosts_without_read_timeout(self):
+        """
+        测试 GitHub 与大模型主机默认不限读取超时，且可被主机级配置覆盖
+        """
+        self.settings["api_config"] = {"api_url": "https://llm.example.com"}
+        self.assertEqual(http_client.get_http_config("api.github.com")["read_timeout"], None)
+        self.assertEqual(http_client.get_http_config("llm.example.com")["read_timeout"], None)
+        self.assertEqual(http_client.get_http_config("api.biyingapi.com")["read_timeout"], 30)
+        self.settings["http"]["hosts"]["llm.example.com"] = {"read_timeout": 600}
+        self.assertEqual(http_client.get_http_config("llm.example.com")["read_timeout"], 600)
+
+        session = http_client.get_session("https://api.github.com/")
+        with patch.object(session, "request", return_value=MagicMock()) as mock_request:
+            http_client.put("https://api.github.com/repos/a/b/contents/x.png", json={})
+            self.assertEqual(mock_request.call_args.kwargs["timeout"], (5, None))
+
+    def test_session_recreated_after_settings_change(self):
+        """
+        测试配置版本变化后重新创建会话，新的连接池配置生效
+        """
+        first = http_client.get_session("http://api.biyingapi.com/")
+        self.assertIs(http_client.get_session("http://api.biyingapi.com/"), first)
+        self.settings["http"]["hosts"]["api.biyingapi.com"]["pool_maxsize"] = 64
+        self.mock_service.return_value.version = 2
+        second = http_client.get_session("http://api.biyingapi.com/")
+        self.assertIsNot(second, first)
+        self.assertEqual(second.get_adapter("http://api.biyingapi.com/")._pool_maxsize, 64)
+
+    def test_invalid_url(self):
+        """
+        测试无效 URL
+        """
+        with self.assertRaises(ValueError):
+            http_client.get_session("hslt/list")
+
+
+if __name__ == "__main__":
+    unittest.main()
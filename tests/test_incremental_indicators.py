@@ -0,0 +1,156 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from src.analyzer.indicators import compute_indicators
+from src.analyzer.incremental_indicators import IncrementalIndicators, IndicatorBook, RollingMean
+from tests.bar_fixtures import bar_records, random_walk_bars
+
+
+class TestIncrementalIndicators(unittest.TestCase):
+    def setUp(self):
+        self.columns = random_walk_bars(300, seed=1)
+        self.expected = compute_indicators(self.columns)
+
+    def assertMatches(self, actual, index):
+        self.assertEqual(set(actual), set(self.expected))
+        for name, value in actual.items():
+            np.testing.assert_allclose(value, self.expected[name][index], rtol=1e-9, atol=1e-9,
+                                       equal_nan=True, err_msg=f"{name}[{index}]")
+
+    def test_update_matches_vectorized_engine(self):
+        """
+        测试逐根更新的结果与向量化引擎每个位置的值一致
+        """
+        state = IncrementalIndicators()
+        for index, bar in enumerate(bar_records(self.columns)):
+            self.assertMatches(state.update(bar), index)
+        self.assertEqual(state.count, len(self.columns["c"]))
+
+    def test_seed_then_update(self):
+        """
+        测试用历史列数据初始化后继续增量更新
+        """
+        state = IncrementalIndicators()
+        seeded = state.seed({name: values[:250] for name, values in self.columns.items()})
+        self.assertMatches(seeded, 249)
+        for index, bar in enumerate(bar_records(self.columns, 250), start=250):
+            self.assertMatches(state.update(bar), index)
+
+    def test_peek_does_not_change_state(self):
+        """
+        测试盘中 peek 与收盘 update 结果一致，且 peek 不改变状态
+        """
+        state = IncrementalIndicators()
+        state.seed(bar_records(self.columns, 0, 299))
+        bar = bar_records(self.columns, 299)[0]
+        tick = dict(bar, c=bar["c"] + 5.0)
+        state.peek(tick)
+        state.peek(tick)
+        self.assertMatches(state.peek(bar), 299)
+        self.assertMatches(state.update(bar), 299)
+
+    def test_missing_close(self):
+        """
+        测试中间缺失的收盘价与向量化引擎口径一致，缺失之后的指标恢复为有效值
+        """
+        columns = {name: values.copy() for name, values in self.columns.items()}
+        columns["c"][[40, 120, 121]] = np.nan
+        expected = compute_indicators(columns)
+        state = IncrementalIndicators()
+        for index, bar in enumerate(bar_records(columns)):
+            result = state.update(bar)
+            for name, value in result.items():
+                np.testing.assert_allclose(value, expected[name][index], rtol=1e-9, atol=1e-9,
+                                           equal_nan=True, err_msg=f"{name}[{index}]")
+        self.assertTrue(all(np.isfinite(value) for value in result.values()))
+
+    def test_close_only_bars(self):
+        """
+        测试只有收盘价时不输出 KDJ/ATR/OBV/VWAP
+        """
+        state = IncrementalIndicators(ma_windows=(5,))
+        result = state.seed([{"close": value} for value in self.columns["c"][:30]])
+        expected = compute_indicators({"close": self.columns["c"][:30]}, last=True, ma_windows=(5,))
+        self.assertEqual(set(result), set(expected))
+        self.assertAlmostEqual(result["MA5"], expected["MA5"])
+
+    def test_rolling_mean_resum(self):
+        """
+        测试长序列下均线窗口和不会累积误差
+        """
+        mean = RollingMean(5)
+        values = np.linspace(1e6, 1e6 + 1, 5000)
+        for value in values:
+            result = mean.update(float(value))
+        self.assertAlmostEqual(result, values[-5:].mean(), places=6)
+
+    def test_snapshot_restore(self):
+        """
+        测试快照经 JSON 序列化恢复后继续更新结果不变
+        """
+        state = IncrementalIndicators()
+        state.seed(bar_records(self.columns, 0, 200))
+        restored = IncrementalIndicators.restore(json.loads(json.dumps(state.snapshot())))
+        self.assertEqual(restored.count, 200)
+        for index, bar in enumerate(bar_records(self.columns, 200), start=200):
+            self.assertMatches(restored.update(bar), index)
+
+    def test_restore_rejects_other_version(self):
+        """
+        测试版本不匹配的快照抛出 ValueError
+        """
+        snapshot = IncrementalIndicators().snapshot()
+        snapshot["version"] = -1
+        with self.assertRaises(ValueError):
+            IncrementalIndicators.restore(snapshot)
+
+
+class TestIndicatorBook(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "states", "indicators.json")
+        self.columns = random_walk_bars(300, seed=1)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_save_and_load(self):
+        """
+        测试多只股票的状态保存到文件并恢复
+        """
+        book = IndicatorBook()
+        book.seed("000001", bar_records(self.columns, 0, 100))
+        book.update("600000", {"c": 10.0})
+        book.save(self.path)
+
+        loaded = IndicatorBook.load(self.path)
+        self.assertIn("000001", loaded)
+        self.assertIn("600000", loaded)
+        bar = bar_records(self.columns, 100, 101)[0]
+        self.assertEqual(loaded.update("000001", bar), book.update("000001", bar))
+
+    def test_load_missing_or_mismatched(self):
+        """
+        测试文件不存在时返回空集合，均线周期变化时跳过旧状态
+        """
+        self.assertNotIn("000001", IndicatorBook.load(self.path))
+        book = IndicatorBook()
+        book.seed("000001", bar_records(self.columns, 0, 50))
+        book.save(self.path)
+        self.assertNotIn("000001", IndicatorBook.load(self.path, ma_windows=(5, 60)))
+
+
+if __name__ == "__main__":
+    unittest.main()
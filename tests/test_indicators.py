@@ -0,0 +1,189 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from src.analyzer import indicators
+from tests.bar_fixtures import random_walk_bars
+
+
+class TestIndicatorsAgainstPandas(unittest.TestCase):
+    def setUp(self):
+        bars = random_walk_bars()
+        self.close, self.high, self.low, self.volume = bars["c"], bars["h"], bars["l"], bars["v"]
+        self.series = pd.Series(self.close)
+
+    def assertSeriesEqual(self, actual, expected):
+        np.testing.assert_allclose(actual, np.asarray(expected, dtype=float), rtol=1e-9, atol=1e-9, equal_nan=True)
+
+    def test_moving_averages(self):
+        """
+        测试 MA / EMA / 标准差与 pandas 一致
+        """
+        self.assertSeriesEqual(indicators.sma(self.close, 20), self.series.rolling(20).mean())
+        self.assertSeriesEqual(indicators.ema(self.close, 26), self.series.ewm(span=26, adjust=False).mean())
+        self.assertSeriesEqual(indicators.rolling_std(self.close, 20), self.series.rolling(20).std())
+
+    def test_macd(self):
+        """
+        测试 MACD 与原 pandas 实现一致
+        """
+        result = indicators.macd(self.close)
+        dif = self.series.ewm(span=12, adjust=False).mean() - self.series.ewm(span=26, adjust=False).mean()
+        dea = dif.ewm(span=9, adjust=False).mean()
+        self.assertSeriesEqual(result["dif"], dif)
+        self.assertSeriesEqual(result["dea"], dea)
+        self.assertSeriesEqual(result["histogram"], dif - dea)
+
+    def test_kdj(self):
+        """
+        测试 KDJ(9,3,3) 与 pandas 写法一致
+        """
+        lowest = pd.Series(self.low).rolling(9, min_periods=1).min()
+        highest = pd.Series(self.high).rolling(9, min_periods=1).max()
+        rsv = (self.series - lowest) / (highest - lowest) * 100
+        k = pd.concat([pd.Series([50.0]), rsv]).ewm(alpha=1 / 3, adjust=False).mean()[1:].reset_index(drop=True)
+        d = pd.concat([pd.Series([50.0]), k]).ewm(alpha=1 / 3, adjust=False).mean()[1:].reset_index(drop=True)
+        result = indicators.kdj(self.high, self.low, self.close)
+        self.assertSeriesEqual(result["k"], k)
+        self.assertSeriesEqual(result["d"], d)
+        self.assertSeriesEqual(result["j"], 3 * k - 2 * d)
+
+    def test_rsi_atr_obv_vwap(self):
+        """
+        测试 RSI / ATR / OBV / VWAP 与 pandas 写法一致
+        """
+        delta = self.series.diff()
+        gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+        loss = (-delta).clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+        self.assertSeriesEqual(indicators.rsi(self.close), 100 * gain / (gain + loss))
+
+        previous = self.series.shift(1).fillna(self.series.iloc[0])
+        tr = pd.concat([
+            pd.Series(self.high - self.low),
+            (pd.Series(self.high) - previous).abs(),
+            (pd.Series(self.low) - previous).abs(),
+        ], axis=1).max(axis=1)
+        self.assertSeriesEqual(indicators.atr(self.high, self.low, self.close), tr.ewm(alpha=1 / 14, adjust=False).mean())
+
+        direction = np.sign(self.series.diff().fillna(0))
+        self.assertSeriesEqual(indicators.obv(self.close, self.volume), (direction * self.volume).cumsum())
+
+        typical = (self.high + self.low + self.close) / 3
+        expected_vwap = (pd.Series(typical * self.volume).cumsum() / pd.Series(self.volume).cumsum())
+        self.assertSeriesEqual(indicators.vwap(self.high, self.low, self.close, self.volume), expected_vwap)
+
+    def test_boll(self):
+        """
+        测试布林带
+        """
+        result = indicators.boll(self.close)
+        mid = self.series.rolling(20).mean()
+        std = self.series.rolling(20).std()
+        self.assertSeriesEqual(result["upper"], mid + 2 * std)
+        self.assertSeriesEqual(result["lower"], mid - 2 * std)
+
+    def test_missing_values(self):
+        """
+        测试序列中间缺失时与 pandas ewm(adjust=False) 一致：缺失处沿用上一个值，之后恢复递推
+        """
+        close = self.close.copy()
+        close[[40, 300, 301]] = np.nan
+        series = pd.Series(close)
+        self.assertSeriesEqual(indicators.ewm(close, 0.3), series.ewm(alpha=0.3, adjust=False).mean())
+        result = indicators.macd(close)
+        dif = series.ewm(span=12, adjust=False).mean() - series.ewm(span=26, adjust=False).mean()
+        self.assertSeriesEqual(result["dif"], dif)
+        self.assertSeriesEqual(result["dea"], dif.ewm(span=9, adjust=False).mean())
+        delta = series.diff()
+        gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+        loss = (-delta).clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+        self.assertSeriesEqual(indicators.rsi(close), 100 * gain / (gain + loss))
+
+        lowest = pd.Series(self.low).rolling(9, min_periods=1).min()
+        highest = pd.Series(self.high).rolling(9, min_periods=1).max()
+        rsv = (series - lowest) / (highest - lowest) * 100
+        k = pd.concat([pd.Series([50.0]), rsv]).ewm(alpha=1 / 3, adjust=False).mean()[1:].reset_index(drop=True)
+        self.assertSeriesEqual(indicators.kdj(self.high, self.low, close)["k"], k)
+
+        # 二维输入中只有部分行有缺失
+        matrix = np.stack([self.close, close])
+        self.assertSeriesEqual(indicators.ema(matrix, 26)[1], series.ewm(span=26, adjust=False).mean())
+        self.assertSeriesEqual(indicators.ema(matrix, 26)[0], self.series.ewm(span=26, adjust=False).mean())
+
+    def test_matrix_input(self):
+        """
+        测试二维输入按行独立计算
+        """
+        matrix = np.stack([self.close, self.close * 2])
+        self.assertSeriesEqual(indicators.ema(matrix, 12)[1], indicators.ema(self.close * 2, 12))
+        self.assertSeriesEqual(indicators.kdj(matrix, matrix, matrix)["k"][0], indicators.kdj(self.close, self.close, self.close)["k"])
+
+    def test_compute_indicators_last(self):
+        """
+        测试只返回最后值，并根据可用列决定指标
+        """
+        latest = indicators.compute_indicators({"c": self.close}, last=True)
+        self.assertIn("MACD", latest)
+        self.assertNotIn("K", latest)
+        self.assertIsInstance(latest["MA5"], float)
+        full = indicators.compute_indicators(
+            {"close": self.close, "high": self.high, "low": self.low, "volume": self.volume}
+        )
+        self.assertEqual(full["K"].shape, self.close.shape)
+        self.assertIn("VWAP", full)
+        with self.assertRaises(KeyError):
+            indicators.compute_indicators({"open": self.close})
+
+
+class TestRaggedMatrix(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.shape = (5, 80)
+        self.close = 100 + np.cumsum(rng.normal(0, 1, self.shape), axis=1)
+        self.high = self.close + rng.random(self.shape)
+        self.low = self.close - rng.random(self.shape)
+        self.volume = rng.integers(100, 10000, self.shape).astype(float)
+        self.mask = np.ones(self.shape, dtype=bool)
+        self.mask[1, :30] = False      # 上市较晚
+        self.mask[2, 40:45] = False    # 停牌
+        self.mask[3, :79] = False      # 只有一根 K 线
+        self.mask[4] = False           # 没有数据
+
+    def test_align_right(self):
+        """
+        测试有效数据靠右对齐并压缩中间缺口
+        """
+        aligned, counts = indicators.align_right({"c": self.close}, self.mask)
+        self.assertEqual(counts.tolist(), [80, 50, 75, 1, 0])
+        np.testing.assert_array_equal(aligned["c"][2, 5:], self.close[2][self.mask[2]])
+        self.assertTrue(np.isnan(aligned["c"][2, :5]).all())
+        self.assertTrue(np.isnan(aligned["c"][4]).all())
+
+    def test_rows_match_single_symbol(self):
+        """
+        测试靠右对齐后逐行结果与单只股票单独计算完全一致
+        """
+        columns = {"c": self.close, "h": self.high, "l": self.low, "v": self.volume}
+        aligned, counts = indicators.align_right(columns, self.mask)
+        batch = indicators.compute_indicators(aligned)
+        for row in range(4):
+            single = indicators.compute_indicators({name: values[row][self.mask[row]] for name, values in columns.items()})
+            for name, values in single.items():
+                np.testing.assert_allclose(batch[name][row, -counts[row]:], values, rtol=1e-9, atol=1e-9,
+                                           equal_nan=True, err_msg=f"{name} row {row}")
+                self.assertTrue(np.isnan(batch[name][row, :-counts[row]]).all())
+        latest = indicators.compute_indicators(aligned, last=True)
+        self.assertTrue(all(np.isnan(values[4]) for values in latest.values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
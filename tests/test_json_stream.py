@@ -0,0 +1,77 @@
+import json
+import os
+import sys
+import unittest
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from src.utils.json_stream import iter_column_chunks, iter_json_array
+
+
+def split_bytes(text, size):
+    data = text.encode("utf-8")
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TestJsonStream(unittest.TestCase):
+    def test_matches_json_loads_for_any_chunking(self):
+        """
+        测试任意分块方式下解析结果与 json.loads 一致
+        """
+        documents = [
+            "[]",
+            '[{"t": "09:30:00", "p": 10.5, "v": 100, "bs": "买"}, {"t": "09:30:03", "p": 10.51}]',
+            ' [ 1, -2.5e3 , "a,]" , null, true, [1, [2]] ] ',
+            "[12345]",
+        ]
+        for document in documents:
+            for size in (1, 2, 3, 5, 64):
+                with self.subTest(document=document, size=size):
+                    self.assertEqual(list(iter_json_array(split_bytes(document, size))), json.loads(document))
+
+    def test_yields_before_stream_ends(self):
+        """
+        测试数组元素在读完整个响应之前即被产出
+        """
+        received = []
+
+        def chunks():
+            yield b'[{"a": 1},'
+            received.append("second chunk requested")
+            yield b'{"a": 2}]'
+
+        rows = iter_json_array(chunks())
+        self.assertEqual(next(rows), {"a": 1})
+        self.assertEqual(received, [])
+        self.assertEqual(list(rows), [{"a": 2}])
+
+    def test_non_array_document(self):
+        """
+        测试顶层不是数组时整体产出
+        """
+        self.assertEqual(list(iter_json_array(split_bytes('{"error": "无效授权"}', 4))), [{"error": "无效授权"}])
+
+    def test_malformed(self):
+        """
+        测试不完整或格式错误的数据
+        """
+        for document in ("[1, 2", "[1 2]", '[{"a": 1}', "[1]x"):
+            with self.subTest(document=document):
+                with self.assertRaises(ValueError):
+                    list(iter_json_array(split_bytes(document, 2)))
+
+    def test_column_chunks(self):
+        """
+        测试按固定行数打包为列式块
+        """
+        rows = [{"p": 1, "v": 10}, {"p": 2}, {"p": 3, "v": 30}]
+        chunks = list(iter_column_chunks(rows, 2))
+        self.assertEqual(chunks, [{"p": [1, 2], "v": [10, None]}, {"p": [3], "v": [30]}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+import unittest
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from src.data_fetcher.parallel_fetch import fetch_concurrently
+
+
+class TestFetchConcurrently(unittest.TestCase):
+    def test_order_and_concurrency(self):
+        """
+        测试并发执行且结果顺序与任务顺序一致
+        """
+        tasks = {
+            "slow": lambda: time.sleep(0.2) or "a",
+            "fast": lambda: "b",
+            "medium": lambda: time.sleep(0.1) or "c",
+        }
+        start = time.monotonic()
+        results = fetch_concurrently(tasks)
+        self.assertLess(time.monotonic() - start, 0.3)
+        self.assertEqual(list(results.items()), [("slow", "a"), ("fast", "b"), ("medium", "c")])
+
+    def test_failure_and_timeout_use_default(self):
+        """
+        测试失败与超过整批时限的任务返回默认值
+        """
+        def fail():
+            raise RuntimeError("boom")
+
+        tasks = {
+            "ok": lambda: {"p": 1},
+            "error": fail,
+            "hang": lambda: time.sleep(1) or {"p": 2},
+        }
+        start = time.monotonic()
+        results = fetch_concurrently(tasks, max_workers=3, deadline=0.2, default=dict)
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(results, {"ok": {"p": 1}, "error": {}, "hang": {}})
+
+    def test_max_workers(self):
+        """
+        测试并发数上限
+        """
+        tasks = {i: (lambda: time.sleep(0.1)) for i in range(4)}
+        start = time.monotonic()
+        fetch_concurrently(tasks, max_workers=2)
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+
+    def test_queued_tasks_not_timed_from_submission(self):
+        """
+        测试排队等待线程的任务不计入超时：未设整批时限时全部完成
+        """
+        tasks = {i: (lambda i=i: time.sleep(0.1) or i) for i in range(3)}
+        results = fetch_concurrently(tasks, max_workers=1, default=dict)
+        self.assertEqual(results, {0: 0, 1: 1, 2: 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from src.utils.rate_limiter import RateLimiter, RateLimitExceeded, TokenBucket, endpoint_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_queue(self):
+        """
+        测试桶内令牌用完后按速率排队，而不是失败
+        """
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, capacity=2, clock=clock)
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertAlmostEqual(bucket.reserve(), 0.5)
+        self.assertAlmostEqual(bucket.reserve(), 1.0)
+        clock.now = 1.0
+        self.assertAlmostEqual(bucket.reserve(), 0.5)
+        self.assertEqual(bucket.stats["granted"], 5)
+        self.assertEqual(bucket.stats["waited"], 3)
+
+    def test_penalize_blocks_tokens(self):
+        """
+        测试收到限流后暂停发放令牌
+        """
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, capacity=5, clock=clock)
+        bucket.penalize(3)
+        self.assertAlmostEqual(bucket.reserve(), 3.0)
+        self.assertEqual(bucket.stats["throttled"], 1)
+
+    def test_daily_quota(self):
+        """
+        测试超出每日配额时抛出异常
+        """
+        bucket = TokenBucket(rate=100, capacity=100, daily_quota=2)
+        bucket.reserve()
+        bucket.reserve()
+        with self.assertRaises(RateLimitExceeded):
+            bucket.reserve()
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_shared_rate_across_threads(self):
+        """
+        测试多线程共享同一限流器时总速率受限
+        """
+        limiter = RateLimiter({"requests_per_minute": 1200, "burst": 2})
+        threads = [threading.Thread(target=limiter.acquire, args=("ep",)) for _ in range(6)]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # 20 次/秒，容量 2：后 4 次请求至少需要 0.2 秒
+        self.assertGreaterEqual(time.monotonic() - started, 0.18)
+        self.assertEqual(limiter.quota_report()["byapi"]["granted"], 6)
+
+    def test_endpoint_bucket(self):
+        """
+        测试按接口单独配置的令牌桶
+        """
+        limiter = RateLimiter({"endpoints": {"slow": {"requests_per_minute": 60, "burst": 1}}})
+        self.assertIsNotNone(limiter.get_bucket("slow"))
+        self.assertIsNone(limiter.get_bucket("other"))
+        limiter.acquire("slow")
+        self.assertIn("slow", limiter.quota_report())
+
+    def test_retry_on_429(self):
+        """
+        测试收到 429 后退避并重试
+        """
+        limiter = RateLimiter({"requests_per_minute": 6000, "burst": 10, "max_retries": 1})
+        throttled = MagicMock(status_code=429, headers={"Retry-After": "0.1"})
+        ok = MagicMock(status_code=200)
+        func = MagicMock(side_effect=[throttled, ok])
+        started = time.monotonic()
+        self.assertIs(limiter.call("ep", func, "url"), ok)
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+        self.assertEqual(func.call_count, 2)
+        self.assertEqual(limiter.quota_report()["byapi"]["throttled"], 1)
+        throttled.close.assert_called_once()
+        ok.close.assert_not_called()
+
+    def test_endpoint_quota_does_not_consume_licence_token(self):
+        """
+        测试接口桶配额用完时不消耗许可证总桶的令牌
+        """
+        limiter = RateLimiter({"burst": 5, "endpoints": {"ep": {"requests_per_minute": 60, "daily_quota": 1}}})
+        limiter.acquire("ep")
+        with self.assertRaises(RateLimitExceeded):
+            limiter.acquire("ep")
+        report = limiter.quota_report()
+        self.assertEqual(report["byapi"]["granted"], 1)
+        self.assertEqual(report["byapi"]["used_today"], 1)
+        self.assertEqual(report["ep"]["used_today"], 1)
+
+
+class TestEndpointKey(unittest.TestCase):
+    def test_api_key_combined_passes_through(self):
+        self.assertEqual(endpoint_key("hsmy_lscj"), "hsmy_lscj")
+        self.assertIsNone(endpoint_key(None))
+
+    @patch("src.data_fetcher.by_api_manager.get_api_manager")
+    def test_path_resolved_through_dictionary(self, mock_manager):
+        """
+        测试 URL 路径经数据字典转换为接口主键，与 fetch_api_data 使用的键一致
+        """
+        mock_manager.return_value.find_endpoint.side_effect = (
+            lambda path: MagicMock(key="lssj_historical_intraday_trading") if path == "hszbl/fsjy" else None
+        )
+        self.assertEqual(endpoint_key("/hszbl/fsjy/"), "lssj_historical_intraday_trading")
+        self.assertEqual(endpoint_key("hsrl/ssjy"), "hsrl_ssjy")
+
+        limiter = RateLimiter({"endpoints": {"hszbl/fsjy": {"requests_per_minute": 60}}})
+        self.assertIsNotNone(limiter.get_bucket("lssj_historical_intraday_trading"))
+
+    @patch("src.data_fetcher.by_api_manager.get_api_manager", side_effect=FileNotFoundError("missing"))
+    def test_path_fallback_without_dictionary(self, _):
+        self.assertEqual(endpoint_key("hsmy/lscj"), "hsmy_lscj")
+
+
+if __name__ == "__main__":
+    unittest.main()
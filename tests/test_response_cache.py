@@ -0,0 +1,147 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from src.data_fetcher.response_cache import MISS, ResponseCache
+from src.utils.trading_calendar import TradingCalendar
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        # 2024-11-29 为周五
+        self.clock = FakeClock(datetime(2024, 11, 29, 10, 0))
+        self.calendar = TradingCalendar(["2024-12-02"])
+        self.cache = ResponseCache(
+            self.root, ttls={"lssj_historical_intraday_kdj": 60}, clock=self.clock, calendar=self.calendar
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_ttl_rules(self):
+        """
+        测试完整主键优先，其次按最长前缀匹配
+        """
+        self.assertEqual(self.cache.ttl_for("lssj_historical_intraday_kdj"), 60)
+        self.assertEqual(self.cache.ttl_for("lssj_historical_intraday_macd"), 300)
+        self.assertEqual(self.cache.ttl_for("ssjy_intraday_transactions"), 0)
+        self.assertEqual(self.cache.ttl_for("rzrq_margin"), 0)
+
+    def test_ttl_follows_period(self):
+        """
+        测试带周期参数的请求按 K 线周期缓存：分钟线一根 K 线的时长，日线到当前交易时段结束
+        """
+        self.assertEqual(self.cache.ttl_for("lssj_historical_intraday_macd", "1m"), 60)
+        self.assertEqual(self.cache.ttl_for("lssj_historical_intraday_macd", "30m"), 1800)
+        self.assertEqual(self.cache.ttl_for("lssj_historical_intraday_macd", "unknown"), 300)
+        self.assertEqual(self.cache.ttl_for("ssjy_intraday_transactions", "5m"), 0)
+        # 完整主键的配置优先于周期
+        self.assertEqual(self.cache.ttl_for("lssj_historical_intraday_kdj", "dn"), 60)
+
+        expiry = self.cache.expires_at("lssj_historical_intraday_macd", period="dn")
+        self.assertEqual(datetime.fromtimestamp(expiry), datetime(2024, 11, 29, 11, 30))
+        expiry = self.cache.expires_at("lssj_historical_intraday_macd", period="1m")
+        self.assertEqual(datetime.fromtimestamp(expiry), datetime(2024, 11, 29, 10, 1))
+
+    def test_hit_miss_and_expiry_during_session(self):
+        """
+        测试盘中按 TTL 过期，并统计命中率
+        """
+        key = self.cache.make_key("http://x/kdj", {})
+        self.assertIs(self.cache.get("lssj_historical_intraday_kdj", key), MISS)
+        self.assertTrue(self.cache.put("lssj_historical_intraday_kdj", key, [{"k": 1}]))
+        self.assertEqual(self.cache.get("lssj_historical_intraday_kdj", key), [{"k": 1}])
+        self.clock.now = datetime(2024, 11, 29, 10, 1, 1)
+        self.assertIs(self.cache.get("lssj_historical_intraday_kdj", key), MISS)
+        self.assertEqual(self.cache.stats["hits"], 1)
+        self.assertEqual(self.cache.stats["misses"], 2)
+        self.assertAlmostEqual(self.cache.hit_rate(), 1 / 3)
+
+    def test_closed_market_caches_until_next_open(self):
+        """
+        测试休市期间缓存到下一次开盘
+        """
+        self.clock.now = datetime(2024, 11, 29, 16, 0)
+        expiry = self.cache.expires_at("lssj_historical_intraday_kdj")
+        # 周末及 12 月 2 日休市，缓存到 12 月 3 日开盘
+        self.assertEqual(datetime.fromtimestamp(expiry), datetime(2024, 12, 3, 9, 30))
+        self.clock.now = datetime(2024, 11, 29, 12, 0)
+        expiry = self.cache.expires_at("lssj_historical_intraday_kdj")
+        self.assertEqual(datetime.fromtimestamp(expiry), datetime(2024, 11, 29, 13, 0))
+
+    def test_expiry_capped_at_session_end(self):
+        """
+        测试盘中缓存不跨越当前交易时段
+        """
+        self.clock.now = datetime(2024, 11, 29, 11, 28)
+        expiry = self.cache.expires_at("lssj_historical_intraday_macd")
+        self.assertEqual(datetime.fromtimestamp(expiry), datetime(2024, 11, 29, 11, 30))
+
+    def test_uncached_endpoint(self):
+        """
+        测试 TTL 为 0 的接口不缓存
+        """
+        key = self.cache.make_key("http://x/ssjy", {})
+        self.assertFalse(self.cache.put("ssjy_intraday_transactions", key, [1]))
+        self.assertIs(self.cache.get("ssjy_intraday_transactions", key), MISS)
+
+    def test_disk_persistence_and_copy(self):
+        """
+        测试磁盘持久化，且调用方修改返回值不影响缓存
+        """
+        key = self.cache.make_key("http://x/macd", {"a": 1})
+        self.cache.put("lssj_historical_intraday_macd", key, [{"macd": 1.0}])
+        result = self.cache.get("lssj_historical_intraday_macd", key)
+        result[0]["macd"] = 99
+        self.assertEqual(self.cache.get("lssj_historical_intraday_macd", key), [{"macd": 1.0}])
+
+        other = ResponseCache(self.root, clock=self.clock, calendar=self.calendar)
+        self.assertEqual(other.get("lssj_historical_intraday_macd", key), [{"macd": 1.0}])
+        self.assertEqual(other.stats["disk_hits"], 1)
+        self.assertNotEqual(key, self.cache.make_key("http://x/macd", {"a": 2}))
+
+
+    def test_expired_files_removed(self):
+        """
+        测试过期的磁盘缓存在读取时删除，定期清理删除其余过期文件，clear 同时清空磁盘
+        """
+        keys = [self.cache.make_key("http://x/macd", {"a": index}) for index in range(3)]
+        for key in keys:
+            self.cache.put("lssj_historical_intraday_macd", key, [1], period="1m")
+        directory = os.path.join(self.root, "lssj_historical_intraday_macd")
+        self.assertEqual(len(os.listdir(directory)), 3)
+
+        self.clock.now = datetime(2024, 11, 29, 10, 2)
+        other = ResponseCache(self.root, clock=self.clock, calendar=self.calendar)
+        self.assertIs(other.get("lssj_historical_intraday_macd", keys[0]), MISS)
+        self.assertEqual(len(os.listdir(directory)), 2)
+        fresh = self.cache.make_key("http://x/macd", {"a": "fresh"})
+        other.put("lssj_historical_intraday_macd", fresh, [2])
+        self.assertEqual(os.listdir(directory), [f"{fresh}.json"])
+        self.assertEqual(other.stats["pruned"], 2)
+
+        other.clear()
+        self.assertEqual(os.listdir(directory), [])
+        self.assertIs(other.get("lssj_historical_intraday_macd", fresh), MISS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from src.analyzer.screener import DEFAULT_SCREENER_CONFIG, Screener, format_shortlist, screen_universe
+from src.storage.bar_reader import BarReader
+from src.storage.bar_store import BarStore
+
+
+def make_universe(length=60):
+    """
+    a: 持续下跌后最后一根大涨并放量（MACD 金叉 + 放量）
+    b: 持续下跌（KDJ 超卖）
+    c: 横盘，不满足任何条件
+    d: 只有 10 根 K 线（历史不足，不参与筛选）
+    """
+    decline = 50 - 0.3 * np.arange(length)
+    rising = decline.copy()
+    rising[-1] = rising[-2] + 3
+    short = np.full(length, np.nan)
+    short[-10:] = 20.0
+    close = np.vstack([rising, decline, np.full(length, 30.0), short])
+    volume = np.full(close.shape, 1000.0)
+    volume[0, -1] = 5000.0
+    volume[3, -1] = 9000.0
+    return ["a", "b", "c", "d"], {"close": close, "high": close + 0.5, "low": close - 0.5, "volume": volume}
+
+
+class TestScreener(unittest.TestCase):
+    def setUp(self):
+        self.symbols, self.columns = make_universe()
+        self.conditions = [
+            {"type": "macd_cross", "direction": "golden", "within": 1},
+            {"type": "volume_spike", "window": 20, "ratio": 2.0},
+            {"type": "kdj_oversold", "line": "K", "threshold": 20},
+        ]
+
+    def test_evaluate_conditions(self):
+        """
+        测试各条件在全部股票上的向量化评估结果
+        """
+        evaluation = Screener(self.conditions).evaluate(self.symbols, self.columns)
+        self.assertEqual(evaluation["passed"]["macd_cross"].tolist(), [True, False, False, False])
+        self.assertEqual(evaluation["passed"]["volume_spike"].tolist(), [True, False, False, False])
+        self.assertEqual(evaluation["passed"]["kdj_oversold"].tolist(), [False, True, False, False])
+        self.assertEqual(evaluation["matches"].tolist(), [2, 1, 0, 0])
+
+    def test_screen_ranks_by_matches_then_score(self):
+        """
+        测试按满足条件数和得分排序，并受 match / top_n 约束
+        """
+        shortlist = Screener(self.conditions, match="any").screen(self.symbols, self.columns)
+        self.assertEqual([item["symbol"] for item in shortlist], ["a", "b"])
+        self.assertEqual(shortlist[0]["matched"], ["macd_cross", "volume_spike"])
+        self.assertGreater(shortlist[0]["score"], shortlist[1]["score"])
+        self.assertIn("MACD", shortlist[0]["indicators"])
+
+        self.assertEqual([item["symbol"] for item in Screener(self.conditions, match=2).screen(self.symbols, self.columns)], ["a"])
+        self.assertEqual(Screener(self.conditions, match="all").screen(self.symbols, self.columns), [])
+        self.assertEqual(len(Screener(self.conditions, match="any", top_n=1).screen(self.symbols, self.columns)), 1)
+
+    def test_compare_condition(self):
+        """
+        测试通用比较条件与自定义展示名
+        """
+        screener = Screener([{"type": "compare", "left": "close", "op": "<", "right": "MA20", "name": "below_ma20"}], min_bars=20)
+        shortlist = screener.screen(self.symbols, self.columns)
+        self.assertEqual([item["symbol"] for item in shortlist], ["b"])
+        self.assertEqual(shortlist[0]["matched"], ["below_ma20"])
+        self.assertEqual(len(Screener([{"type": "compare", "left": "RSI14", "op": ">=", "right": 0}]).screen(self.symbols, self.columns)), 3)
+
+    def test_invalid_config(self):
+        """
+        测试未知条件类型、空条件和运算符错误
+        """
+        with self.assertRaises(ValueError):
+            Screener([{"type": "unknown"}])
+        with self.assertRaises(ValueError):
+            Screener([])
+        with self.assertRaises(ValueError):
+            Screener([{"type": "compare", "left": "close", "op": "==", "right": 1}]).screen(self.symbols, self.columns)
+
+    def test_format_shortlist(self):
+        """
+        测试候选清单文本格式
+        """
+        shortlist = Screener(self.conditions, match="any").screen(self.symbols, self.columns)
+        lines = format_shortlist(shortlist).splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].startswith("1. a "))
+        self.assertIn("macd_cross/volume_spike", lines[0])
+
+
+class TestScreenUniverse(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.store = BarStore(self.root)
+        symbols, columns = make_universe()
+        dates = np.datetime64("2024-01-01") + np.arange(columns["close"].shape[1])
+        for row, symbol in enumerate(symbols):
+            self.store.append(symbol, [
+                {"d": str(day), "o": close, "h": close + 0.5, "l": close - 0.5, "c": close, "v": volume}
+                for day, close, volume in zip(dates, columns["close"][row], columns["volume"][row])
+                if not np.isnan(close)
+            ])
+        self.reader = BarReader(self.store)
+
+    def tearDown(self):
+        self.reader.close()
+        shutil.rmtree(self.root)
+
+    def test_screen_from_bar_store(self):
+        """
+        测试从本地 K 线存储读取全市场数据并筛选
+        """
+        config = dict(DEFAULT_SCREENER_CONFIG, match="any", conditions=[
+            {"type": "macd_cross", "direction": "golden", "within": 1},
+            {"type": "volume_spike", "window": 20, "ratio": 2.0},
+        ])
+        shortlist = screen_universe(reader=self.reader, config=config)
+        self.assertEqual([item["symbol"] for item in shortlist], ["a"])
+
+    @unittest.skipIf(resource is None, "需要 resource 模块")
+    def test_screen_more_symbols_than_file_limit(self):
+        """
+        测试筛选的股票数多于进程可打开的文件数时不会耗尽文件描述符
+        """
+        _, columns = make_universe()
+        dates = np.datetime64("2024-01-01") + np.arange(columns["close"].shape[1])
+        extra = [
+            {"d": str(day), "o": 30.0, "h": 30.5, "l": 29.5, "c": 30.0, "v": 1000}
+            for day in dates
+        ]
+        for index in range(150):
+            self.store.append(f"x{index:03d}", extra)
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(128, hard), hard))
+        self.addCleanup(resource.setrlimit, resource.RLIMIT_NOFILE, (soft, hard))
+
+        config = dict(DEFAULT_SCREENER_CONFIG, match="any", conditions=[
+            {"type": "macd_cross", "direction": "golden", "within": 1},
+            {"type": "volume_spike", "window": 20, "ratio": 2.0},
+        ])
+        shortlist = screen_universe(reader=self.reader, config=config)
+        self.assertEqual([item["symbol"] for item in shortlist], ["a"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from config.settings import SettingsService, get_settings_service
+
+
+class TestSettingsService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.temp_dir, "settings.json")
+        self.write_config({"byapi": {"api_key": "key-1"}})
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write_config(self, config, mtime=None):
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            json.dump(config, f)
+        if mtime is not None:
+            os.utime(self.config_path, (mtime, mtime))
+
+    def test_parse_once(self):
+        """
+        测试文件未变化时只解析一次
+        """
+        service = SettingsService(self.config_path)
+        with patch("config.settings.json.load", wraps=json.load) as mock_load:
+            for _ in range(10):
+                self.assertEqual(service.get("byapi")["api_key"], "key-1")
+        self.assertEqual(mock_load.call_count, 1)
+        self.assertEqual(service.version, 1)
+
+    def test_reload_on_mtime_change(self):
+        """
+        测试文件修改后重新加载
+        """
+        service = SettingsService(self.config_path)
+        self.assertEqual(service.get("byapi")["api_key"], "key-1")
+        self.write_config({"byapi": {"api_key": "key-2"}}, mtime=os.path.getmtime(self.config_path) + 10)
+        self.assertEqual(service.get("byapi")["api_key"], "key-2")
+        self.assertEqual(service.version, 2)
+
+    def test_keep_previous_config_on_invalid_json(self):
+        """
+        测试文件写入一半时沿用旧配置
+        """
+        service = SettingsService(self.config_path)
+        service.get_settings()
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            f.write('{"byapi": ')
+        os.utime(self.config_path, (0, 0))
+        self.assertEqual(service.get("byapi")["api_key"], "key-1")
+
+    def test_invalid_json_parsed_once(self):
+        """
+        测试同一个损坏版本只解析并记录一次警告，修复后重新加载
+        """
+        service = SettingsService(self.config_path)
+        service.get_settings()
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            f.write('{"byapi": ')
+        os.utime(self.config_path, (0, 0))
+        with patch("config.settings.json.load", wraps=json.load) as mock_load, \
+                self.assertLogs(level="WARNING") as logs:
+            for _ in range(5):
+                self.assertEqual(service.get("byapi")["api_key"], "key-1")
+        self.assertEqual(mock_load.call_count, 1)
+        self.assertEqual(len(logs.records), 1)
+
+        self.write_config({"byapi": {"api_key": "key-2"}}, mtime=10)
+        self.assertEqual(service.get("byapi")["api_key"], "key-2")
+
+    def test_missing_file(self):
+        """
+        测试配置文件缺失
+        """
+        service = SettingsService(os.path.join(self.temp_dir, "missing.json"))
+        with self.assertRaises(FileNotFoundError):
+            service.get_settings()
+
+    def test_update_persists(self):
+        """
+        测试 update 写入文件且不触发重复解析
+        """
+        service = SettingsService(self.config_path)
+        service.update_shortcut("screenshot", "ctrl+shift+s")
+        with open(self.config_path, "r", encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["shortcuts"]["screenshot"], "ctrl+shift+s")
+        with patch("config.settings.json.load", wraps=json.load) as mock_load:
+            service.get_settings()
+        self.assertEqual(mock_load.call_count, 0)
+
+    def test_shared_instance(self):
+        """
+        测试同一路径共享同一个配置服务
+        """
+        self.assertIs(get_settings_service(self.config_path), get_settings_service(self.config_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from src.data_fetcher import symbol_master
+from src.data_fetcher.symbol_master import SymbolMaster, normalize_code
+
+STOCK_LIST = [
+    {"dm": "000001", "mc": "平安银行", "jys": "sz"},
+    {"dm": "600519", "mc": "贵州茅台", "jys": "sh"},
+    {"dm": "600036", "mc": "招商银行", "jys": "sh"},
+    {"dm": "300624.SZ", "mc": "万兴科技"},
+]
+
+
+class TestSymbolMaster(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.temp_dir, "stock_list.json")
+        self.calls = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def loader(self):
+        self.calls += 1
+        return STOCK_LIST
+
+    def test_normalize_code(self):
+        """
+        测试代码规范化
+        """
+        self.assertEqual(normalize_code("sh600519"), "600519")
+        self.assertEqual(normalize_code("600519.SH"), "600519")
+        self.assertEqual(normalize_code(" SZ000001 "), "000001")
+        self.assertIsNone(normalize_code("shenzhen"))
+        self.assertIsNone(normalize_code("60051"))
+
+    def test_lookup_by_code_prefix_and_name(self):
+        """
+        测试按代码、带前缀代码和名称查找
+        """
+        master = SymbolMaster(self.cache_path, loader=self.loader)
+        self.assertEqual(master.lookup("sz000001")["name"], "平安银行")
+        self.assertEqual(master.lookup("贵州茅台")["code"], "600519")
+        self.assertEqual(master.prefixed_code("300624"), "sz300624")
+        self.assertFalse(master.is_valid("999999"))
+        self.assertFalse(master.is_valid("不存在"))
+        self.assertEqual(self.calls, 1)
+
+    def test_search(self):
+        """
+        测试代码前缀、名称前缀和包含匹配
+        """
+        master = SymbolMaster(self.cache_path, loader=self.loader)
+        self.assertEqual([r["code"] for r in master.search("6005")], ["600519"])
+        self.assertEqual([r["code"] for r in master.search("sh600")], ["600036", "600519"])
+        self.assertEqual([r["code"] for r in master.search("贵州")], ["600519"])
+        self.assertEqual({r["code"] for r in master.search("银行")}, {"000001", "600036"})
+        if symbol_master.lazy_pinyin is not None:
+            self.assertEqual([r["code"] for r in master.search("gzmt")], ["600519"])
+
+    def test_search_limit_and_order(self):
+        """
+        测试代码前缀按代码顺序截取前 limit 个，包含匹配按名称顺序补充
+        """
+        items = [{"dm": f"600{index:03d}", "mc": f"测试{index:03d}银行"} for index in range(500, 0, -1)]
+        master = SymbolMaster(self.cache_path, loader=lambda: items)
+        self.assertEqual([r["code"] for r in master.search("6001", limit=3)], ["600100", "600101", "600102"])
+        self.assertEqual([r["code"] for r in master.search("600999")], [])
+        self.assertEqual([r["code"] for r in master.search("银行", limit=2)], ["600001", "600002"])
+        self.assertEqual([r["code"] for r in master.search("05银", limit=5)], ["600005", "600105", "600205", "600305", "600405"])
+        self.assertEqual(master.search("测试001银行行"), [])
+
+    def test_cache_ttl(self):
+        """
+        测试缓存有效期内不重复请求，过期后刷新，刷新失败时使用旧缓存
+        """
+        SymbolMaster(self.cache_path, loader=self.loader).refresh()
+        master = SymbolMaster(self.cache_path, loader=self.loader)
+        master.refresh()
+        self.assertEqual(self.calls, 1)
+
+        with open(self.cache_path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        payload["fetched_at"] = 0
+        with open(self.cache_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+
+        def failing_loader():
+            raise RuntimeError("network")
+
+        stale = SymbolMaster(self.cache_path, loader=failing_loader)
+        self.assertTrue(stale.is_valid("600519"))
+
+    def test_refresh_failure_backoff(self):
+        """
+        测试刷新失败后在重试间隔内不再请求服务端
+        """
+        failures = []
+
+        def failing_loader():
+            failures.append(1)
+            raise RuntimeError("network")
+
+        SymbolMaster(self.cache_path, ttl_seconds=0, loader=self.loader).refresh()
+        master = SymbolMaster(self.cache_path, ttl_seconds=0, loader=failing_loader, retry_seconds=60)
+        for _ in range(3):
+            self.assertTrue(master.is_valid("600519"))
+            self.assertEqual(len(master.search("贵州")), 1)
+        self.assertEqual(len(failures), 1)
+        # force 不受重试间隔限制
+        master.refresh(force=True)
+        self.assertEqual(len(failures), 2)
+        self.assertTrue(master.is_valid("600519"))
+
+        # 没有本地缓存时，重试间隔内直接抛出上一次的错误
+        empty = SymbolMaster(os.path.join(self.temp_dir, "missing.json"), loader=failing_loader, retry_seconds=60)
+        for _ in range(2):
+            with self.assertRaises(RuntimeError):
+                empty.lookup("600519")
+        self.assertEqual(len(failures), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
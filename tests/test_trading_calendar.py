@@ -0,0 +1,84 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from datetime import date, datetime
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from src.utils.trading_calendar import TradingCalendar
+
+
+class TestTradingCalendar(unittest.TestCase):
+    def setUp(self):
+        # 2024 年国庆休市：10 月 1 日至 7 日
+        self.calendar = TradingCalendar(["2024-10-01", "2024-10-02", "2024-10-03", "2024-10-04", "2024-10-07"])
+
+    def test_trading_day(self):
+        """
+        测试周末与节假日
+        """
+        self.assertTrue(self.calendar.is_trading_day("2024-09-30"))
+        self.assertFalse(self.calendar.is_trading_day(date(2024, 10, 7)))
+        self.assertFalse(self.calendar.is_trading_day("2024-10-05"))
+
+    def test_sessions_and_lunch_break(self):
+        """
+        测试交易时段与午间休市
+        """
+        self.assertFalse(self.calendar.is_open(datetime(2024, 9, 30, 9, 29)))
+        self.assertTrue(self.calendar.is_open(datetime(2024, 9, 30, 9, 30)))
+        self.assertFalse(self.calendar.is_open(datetime(2024, 9, 30, 12, 0)))
+        self.assertTrue(self.calendar.is_open(datetime(2024, 9, 30, 14, 59)))
+        self.assertFalse(self.calendar.is_open(datetime(2024, 9, 30, 15, 0)))
+        self.assertEqual(self.calendar.session_end(datetime(2024, 9, 30, 10, 0)), datetime(2024, 9, 30, 11, 30))
+        self.assertIsNone(self.calendar.session_end(datetime(2024, 9, 30, 12, 0)))
+
+    def test_next_open_skips_holidays(self):
+        """
+        测试下一次开盘跳过午间休市、周末与节假日
+        """
+        self.assertEqual(self.calendar.next_open(datetime(2024, 9, 30, 12, 0)), datetime(2024, 9, 30, 13, 0))
+        self.assertEqual(self.calendar.next_open(datetime(2024, 9, 30, 15, 30)), datetime(2024, 10, 8, 9, 30))
+        self.assertEqual(self.calendar.seconds_until_open(datetime(2024, 9, 30, 12, 59)), 60)
+        self.assertEqual(self.calendar.seconds_until_open(datetime(2024, 9, 30, 10, 0)), 0)
+
+    def test_last_session_end(self):
+        """
+        测试最近一次收盘（含午间休市）跳过周末与节假日
+        """
+        self.assertEqual(self.calendar.last_session_end(datetime(2024, 9, 30, 12, 0)), datetime(2024, 9, 30, 11, 30))
+        self.assertEqual(self.calendar.last_session_end(datetime(2024, 9, 30, 14, 0)), datetime(2024, 9, 30, 11, 30))
+        self.assertEqual(self.calendar.last_session_end(datetime(2024, 9, 30, 15, 0)), datetime(2024, 9, 30, 15, 0))
+        self.assertEqual(self.calendar.last_session_end(datetime(2024, 10, 8, 9, 0)), datetime(2024, 9, 30, 15, 0))
+
+    def test_recent_range(self):
+        """
+        测试最近 N 个交易日区间
+        """
+        self.assertEqual(self.calendar.recent_range(3, "2024-10-08"), ("2024-09-27", "2024-10-08"))
+        self.assertEqual(len(self.calendar.trading_days("2024-09-28", "2024-10-08")), 2)
+
+    def test_from_file(self):
+        """
+        测试从文件加载休市日，文件缺失时只按周末判断
+        """
+        temp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(temp_dir, "holidays.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"holidays": ["2024-10-01"]}, f)
+            self.assertFalse(TradingCalendar.from_file(path).is_trading_day("2024-10-01"))
+            self.assertTrue(TradingCalendar.from_file(os.path.join(temp_dir, "missing.json")).is_trading_day("2024-10-01"))
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import os
+import sys
+import threading
+import time
+import unittest
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from src.analyzer.watchlist_scheduler import WatchlistScheduler
+
+
+class TestWatchlistScheduler(unittest.TestCase):
+    def test_polls_each_symbol_and_endpoint(self):
+        """
+        测试各股票、各接口都按间隔被轮询，并记录统计
+        """
+        calls = []
+        lock = threading.Lock()
+
+        def fetcher(symbol, api_key):
+            with lock:
+                calls.append((symbol, api_key, time.monotonic()))
+            return {"dm": symbol}
+
+        scheduler = WatchlistScheduler(
+            ["000001", "600519"],
+            endpoint_intervals={"fast": 0.1, "slow": 0.3},
+            max_workers=4,
+            fetcher=fetcher,
+        )
+        scheduler.start()
+        time.sleep(0.65)
+        scheduler.stop()
+
+        fast_calls = [c for c in calls if c[1] == "fast"]
+        slow_calls = [c for c in calls if c[1] == "slow"]
+        self.assertGreater(len(fast_calls), len(slow_calls))
+        self.assertEqual({c[0] for c in calls}, {"000001", "600519"})
+        self.assertEqual(scheduler.latest[("600519", "fast")], {"dm": "600519"})
+
+        report = scheduler.report()
+        self.assertEqual(set(report), {"000001", "600519"})
+        self.assertGreater(report["000001"]["polls"], 0)
+        self.assertEqual(report["000001"]["errors"], 0)
+
+    def test_initial_requests_are_staggered(self):
+        """
+        测试首轮请求在间隔内错开，而不是同时发出
+        """
+        starts = []
+        lock = threading.Lock()
+
+        def fetcher(symbol, api_key):
+            with lock:
+                starts.append(time.monotonic())
+            return {}
+
+        scheduler = WatchlistScheduler(
+            ["a", "b", "c", "d"], endpoint_intervals={"ep": 0.4}, max_workers=4, fetcher=fetcher
+        )
+        scheduler.start()
+        time.sleep(0.35)
+        scheduler.stop()
+
+        self.assertEqual(len(starts), 4)
+        self.assertGreaterEqual(max(starts) - min(starts), 0.25)
+
+    def test_errors_and_skips_are_counted(self):
+        """
+        测试请求失败计数，以及上一次请求未返回时跳过本轮
+        """
+        def fetcher(symbol, api_key):
+            if symbol == "bad":
+                raise RuntimeError("boom")
+            time.sleep(0.25)
+            return {}
+
+        scheduler = WatchlistScheduler(
+            ["bad", "slow"], endpoint_intervals={"ep": 0.05}, max_workers=2, fetcher=fetcher
+        )
+        scheduler.start()
+        time.sleep(0.4)
+        scheduler.stop()
+
+        report = scheduler.report()
+        self.assertGreater(report["bad"]["errors"], 0)
+        self.assertEqual(report["bad"]["polls"], 0)
+        self.assertGreater(report["slow"]["skipped"], 0)
+
+    def test_pauses_outside_trading_sessions(self):
+        """
+        测试休市期间暂停轮询，开盘后恢复
+        """
+        class FakeCalendar:
+            open = False
+
+            def seconds_until_open(self):
+                return 0.0 if self.open else 0.05
+
+        calendar = FakeCalendar()
+        calls = []
+        scheduler = WatchlistScheduler(
+            ["000001"], endpoint_intervals={"ep": 0.05}, fetcher=lambda s, a: calls.append(s),
+            market_hours_only=True, calendar=calendar,
+        )
+        scheduler.start()
+        time.sleep(0.2)
+        self.assertEqual(calls, [])
+        calendar.open = True
+        time.sleep(0.2)
+        scheduler.stop()
+        self.assertGreater(len(calls), 0)
+
+    def test_empty_watchlist_rejected(self):
+        """
+        测试空股票列表无法启动
+        """
+        scheduler = WatchlistScheduler([], endpoint_intervals={"ep": 1}, fetcher=lambda s, a: None)
+        with self.assertRaises(ValueError):
+            scheduler.start()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+import os
+import sys
+import threading
+import time
+import unittest
+
+# 添加项目根目录到 sys.path
+if __name__ == "__main__" and "src" not in sys.path:
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from src.workflow import WorkflowExecutor, JobQueue
+
+
+class TestWorkflowExecutor(unittest.TestCase):
+    def test_independent_stages_run_concurrently(self):
+        """
+        测试互不依赖的阶段并发执行
+        """
+        executor = WorkflowExecutor(max_workers=4)
+        executor.add_stage("root", lambda deps: 1)
+        executor.add_stage("a", lambda deps: time.sleep(0.2) or deps["root"] + 1, ["root"])
+        executor.add_stage("b", lambda deps: time.sleep(0.2) or deps["root"] + 2, ["root"])
+        executor.add_stage("join", lambda deps: deps["a"] + deps["b"], ["a", "b"])
+
+        result = executor.run()
+        self.assertTrue(result.success)
+        self.assertEqual(result.results["join"], 5)
+        self.assertLess(result.total_time, 0.35)
+        self.assertEqual(set(result.timings), {"root", "a", "b", "join"})
+
+    def test_required_failure_skips_downstream(self):
+        """
+        测试必需阶段失败时跳过下游阶段
+        """
+        def fail(deps):
+            raise RuntimeError("boom")
+
+        executor = WorkflowExecutor()
+        executor.add_stage("upload", fail)
+        executor.add_stage("model", lambda deps: "ok", ["upload"])
+        result = executor.run()
+        self.assertIn("upload", result.errors)
+        self.assertEqual(result.skipped, ["model"])
+        self.assertFalse(result.success)
+
+    def test_optional_failure_passes_none(self):
+        """
+        测试可选阶段失败时下游收到 None
+        """
+        def fail(deps):
+            raise RuntimeError("ocr failed")
+
+        executor = WorkflowExecutor()
+        executor.add_stage("ocr", fail, optional=True)
+        executor.add_stage("analyze", lambda deps: deps["ocr"], ["ocr"])
+        result = executor.run()
+        self.assertIsNone(result.results["analyze"])
+        self.assertIn("ocr", result.errors)
+        self.assertIn("analyze", result.format_timings())
+
+    def test_unknown_dependency(self):
+        """
+        测试依赖不存在的阶段
+        """
+        executor = WorkflowExecutor()
+        with self.assertRaises(ValueError):
+            executor.add_stage("model", lambda deps: None, ["upload"])
+
+
+class TestJobQueue(unittest.TestCase):
+    def test_debounce_repeated_triggers(self):
+        """
+        测试防抖窗口内的重复触发被忽略
+        """
+        calls = []
+        job_queue = JobQueue(lambda: calls.append(1), debounce_seconds=10)
+        self.assertTrue(job_queue.submit())
+        for _ in range(5):
+            self.assertFalse(job_queue.submit())
+        time.sleep(0.1)
+        self.assertTrue(job_queue.shutdown(timeout=1))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(job_queue.stats["debounced"], 5)
+
+    def test_coalesce_while_in_flight(self):
+        """
+        测试任务执行期间的多次触发合并为一个排队任务
+        """
+        release = threading.Event()
+        calls = []
+
+        def action():
+            calls.append(1)
+            release.wait(1)
+
+        job_queue = JobQueue(action, max_concurrency=1, queue_size=1, debounce_seconds=0)
+        self.assertTrue(job_queue.submit())
+        time.sleep(0.05)
+        self.assertEqual(job_queue.in_flight, 1)
+        self.assertTrue(job_queue.submit())
+        self.assertFalse(job_queue.submit())
+        self.assertFalse(job_queue.submit())
+        release.set()
+        time.sleep(0.1)
+        self.assertTrue(job_queue.shutdown(timeout=1))
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(job_queue.stats["coalesced"], 2)
+
+    def test_max_concurrency(self):
+        """
+        测试同时执行的任务数不超过上限
+        """
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        def action():
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.05)
+            with lock:
+                state["running"] -= 1
+
+        job_queue = JobQueue(action, max_concurrency=2, queue_size=10, debounce_seconds=0)
+        for _ in range(6):
+            job_queue.submit()
+        time.sleep(0.3)
+        self.assertTrue(job_queue.shutdown(timeout=1))
+        self.assertEqual(state["peak"], 2)
+        self.assertEqual(job_queue.stats["completed"], 6)
+
+    def test_shutdown_discards_pending(self):
+        """
+        测试关闭时丢弃尚未开始的任务
+        """
+        release = threading.Event()
+        job_queue = JobQueue(lambda: release.wait(1), max_concurrency=1, queue_size=3, debounce_seconds=0)
+        for _ in range(3):
+            job_queue.submit()
+        time.sleep(0.05)
+        threading.Timer(0.1, release.set).start()
+        self.assertTrue(job_queue.shutdown(timeout=2))
+        self.assertEqual(job_queue.stats["completed"], 1)
+        self.assertEqual(job_queue.stats["discarded"], 2)
+        self.assertFalse(job_queue.submit())
+
+
+if __name__ == "__main__":
+    unittest.main()